@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from run_index import RUNS_ROOT
+
+BLOBS = RUNS_ROOT / "blobs"
+COMPRESS_MIN_BYTES = 64 * 1024
+_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+_GZIP_LEVEL = 6
+_ZSTD_LEVEL = 10
+
+# Run snapshot artifacts are stored once per distinct content under
+# blobs/<sha256[:2]>/<sha256>. A snapshot's case directory holds hardlinks to
+# those blobs, so an unchanged report costs no extra space in a new run, and
+# the case files are linked (not copied) from .gmat-lab/outputs. Filesystems
+# without hardlink support fall back to plain copies.
+#
+# Files of at least COMPRESS_MIN_BYTES (OEM reports, long logs) are archived
+# compressed instead: zstd when the zstandard package is installed, else gzip.
+# The snapshot then holds <name>.zst / <name>.gz, the manifest keeps the hash
+# and size of the original bytes, and gmat_tests.reports reads the archive
+# directly.
+
+
+def file_sha256(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def resolve_compression(name: str) -> str | None:
+    # "auto" prefers zstd; "none" disables compression.
+    if name == "none":
+        return None
+    if name == "auto":
+        return "zstd" if _zstandard() is not None else "gzip"
+    if name == "zstd" and _zstandard() is None:
+        raise ValueError("zstd compression needs the zstandard package")
+    return name
+
+
+def blob_path(digest: str, blobs: Path = BLOBS, compression: str | None = None) -> Path:
+    return blobs / digest[:2] / (digest + _SUFFIXES.get(compression, ""))
+
+
+def _compress(src: Path, dst: Path, compression: str) -> None:
+    with src.open("rb") as f_in, dst.open("wb") as f_out:
+        if compression == "zstd":
+            _zstandard().ZstdCompressor(level=_ZSTD_LEVEL).copy_stream(f_in, f_out)
+        else:
+            # A fixed mtime keeps the archive a function of the content.
+            with gzip.GzipFile(filename="", mode="wb", fileobj=f_out, compresslevel=_GZIP_LEVEL, mtime=0) as gz:
+                shutil.copyfileobj(f_in, gz)
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def store_blob(path: Path, blobs: Path = BLOBS, compression: str | None = None) -> tuple[str, Path]:
+    digest = file_sha256(path)
+    blob = blob_path(digest, blobs, compression)
+    if not blob.exists():
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        # Concurrent cases may store the same content; the rename is atomic
+        # and both candidates are identical.
+        tmp = blob.with_name(f"{blob.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        if compression is None:
+            link_or_copy(path, tmp)
+        else:
+            _compress(path, tmp, compression)
+        os.replace(tmp, blob)
+    return digest, blob
+
+
+def snapshot_tree(
+    src_dir: Path,
+    dst_dir: Path,
+    blobs: Path = BLOBS,
+    compression: str | None = None,
+    min_bytes: int = COMPRESS_MIN_BYTES,
+) -> list[dict]:
+    # Materialize src_dir under dst_dir as links into the blob store and
+    # return the per-file manifest (relative path, sha256 and size of the
+    # original bytes, plus the stored name for compressed files).
+    files = []
+    for path in sorted(p for p in src_dir.rglob("*") if p.is_file()):
+        rel = path.relative_to(src_dir).as_posix()
+        size = path.stat().st_size
+        codec = compression if compression is not None and size >= min_bytes else None
+        digest, blob = store_blob(path, blobs, codec)
+        stored = rel + _SUFFIXES.get(codec, "")
+        target = dst_dir / stored
+        target.parent.mkdir(parents=True, exist_ok=True)
+        link_or_copy(blob, target)
+        entry = {"path": rel, "sha256": digest, "bytes": size}
+        if codec is not None:
+            entry.update({"stored": stored, "compression": codec, "stored_bytes": blob.stat().st_size})
+        files.append(entry)
+    return files
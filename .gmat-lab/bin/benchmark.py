@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import math
+import statistics
+from pathlib import Path
+
+from common import ROOT
+
+BASELINE_PATH = ROOT / "docs" / "test-runs" / "benchmark_baseline.json"
+METRICS = ("wall_time_s", "cpu_time_s")
+
+
+def _percentile(values: list[float], q: float) -> float:
+    # Nearest-rank percentile: with few repeats p95 is simply the slowest run.
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _cpu_time(entry: dict) -> float | None:
+    if entry.get("cpu_user_s") is None or entry.get("cpu_sys_s") is None:
+        return None
+    return entry["cpu_user_s"] + entry["cpu_sys_s"]
+
+
+def summarize(entries: list[dict]) -> dict:
+    series = {
+        "wall_time_s": [e["wall_time_s"] for e in entries if e.get("wall_time_s") is not None],
+        "cpu_time_s": [t for t in map(_cpu_time, entries) if t is not None],
+    }
+    summary: dict = {"runs": len(entries)}
+    for metric, values in series.items():
+        if values:
+            summary[metric] = {
+                "median": statistics.median(values),
+                "p95": _percentile(values, 0.95),
+                "min": min(values),
+                "max": max(values),
+            }
+    return summary
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict:
+    if not path.exists():
+        return {"cases": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def update_baseline(baseline: dict, stats: dict[str, dict], run_id: str, path: Path = BASELINE_PATH) -> None:
+    cases = dict(baseline.get("cases", {}))
+    for case_id, summary in stats.items():
+        cases[case_id] = {metric: summary[metric] for metric in ("runs", *METRICS) if metric in summary}
+        cases[case_id]["run_id"] = run_id
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"cases": dict(sorted(cases.items()))}, indent=2) + "\n", encoding="utf-8")
+
+
+def find_regressions(
+    stats: dict[str, dict],
+    baseline: dict,
+    thresholds: dict[str, float],
+    floor_s: float,
+) -> list[dict]:
+    # A metric regresses when its median exceeds the baseline median by more
+    # than the case threshold (a fraction) and by more than floor_s, so
+    # sub-second cases do not trip on scheduler noise.
+    regressions = []
+    for case_id, summary in stats.items():
+        reference = baseline.get("cases", {}).get(case_id)
+        if not reference:
+            continue
+        for metric in METRICS:
+            if metric not in summary or metric not in reference:
+                continue
+            current = summary[metric]["median"]
+            previous = reference[metric]["median"]
+            if current > previous * (1 + thresholds[case_id]) and current - previous > floor_s:
+                regressions.append(
+                    {
+                        "case": case_id,
+                        "metric": metric,
+                        "baseline_median": previous,
+                        "median": current,
+                        "ratio": current / previous if previous else None,
+                        "threshold": thresholds[case_id],
+                    }
+                )
+    return regressions
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import argparse
+import shutil
 from pathlib import Path
 
 import requests
 
+from propagate_tle_sgp4 import _read_tle_lines
+from tle_catalog import catalog_path, diff_path, ingest, load_catalog, save_catalog, write_diff
+
 ROOT = Path(__file__).resolve().parents[2]
 CACHE = ROOT / ".gmat-lab" / "cache"
 
@@ -12,16 +16,32 @@ CACHE = ROOT / ".gmat-lab" / "cache"
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--group", default="active")
+    parser.add_argument("--from-file", default=None, help="ingest a local TLE file instead of downloading (offline)")
     args = parser.parse_args()
 
     CACHE.mkdir(parents=True, exist_ok=True)
-    url = f"https://celestrak.org/NORAD/elements/gp.php?GROUP={args.group.upper()}&FORMAT=tle"
     out = CACHE / f"celestrak_{args.group.lower()}.tle"
 
-    resp = requests.get(url, timeout=30)
-    resp.raise_for_status()
-    out.write_text(resp.text, encoding="utf-8")
+    if args.from_file:
+        source = Path(args.from_file)
+        if source.resolve() != out.resolve():
+            shutil.copyfile(source, out)
+    else:
+        url = f"https://celestrak.org/NORAD/elements/gp.php?GROUP={args.group.upper()}&FORMAT=tle"
+        resp = requests.get(url, timeout=30)
+        resp.raise_for_status()
+        out.write_text(resp.text, encoding="utf-8")
     print(f"saved={out} bytes={out.stat().st_size}")
+
+    # Diff against the cached catalog so downstream stages can limit work to
+    # the objects whose element sets actually changed.
+    catalog, diff = ingest(_read_tle_lines(out), load_catalog(catalog_path(args.group)))
+    save_catalog(catalog_path(args.group), catalog)
+    write_diff(diff_path(args.group), diff)
+    print(
+        f"catalog={catalog_path(args.group)} objects={len(catalog)} added={len(diff.added)} "
+        f"updated={len(diff.updated)} removed={len(diff.removed)} unchanged={diff.unchanged}"
+    )
     return 0
 
 
@@ -7,4 +7,6 @@ for tier in ("tier1", "tier2"):
     print(f"\n[{tier}] {cat['description']}")
     for case in cat["cases"]:
         tags = ", ".join(case.get("tags", []))
-        print(f"- {case['id']}: {tags}")
+        deps = case.get("depends_on", [])
+        after = f" (after: {', '.join(deps)})" if deps else ""
+        print(f"- {case['id']}: {tags}{after}")
@@ -2,59 +2,345 @@ from __future__ import annotations
 
 import argparse
 import csv
-from datetime import timedelta
+import hashlib
+import json
+import math
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import repeat
 from pathlib import Path
 
-from sgp4.api import Satrec, jday
+import numpy as np
+from sgp4.api import Satrec, SatrecArray, jday
 from sgp4.conveniences import sat_epoch_datetime
 
+from propagation_store import PropagationStore, create_store, is_store, open_store
+
 ROOT = Path(__file__).resolve().parents[2]
 OUT = ROOT / ".gmat-lab" / "outputs"
 
+TleEntry = tuple[str, str, str]
+
+# Rows copied per read when carrying an unchanged store forward.
+_COPY_ROWS = 1024
+# Satellites per SatrecArray call on an absolute grid.
+_BATCH_SATS = 256
 
-def _read_tles(path: Path, max_sats: int = 25):
+
+def _read_tle_lines(path: Path, max_sats: int | None = None) -> list[TleEntry]:
     lines = [ln.strip() for ln in path.read_text(encoding="utf-8").splitlines() if ln.strip()]
-    sats = []
+    entries = []
     i = 0
-    while i + 2 < len(lines) and len(sats) < max_sats:
+    while i + 2 < len(lines) and (max_sats is None or len(entries) < max_sats):
         name, l1, l2 = lines[i], lines[i + 1], lines[i + 2]
         if l1.startswith("1 ") and l2.startswith("2 "):
-            sats.append((name, Satrec.twoline2rv(l1, l2)))
+            entries.append((name, l1, l2))
             i += 3
         else:
             i += 1
-    return sats
+    return entries
+
+
+def norad_id(line1: str) -> str:
+    return line1[2:7].strip()
+
+
+def tle_hash(line1: str, line2: str) -> str:
+    # Identity of an element set: a stored row is reused only while the TLE
+    # it was propagated from is byte-identical.
+    return hashlib.sha256(f"{line1}\n{line2}".encode("utf-8")).hexdigest()[:16]
+
+
+def _parse_tles(entries: list[TleEntry]):
+    return [(name, Satrec.twoline2rv(l1, l2)) for name, l1, l2 in entries]
+
+
+def utc_start(text: str) -> tuple[float, float]:
+    # ISO-8601 start of an absolute grid (naive means UTC) as SGP4 (jd, fr).
+    dt = datetime.fromisoformat(text)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return jday(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond / 1e6)
+
+
+def propagate_offsets(sat, minutes: np.ndarray, start: tuple[float, float] | None = None):
+    # SGP4 state at `minutes` since `start` (jd, fr), or since the TLE's own
+    # epoch when start is None, in one C loop.
+    if start is None:
+        return sat.sgp4_array(np.full(minutes.shape, sat.jdsatepoch), sat.jdsatepochF + minutes / 1440.0)
+    return sat.sgp4_array(np.full(minutes.shape, start[0]), start[1] + minutes / 1440.0)
+
+
+@dataclass(frozen=True)
+class TimeGrid:
+    # Sample times, converted to day fractions once for the whole catalog.
+    # Without a start every satellite is sampled at minutes since its own
+    # TLE epoch; with one, all share the absolute (jd, fr) arrays.
+    minutes: np.ndarray
+    days: np.ndarray
+    start_utc: str | None = None
+    start: tuple[float, float] | None = None
+    jd: np.ndarray | None = None
+    fr: np.ndarray | None = None
+
+    def meta(self) -> dict:
+        # Time reference recorded with the propagated output.
+        if self.start is None:
+            return {"grid": "epoch"}
+        return {"grid": "absolute", "start_utc": self.start_utc, "start_jd": self.start[0], "start_fr": self.start[1]}
+
+
+def time_grid(minutes: np.ndarray, start_utc: str | None = None) -> TimeGrid:
+    days = minutes / 1440.0
+    if start_utc is None:
+        return TimeGrid(minutes, days)
+    jd, fr = utc_start(start_utc)
+    return TimeGrid(minutes, days, start_utc, (jd, fr), np.full(minutes.shape, jd), fr + days)
+
+
+def _propagate_vector(sat, grid: TimeGrid):
+    if grid.jd is None:
+        return sat.sgp4_array(np.full(grid.minutes.shape, sat.jdsatepoch), sat.jdsatepochF + grid.days)
+    return sat.sgp4_array(grid.jd, grid.fr)
+
+
+def _propagate_loop(sat, grid: TimeGrid):
+    if grid.jd is not None:
+        states = [sat.sgp4(jd, fr) for jd, fr in zip(grid.jd.tolist(), grid.fr.tolist())]
+    else:
+        epoch_dt = sat_epoch_datetime(sat)
+        states = []
+        for minute in grid.minutes.tolist():
+            dt = epoch_dt + timedelta(minutes=minute)
+            jd, fr = jday(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond / 1e6)
+            states.append(sat.sgp4(jd, fr))
+    err, r, v = zip(*states)
+    return np.array(err), np.array(r), np.array(v)
+
+
+# On the default grid the satellites do not share absolute times; the
+# vector engine propagates each one over its whole grid in a single
+# sgp4_array call (one C loop) instead of per-sample calls.
+_ENGINES = {"vector": _propagate_vector, "loop": _propagate_loop}
+
+
+def _states(sats, grid: TimeGrid, engine: str):
+    # (name, err, r, v) per satellite. On an absolute grid the vector engine
+    # propagates batches of satellites in one SatrecArray call.
+    if engine == "vector" and grid.jd is not None:
+        for first in range(0, len(sats), _BATCH_SATS):
+            batch = sats[first : first + _BATCH_SATS]
+            err, r, v = SatrecArray([sat for _name, sat in batch]).sgp4(grid.jd, grid.fr)
+            for k, (name, _sat) in enumerate(batch):
+                yield name, err[k], r[k], v[k]
+    else:
+        for name, sat in sats:
+            yield (name, *_ENGINES[engine](sat, grid))
+
+
+_CSV_HEADER = ["sat", "minutes", "x_km", "y_km", "z_km", "vx_kms", "vy_kms", "vz_kms", "err"]
+
+
+def _write_csv_rows(f, sats, grid: TimeGrid, engine: str) -> None:
+    w = csv.writer(f)
+    minute_list = grid.minutes.astype(np.int64).tolist()
+    for name, err, r, v in _states(sats, grid, engine):
+        w.writerows(zip(repeat(name), minute_list, *r.T.tolist(), *v.T.tolist(), err.tolist()))
+
+
+def csv_time_path(out_csv: Path) -> Path:
+    # A CSV's time reference (TimeGrid.meta()) is recorded beside it, as a
+    # store records it in meta.json.
+    return out_csv.with_name(out_csv.name + ".time.json")
+
+
+def read_csv_time(path: Path) -> dict | None:
+    record = csv_time_path(path)
+    return json.loads(record.read_text(encoding="utf-8")) if record.exists() else None
+
+
+def _write_csv_time(out_csv: Path, grid: TimeGrid) -> None:
+    csv_time_path(out_csv).write_text(json.dumps(grid.meta()) + "\n", encoding="utf-8")
+
+
+def _write_csv(out_csv: Path, sats, grid: TimeGrid, engine: str) -> None:
+    with out_csv.open("w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(_CSV_HEADER)
+        _write_csv_rows(f, sats, grid, engine)
+
+
+def _fill_store(store: PropagationStore, rows: list[int], sats, grid: TimeGrid, engine: str) -> None:
+    for k, (_name, err, r, v) in zip(rows, _states(sats, grid, engine)):
+        store.err[k], store.positions[k], store.velocities[k] = err, r, v
+    store.flush()
+
+
+def _create_store(out_dir: Path, entries: list[TleEntry], grid: TimeGrid) -> PropagationStore:
+    return create_store(
+        out_dir,
+        [name for name, _l1, _l2 in entries],
+        grid.minutes.astype(np.int64),
+        [norad_id(l1) for _name, l1, _l2 in entries],
+        grid.meta(),
+        [tle_hash(l1, l2) for _name, l1, l2 in entries],
+    )
+
+
+def _write_store(out_dir: Path, entries: list[TleEntry], grid: TimeGrid, engine: str) -> None:
+    _fill_store(_create_store(out_dir, entries, grid), range(len(entries)), _parse_tles(entries), grid, engine)
+
+
+def _update_store(out_dir: Path, entries: list[TleEntry], grid: TimeGrid, engine: str, hint: set[str]) -> int:
+    # Incremental refresh: a row is copied from the previous store when the
+    # store holds the same NORAD id propagated from the same TLE lines; every
+    # other object is propagated. The catalog diff (`hint`, changed NORAD ids)
+    # only covers the latest fetch, which need not be the one the store was
+    # built from, so it is cross-checked rather than trusted. The new store is
+    # built beside the old one and swapped in.
+    if not is_store(out_dir):
+        raise SystemExit(f"--diff needs a previous store at {out_dir}")
+    previous = open_store(out_dir)
+    same_grid = np.array_equal(previous.minutes, grid.minutes.astype(np.int64)) and previous.time == grid.meta()
+    if previous.ids is None or previous.tle_hashes is None or not same_grid:
+        raise SystemExit(f"{out_dir} has no NORAD ids / TLE hashes or a different time grid; run a full propagation")
+    old_rows = {key: k for k, key in enumerate(zip(previous.ids, previous.tle_hashes))}
+    tmp = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    store = _create_store(tmp, entries, grid)
+
+    copied, fresh = [], []
+    for k, key in enumerate(zip(store.ids, store.tle_hashes)):
+        if key in old_rows:
+            copied.append((k, old_rows[key]))
+        else:
+            fresh.append(k)
+    missed = {store.ids[k] for k in fresh} - hint
+    if missed:
+        print(
+            f"WARN: {len(missed)} objects changed since {out_dir} was built but are not in --diff "
+            "(it was taken against a different fetch); propagating them too"
+        )
+    for first in range(0, len(copied), _COPY_ROWS):
+        dst, src = (list(rows) for rows in zip(*copied[first : first + _COPY_ROWS]))
+        store.err[dst] = previous.err[src]
+        store.positions[dst] = previous.positions[src]
+        store.velocities[dst] = previous.velocities[src]
+    _fill_store(store, fresh, _parse_tles([entries[k] for k in fresh]), grid, engine)
+    del previous, store
+
+    old = out_dir.with_name(out_dir.name + ".old")
+    out_dir.rename(old)
+    tmp.rename(out_dir)
+    shutil.rmtree(old)
+    return len(fresh)
+
+
+def _propagate_part(entries: list[TleEntry], grid: TimeGrid, engine: str, fmt: str, target: str, offset: int) -> None:
+    # Worker: Satrec objects do not pickle, so each part re-parses its TLEs.
+    # CSV parts go to their own file; store parts fill their own row range.
+    sats = _parse_tles(entries)
+    if fmt == "npy":
+        rows = range(offset, offset + len(sats))
+        _fill_store(open_store(Path(target), mmap_mode="r+"), rows, sats, grid, engine)
+    else:
+        with Path(target).open("w", newline="", encoding="utf-8") as f:
+            _write_csv_rows(f, sats, grid, engine)
+
+
+def _propagate_parallel(out: Path, entries: list[TleEntry], grid: TimeGrid, args: argparse.Namespace) -> None:
+    # Satellite chunks are spread over the pool (several per worker to even
+    # out deep-space objects) and merged in catalog order.
+    size = max(1, math.ceil(len(entries) / (args.workers * 4)))
+    offsets = list(range(0, len(entries), size))
+    if args.format == "npy":
+        _create_store(out, entries, grid).flush()
+        targets = [str(out)] * len(offsets)
+    else:
+        targets = [str(out.with_name(f"{out.name}.part-{n:04d}")) for n in range(len(offsets))]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        jobs = [
+            pool.submit(
+                _propagate_part, entries[offset : offset + size], grid, args.engine, args.format, target, offset
+            )
+            for offset, target in zip(offsets, targets)
+        ]
+        for job in jobs:
+            job.result()
+    if args.format == "csv":
+        with out.open("w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(_CSV_HEADER)
+            for target in targets:
+                with open(target, encoding="utf-8", newline="") as part:
+                    shutil.copyfileobj(part, f)
+                os.unlink(target)
 
 
 def main() -> int:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--input", required=True)
+    parser.add_argument("--input", required=True, help="TLE file or tle_catalog .npz cache")
     parser.add_argument("--hours", type=int, default=24)
     parser.add_argument("--step-min", type=int, default=10)
+    parser.add_argument("--max-sats", type=int, default=None, help="propagate only the first N objects")
+    parser.add_argument("--engine", choices=["vector", "loop"], default="vector")
+    parser.add_argument(
+        "--grid",
+        choices=["epoch", "absolute"],
+        default="epoch",
+        help="epoch: minutes since each TLE epoch; absolute: minutes since --start for every object",
+    )
+    parser.add_argument("--start", default=None, help="UTC start of the absolute grid (ISO-8601)")
+    parser.add_argument("--format", choices=["csv", "npy"], default="csv", help="npy: columnar store directory")
+    parser.add_argument("--workers", type=int, default=1, help="propagate satellite chunks in N processes")
+    parser.add_argument(
+        "--diff",
+        default=None,
+        help="catalog diff from fetch_celestrak: update the existing store, re-propagating only objects whose "
+        "TLE differs from the one stored",
+    )
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+    if args.diff and (args.format != "npy" or args.workers > 1):
+        parser.error("--diff updates a columnar store in one process (--format npy, --workers 1)")
+    if (args.grid == "absolute") != (args.start is not None):
+        parser.error("--grid absolute and --start go together")
+
+    # Imported here: tle_catalog itself builds on this module.
+    from tle_catalog import load_catalog, load_diff
 
     tle_path = Path(args.input)
-    sats = _read_tles(tle_path)
-    if not sats:
+    if tle_path.suffix == ".npz":
+        entries = load_catalog(tle_path).entries()[: args.max_sats]
+    else:
+        entries = _read_tle_lines(tle_path, args.max_sats)
+    if not entries:
         raise SystemExit("No satellites parsed from TLE file")
 
     OUT.mkdir(parents=True, exist_ok=True)
-    out_csv = OUT / "sgp4_propagation.csv"
+    grid = time_grid(np.arange(0, args.hours * 60 + 1, args.step_min, dtype=np.float64), args.start)
+    out = OUT / ("sgp4_propagation" if args.format == "npy" else "sgp4_propagation.csv")
+    if args.diff:
+        hint = set(load_diff(Path(args.diff)).changed)
+        propagated = _update_store(out, entries, grid, args.engine, hint)
+        print(f"saved={out} sats={len(entries)} propagated={propagated}")
+        return 0
+    if args.format == "csv":
+        # Written once the CSV is complete, so a record never describes a
+        # partial or older file.
+        csv_time_path(out).unlink(missing_ok=True)
+    if args.workers > 1:
+        _propagate_parallel(out, entries, grid, args)
+    elif args.format == "npy":
+        _write_store(out, entries, grid, args.engine)
+    else:
+        _write_csv(out, _parse_tles(entries), grid, args.engine)
+    if args.format == "csv":
+        _write_csv_time(out, grid)
 
-    with out_csv.open("w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["sat", "minutes", "x_km", "y_km", "z_km", "vx_kms", "vy_kms", "vz_kms", "err"])
-
-        max_minutes = args.hours * 60
-        for name, sat in sats:
-            epoch_dt = sat_epoch_datetime(sat)
-            for minutes in range(0, max_minutes + 1, args.step_min):
-                dt = epoch_dt + timedelta(minutes=minutes)
-                jd, fr = jday(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond / 1e6)
-                err, r, v = sat.sgp4(jd, fr)
-                w.writerow([name, minutes, r[0], r[1], r[2], v[0], v[1], v[2], err])
-
-    print(f"saved={out_csv} sats={len(sats)}")
+    print(f"saved={out} sats={len(entries)}")
     return 0
 
 
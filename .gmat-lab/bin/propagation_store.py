@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+# Columnar SGP4 output: one .npy per quantity, satellite-major, so consumers
+# can memory-map positions as (n_sats, n_steps, 3) without parsing text.
+FORMAT_VERSION = 1
+_META = "meta.json"
+
+
+@dataclass(frozen=True)
+class PropagationStore:
+    path: Path
+    names: list[str]
+    minutes: np.ndarray  # (n_steps,)
+    positions: np.ndarray  # (n_sats, n_steps, 3) km
+    velocities: np.ndarray  # (n_sats, n_steps, 3) km/s
+    err: np.ndarray  # (n_sats, n_steps) SGP4 error code, 0 = ok
+    ids: list[str] | None = None  # NORAD id per row, for incremental updates
+    time: dict | None = None  # time reference of `minutes`, see propagate_tle_sgp4.TimeGrid
+    tle_hashes: list[str] | None = None  # element set per row, see propagate_tle_sgp4.tle_hash
+
+    def flush(self) -> None:
+        for array in (self.positions, self.velocities, self.err):
+            if isinstance(array, np.memmap):
+                array.flush()
+
+
+def is_store(path: Path) -> bool:
+    return (path / _META).is_file()
+
+
+def create_store(
+    path: Path,
+    names: list[str],
+    minutes: np.ndarray,
+    ids: list[str] | None = None,
+    time: dict | None = None,
+    tle_hashes: list[str] | None = None,
+) -> PropagationStore:
+    path.mkdir(parents=True, exist_ok=True)
+    shape = (len(names), len(minutes))
+    np.save(path / "minutes.npy", np.asarray(minutes))
+    store = PropagationStore(
+        path=path,
+        names=list(names),
+        minutes=np.asarray(minutes),
+        positions=open_memmap(path / "positions.npy", mode="w+", dtype=np.float64, shape=(*shape, 3)),
+        velocities=open_memmap(path / "velocities.npy", mode="w+", dtype=np.float64, shape=(*shape, 3)),
+        err=open_memmap(path / "err.npy", mode="w+", dtype=np.uint8, shape=shape),
+        ids=None if ids is None else list(ids),
+        time=time or {"grid": "epoch"},
+        tle_hashes=None if tle_hashes is None else list(tle_hashes),
+    )
+    meta = {"version": FORMAT_VERSION, "names": store.names, "time": store.time}
+    if store.ids is not None:
+        meta["ids"] = store.ids
+    if store.tle_hashes is not None:
+        meta["tle_hashes"] = store.tle_hashes
+    (path / _META).write_text(json.dumps(meta) + "\n", encoding="utf-8")
+    return store
+
+
+def open_store(path: Path, mmap_mode: str | None = "r") -> PropagationStore:
+    meta = json.loads((path / _META).read_text(encoding="utf-8"))
+    if meta.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported propagation store version in {path}: {meta.get('version')}")
+    return PropagationStore(
+        path=path,
+        names=meta["names"],
+        minutes=np.load(path / "minutes.npy"),
+        positions=np.load(path / "positions.npy", mmap_mode=mmap_mode),
+        velocities=np.load(path / "velocities.npy", mmap_mode=mmap_mode),
+        err=np.load(path / "err.npy", mmap_mode=mmap_mode),
+        ids=meta.get("ids"),
+        # Stores written before the time reference was recorded use the
+        # per-TLE epoch grid.
+        time=meta.get("time", {"grid": "epoch"}),
+        tle_hashes=meta.get("tle_hashes"),
+    )
@@ -5,16 +5,36 @@ import json
 import shutil
 import subprocess
 import sys
+import threading
 from datetime import UTC, datetime
 from pathlib import Path
 
+from artifact_store import link_or_copy, resolve_compression, snapshot_tree
+from benchmark import BASELINE_PATH, find_regressions, load_baseline, summarize, update_baseline
 from common import LAB, ROOT, load_catalog, make_workdir
+from run_index import RUNS_ROOT, allocate_run
+from scheduler import case_dependencies, run_dag, topological_order
 
 sys.path.insert(0, str(ROOT / "src"))
 
-from gmat_tests.adapters.subprocess_runner import SubprocessGmatRunner, prepare_script_in_workdir
-from gmat_tests.config import resolve_compat_lib_dir, resolve_gmat_bin
-from gmat_tests.domain.models import GmatExecutionRequest
+from gmat_tests.adapters.result_cache import GmatResultCache
+from gmat_tests.adapters.subprocess_runner import SubprocessGmatRunner, prepare_script_in_workdir, run_measured
+from gmat_tests.config import (
+    resolve_compat_lib_dir,
+    resolve_gmat_bin,
+    resolve_result_cache_dir,
+    resolve_result_cache_max_bytes,
+)
+from gmat_tests.domain.models import GmatExecutionRequest, GmatExecutionResult
+
+
+# Cases run on scheduler threads under --jobs; one lock keeps each line whole.
+_OUTPUT_LOCK = threading.Lock()
+
+
+def _log(message: str) -> None:
+    with _OUTPUT_LOCK:
+        print(message, flush=True)
 
 
 def _git_info() -> dict[str, str]:
@@ -47,44 +67,22 @@ def _ensure_clean_repo_for_runs() -> None:
 
 
 def _create_run_snapshot(tier: str, case_filter: str | None) -> tuple[Path, dict]:
-    docs_root = ROOT / "docs" / "test-runs"
-    docs_root.mkdir(parents=True, exist_ok=True)
-    index_path = docs_root / "index.json"
-
-    if index_path.exists():
-        index = json.loads(index_path.read_text(encoding="utf-8"))
-    else:
-        index = {"next_run": 1, "runs": []}
-
-    run_number = int(index.get("next_run", 1))
     git = _git_info()
-    run_id = f"run-{run_number:04d}-{git['label']}"
-    run_dir = docs_root / run_id
-    run_dir.mkdir(parents=True, exist_ok=True)
-
+    timestamp = datetime.now(UTC).isoformat()
+    run_dir, record = allocate_run(
+        RUNS_ROOT,
+        git["label"],
+        {"timestamp_utc": timestamp, "tier": tier, "case_filter": case_filter},
+    )
     meta = {
-        "run_id": run_id,
-        "run_number": run_number,
-        "timestamp_utc": datetime.now(UTC).isoformat(),
+        "run_id": record["run_id"],
+        "run_number": record["run_number"],
+        "timestamp_utc": timestamp,
         "tier": tier,
         "case_filter": case_filter,
         "git": git,
         "cases": [],
     }
-
-    index["next_run"] = run_number + 1
-    index["runs"].append(
-        {
-            "run_id": run_id,
-            "run_number": run_number,
-            "timestamp_utc": meta["timestamp_utc"],
-            "tier": tier,
-            "case_filter": case_filter,
-            "git_label": git["label"],
-        }
-    )
-    index_path.write_text(json.dumps(index, indent=2) + "\n", encoding="utf-8")
-    (docs_root / "LATEST").write_text(run_id + "\n", encoding="utf-8")
     return run_dir, meta
 
 
@@ -93,39 +91,75 @@ def _save_case_artifacts(
     returncode: int,
     local_out_dir: Path,
     run_dir: Path,
-    run_meta: dict,
-) -> None:
+    args: argparse.Namespace,
+) -> dict:
     run_case_dir = run_dir / "cases" / case_id
     if run_case_dir.exists():
         shutil.rmtree(run_case_dir)
-    run_case_dir.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copytree(local_out_dir, run_case_dir)
-    run_meta["cases"].append({"case": case_id, "returncode": returncode, "path": str(run_case_dir)})
+    run_case_dir.mkdir(parents=True)
+    files = snapshot_tree(local_out_dir, run_case_dir, compression=args.compress, min_bytes=args.compress_min_kb * 1024)
+    return {"case": case_id, "returncode": returncode, "path": str(run_case_dir), "files": files}
+
+
+def _resource_fields(result: GmatExecutionResult) -> dict:
+    return {
+        "timed_out": result.timed_out,
+        "from_cache": result.from_cache,
+        "wall_time_s": result.wall_time_s,
+        "cpu_user_s": result.cpu_user_s,
+        "cpu_sys_s": result.cpu_sys_s,
+        "peak_rss_kb": result.peak_rss_kb,
+        "workdir_bytes_written": result.workdir_bytes_written,
+        "report_rows": result.report_rows,
+    }
+
+
+def _result_cache(use_cache: bool) -> GmatResultCache | None:
+    if not use_cache:
+        return None
+    return GmatResultCache(resolve_result_cache_dir(), max_bytes=resolve_result_cache_max_bytes())
 
 
-def _run_gmat_case(case: dict, run_dir: Path, run_meta: dict) -> int:
+def _run_gmat_case(case: dict, run_dir: Path, args: argparse.Namespace) -> tuple[int, dict | None]:
     gmat_bin = resolve_gmat_bin()
     if not gmat_bin.exists():
-        print(f"ERROR: GMAT binary not found: {gmat_bin}")
-        return 2
+        _log(f"ERROR: GMAT binary not found: {gmat_bin}")
+        return 2, None
 
     script = ROOT / case["script"]
     if not script.exists():
-        print(f"ERROR: script missing: {script}")
-        return 2
+        _log(f"ERROR: script missing: {script}")
+        return 2, None
 
     workdir = make_workdir(case["id"])
-    runner = SubprocessGmatRunner(gmat_bin=gmat_bin, compat_lib_dir=resolve_compat_lib_dir())
+    runner = SubprocessGmatRunner(
+        gmat_bin=gmat_bin,
+        compat_lib_dir=resolve_compat_lib_dir(),
+        result_cache=_result_cache(not args.no_cache),
+    )
     staged = prepare_script_in_workdir(script, workdir)
 
     for data_file in case.get("data_files", []):
         source = ROOT / data_file
         if not source.exists():
-            print(f"ERROR: data file missing: {source}")
-            return 2
+            _log(f"ERROR: data file missing: {source}")
+            return 2, None
         shutil.copy2(source, workdir / source.name)
 
-    result = runner.run(GmatExecutionRequest(script_path=staged, work_dir=workdir))
+    memory_limit_mb = case.get("memory_limit_mb", args.memory_limit_mb)
+    expected = case.get("expected_report")
+    result = runner.run(
+        GmatExecutionRequest(
+            script_path=staged,
+            work_dir=workdir,
+            timeout_s=case.get("timeout_s", args.timeout_s),
+            memory_limit_bytes=memory_limit_mb * 1024 * 1024 if memory_limit_mb else None,
+            niceness=args.nice,
+            report_files=(expected,) if expected else (),
+        )
+    )
+    if result.timed_out:
+        _log(f"WARN: case {case['id']} timed out")
 
     out_dir = LAB / "outputs" / case["id"]
     if out_dir.exists():
@@ -135,74 +169,178 @@ def _run_gmat_case(case: dict, run_dir: Path, run_meta: dict) -> int:
     (out_dir / "stdout.txt").write_text(result.stdout, encoding="utf-8")
     (out_dir / "stderr.txt").write_text(result.stderr, encoding="utf-8")
     if (workdir / "gmat.log").exists():
-        shutil.copy2(workdir / "gmat.log", out_dir / "gmat.log")
+        link_or_copy(workdir / "gmat.log", out_dir / "gmat.log")
 
-    expected = case.get("expected_report")
     if expected:
         report = workdir / expected
         if report.exists():
-            shutil.copy2(report, out_dir / expected)
+            link_or_copy(report, out_dir / expected)
         else:
-            print(f"WARN: expected report not found: {expected}")
+            _log(f"WARN: expected report not found: {expected}")
 
-    _save_case_artifacts(case["id"], result.returncode, out_dir, run_dir, run_meta)
-    print(f"case={case['id']} returncode={result.returncode} out={out_dir}")
-    return result.returncode
+    entry = _save_case_artifacts(case["id"], result.returncode, out_dir, run_dir, args)
+    entry.update(_resource_fields(result))
+    _log(f"case={case['id']} returncode={result.returncode} out={out_dir}")
+    return result.returncode, entry
 
 
-def _run_py_command(case: dict, run_dir: Path, run_meta: dict) -> int:
+def _run_py_command(case: dict, run_dir: Path, args: argparse.Namespace) -> tuple[int, dict | None]:
     cmd = case["command"].split()
-    proc = subprocess.run(cmd, cwd=ROOT, text=True, capture_output=True, check=False)
+    timeout_s = case.get("timeout_s", args.timeout_s)
+    result = run_measured(cmd, cwd=ROOT, timeout_s=timeout_s, niceness=args.nice)
+    if result.timed_out:
+        _log(f"WARN: case {case['id']} timed out after {timeout_s}s")
 
     out_dir = LAB / "outputs" / case["id"]
     if out_dir.exists():
         shutil.rmtree(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
-    (out_dir / "stdout.txt").write_text(proc.stdout, encoding="utf-8")
-    (out_dir / "stderr.txt").write_text(proc.stderr, encoding="utf-8")
+    (out_dir / "stdout.txt").write_text(result.stdout, encoding="utf-8")
+    (out_dir / "stderr.txt").write_text(result.stderr, encoding="utf-8")
+
+    entry = _save_case_artifacts(case["id"], result.returncode, out_dir, run_dir, args)
+    entry.update(_resource_fields(result))
+    _log(f"case={case['id']} returncode={result.returncode} out={out_dir}")
+    return result.returncode, entry
+
+
+def _run_case(case: dict, run_dir: Path, args: argparse.Namespace) -> tuple[int, dict | None]:
+    if case["type"] == "gmat_script":
+        return _run_gmat_case(case, run_dir, args)
+    if case["type"] == "python_command":
+        return _run_py_command(case, run_dir, args)
+    _log(f"ERROR: unsupported case type {case['type']}")
+    return 2, None
+
+
+def _benchmark_case(case: dict, run_dir: Path, args: argparse.Namespace) -> tuple[int, dict | None]:
+    # Repeat the case and keep the last run's artifacts; a failing repeat
+    # stops the series so a broken case is not timed as if it were healthy.
+    samples = []
+    rc, entry = 2, None
+    for _ in range(args.repeat):
+        rc, entry = _run_case(case, run_dir, args)
+        if rc != 0 or entry is None:
+            break
+        samples.append(entry)
+    if entry is not None and samples:
+        entry["benchmark"] = summarize(samples)
+    return rc, entry
+
+
+def _benchmark_section(run_meta: dict, cases: list[dict], args: argparse.Namespace) -> dict:
+    stats = {e["case"]: e["benchmark"] for e in run_meta["cases"] if "benchmark" in e}
+    thresholds = {c["id"]: c.get("benchmark_threshold", args.regression_threshold) for c in cases}
+    baseline = load_baseline()
+    regressions = find_regressions(stats, baseline, thresholds, args.regression_floor_s)
+    for r in regressions:
+        print(
+            f"REGRESSION: case={r['case']} {r['metric']} median={r['median']:.3f}s "
+            f"baseline={r['baseline_median']:.3f}s (threshold +{r['threshold']:.0%})"
+        )
+    if args.update_baseline:
+        update_baseline(baseline, stats, run_meta["run_id"])
+        print(f"benchmark_baseline={BASELINE_PATH}")
+    return {
+        "repeat": args.repeat,
+        "regression_threshold": args.regression_threshold,
+        "regression_floor_s": args.regression_floor_s,
+        "baseline": str(BASELINE_PATH.relative_to(ROOT)),
+        "baseline_updated": args.update_baseline,
+        "cases": stats,
+        "regressions": regressions,
+    }
+
 
-    _save_case_artifacts(case["id"], proc.returncode, out_dir, run_dir, run_meta)
-    print(f"case={case['id']} returncode={proc.returncode} out={out_dir}")
-    return proc.returncode
+def _catalog_cases(tier: str) -> list[dict]:
+    tiers = ["tier1", "tier2"] if tier == "all" else [tier]
+    return [case for t in tiers for case in load_catalog(t)["cases"]]
 
 
 def _iter_cases(tier: str, case_id: str | None):
-    cat = load_catalog(tier)
-    for c in cat["cases"]:
+    for c in _catalog_cases(tier):
         if case_id is None or c["id"] == case_id:
             yield c
 
 
 def main() -> int:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--tier", choices=["tier1", "tier2"], default="tier1")
+    parser.add_argument("--tier", choices=["tier1", "tier2", "all"], default="tier1")
     parser.add_argument("--case", default=None)
+    parser.add_argument("--jobs", type=int, default=1, help="number of cases to run concurrently")
+    parser.add_argument("--no-cache", action="store_true", help="always run GMAT, ignoring cached results")
+    parser.add_argument("--timeout-s", type=float, default=None, help="default per-case wall-clock limit")
+    parser.add_argument("--memory-limit-mb", type=int, default=None, help="default per-case GMAT address-space limit")
+    parser.add_argument("--nice", type=int, default=None, help="niceness for GMAT processes")
+    parser.add_argument("--benchmark", action="store_true", help="time repeated uncached runs against the baseline")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case in benchmark mode")
+    parser.add_argument(
+        "--regression-threshold",
+        type=float,
+        default=0.25,
+        help="allowed median slowdown as a fraction of the baseline (catalog: benchmark_threshold)",
+    )
+    parser.add_argument("--regression-floor-s", type=float, default=0.5, help="ignore slowdowns smaller than this")
+    parser.add_argument("--update-baseline", action="store_true", help="record this benchmark as the new baseline")
+    parser.add_argument(
+        "--compress",
+        choices=["auto", "zstd", "gzip", "none"],
+        default="auto",
+        help="archive large snapshot artifacts compressed (auto: zstd if installed, else gzip)",
+    )
+    parser.add_argument("--compress-min-kb", type=int, default=64, help="compress artifacts of at least this size")
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be >= 1")
+    if args.benchmark:
+        if args.repeat < 1:
+            parser.error("--repeat must be >= 1")
+        if args.jobs > 1:
+            parser.error("--benchmark runs cases serially; concurrent cases would skew timings")
+        # Cached results would time the cache, not GMAT.
+        args.no_cache = True
+    elif args.update_baseline:
+        parser.error("--update-baseline requires --benchmark")
+    try:
+        args.compress = resolve_compression(args.compress)
+    except ValueError as exc:
+        parser.error(str(exc))
     _ensure_clean_repo_for_runs()
+    cases = list(_iter_cases(args.tier, args.case))
+    if not cases:
+        print("No matching case found")
+        return 2
+    # Reject unknown dependencies and cycles before a run id is allocated, so
+    # a broken catalog leaves no empty snapshot behind.
+    known_ids = {c["id"] for c in _catalog_cases(args.tier)}
+    try:
+        topological_order(cases, case_dependencies(cases, known_ids))
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return 2
+
     run_dir, run_meta = _create_run_snapshot(args.tier, args.case)
     print(f"run_snapshot={run_dir}")
 
+    # Each case blocks on its own child process in its own workdir, so the
+    # scheduler's bounded thread pool is enough to keep `jobs` processes busy.
+    run_one = _benchmark_case if args.benchmark else _run_case
+    results = run_dag(cases, lambda case: run_one(case, run_dir, args), args.jobs, known_ids, log=_log)
+
     failures = 0
-    seen = False
-    for case in _iter_cases(args.tier, args.case):
-        seen = True
-        if case["type"] == "gmat_script":
-            rc = _run_gmat_case(case, run_dir, run_meta)
-        elif case["type"] == "python_command":
-            rc = _run_py_command(case, run_dir, run_meta)
-        else:
-            print(f"ERROR: unsupported case type {case['type']}")
-            rc = 2
+    for rc, entry in results:
+        if entry is not None:
+            run_meta["cases"].append(entry)
         if rc != 0:
             failures += 1
 
-    if not seen:
-        print("No matching case found")
-        return 2
-
     run_meta["failures"] = failures
+    regressed = False
+    if args.benchmark:
+        run_meta["benchmark"] = _benchmark_section(run_meta, cases, args)
+        regressed = bool(run_meta["benchmark"]["regressions"]) and not args.update_baseline
     (run_dir / "manifest.json").write_text(json.dumps(run_meta, indent=2) + "\n", encoding="utf-8")
-    return 1 if failures else 0
+    return 1 if failures or regressed else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from common import ROOT
+
+RUNS_ROOT = ROOT / "docs" / "test-runs"
+INDEX_NAME = "index.jsonl"
+LEGACY_INDEX_NAME = "index.json"
+LOCK_NAME = "index.lock"
+_TAIL_BLOCK = 4096
+
+# The run index is append-only JSON Lines, one record per run snapshot. Run
+# numbers are allocated under an exclusive flock on index.lock: read the last
+# record, create the run directory, append the new record. Allocation reads a
+# fixed-size tail of the file rather than parsing the whole history, and
+# concurrent runners queue on the lock instead of racing for the same number.
+# A crash can tear the appended record after its directory was created, so
+# the number also clears the highest existing run-NNNN-* directory.
+
+
+@contextmanager
+def _locked(docs_root: Path) -> Iterator[None]:
+    docs_root.mkdir(parents=True, exist_ok=True)
+    with (docs_root / LOCK_NAME).open("a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _last_record(path: Path) -> dict | None:
+    # Scans back from EOF block by block; a torn final line left by a crash
+    # mid-append is skipped.
+    with path.open("rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        tail = b""
+        while end > 0:
+            start = max(0, end - _TAIL_BLOCK)
+            f.seek(start)
+            tail = f.read(end - start) + tail
+            end = start
+            lines = tail.split(b"\n")
+            for line in reversed(lines if start == 0 else lines[1:]):
+                if not line.strip():
+                    continue
+                try:
+                    return json.loads(line)
+                except ValueError:
+                    continue
+    return None
+
+
+def _append_record(path: Path, record: dict) -> None:
+    data = (json.dumps(record) + "\n").encode("utf-8")
+    with path.open("ab") as f:
+        if f.tell() > 0:
+            with path.open("rb") as check:
+                check.seek(-1, os.SEEK_END)
+                if check.read(1) != b"\n":
+                    data = b"\n" + data
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _migrate_legacy(docs_root: Path) -> None:
+    # One-time conversion of the old rewrite-everything index.json.
+    legacy = docs_root / LEGACY_INDEX_NAME
+    if not legacy.exists() or (docs_root / INDEX_NAME).exists():
+        return
+    runs = json.loads(legacy.read_text(encoding="utf-8")).get("runs", [])
+    tmp = docs_root / (INDEX_NAME + ".tmp")
+    tmp.write_text("".join(json.dumps(run) + "\n" for run in runs), encoding="utf-8")
+    os.replace(tmp, docs_root / INDEX_NAME)
+    legacy.unlink()
+
+
+def _highest_run_dir(docs_root: Path) -> int:
+    numbers = [0]
+    for entry in os.scandir(docs_root):
+        parts = entry.name.split("-", 2)
+        if entry.is_dir() and len(parts) == 3 and parts[0] == "run" and parts[1].isdigit():
+            numbers.append(int(parts[1]))
+    return max(numbers)
+
+
+def _write_latest(docs_root: Path, run_id: str) -> None:
+    tmp = docs_root / "LATEST.tmp"
+    tmp.write_text(run_id + "\n", encoding="utf-8")
+    os.replace(tmp, docs_root / "LATEST")
+
+
+def allocate_run(docs_root: Path, git_label: str, fields: dict) -> tuple[Path, dict]:
+    # Reserves the next run number, creates its directory and records it.
+    # Returns the run directory and the appended index record.
+    with _locked(docs_root):
+        _migrate_legacy(docs_root)
+        index_path = docs_root / INDEX_NAME
+        last = _last_record(index_path) if index_path.exists() else None
+        run_number = max(int(last["run_number"]) if last else 0, _highest_run_dir(docs_root)) + 1
+        run_id = f"run-{run_number:04d}-{git_label}"
+        run_dir = docs_root / run_id
+        run_dir.mkdir(parents=True)
+
+        record = {"run_id": run_id, "run_number": run_number, **fields, "git_label": git_label}
+        _append_record(index_path, record)
+        _write_latest(docs_root, run_id)
+    return run_dir, record
+
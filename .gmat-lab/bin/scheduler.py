@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable
+
+CaseResult = tuple[int, "dict | None"]
+
+
+def case_dependencies(cases: list[dict], known_ids: set[str] | None = None) -> dict[str, set[str]]:
+    """Map case id -> selected case ids it waits for (``depends_on`` + producers of ``inputs``).
+
+    Dependencies on catalog cases that were not selected are assumed satisfied.
+    """
+    selected = {case["id"] for case in cases}
+    known = selected | (known_ids or set())
+    producers: dict[str, str] = {}
+    for case in cases:
+        for output in case.get("outputs", []):
+            producers[output] = case["id"]
+
+    deps: dict[str, set[str]] = {}
+    for case in cases:
+        case_deps: set[str] = set()
+        for dep in case.get("depends_on", []):
+            if dep not in known:
+                raise ValueError(f"case {case['id']} depends on unknown case {dep}")
+            if dep in selected:
+                case_deps.add(dep)
+        for item in case.get("inputs", []):
+            producer = producers.get(item)
+            if producer and producer != case["id"]:
+                case_deps.add(producer)
+        deps[case["id"]] = case_deps
+    return deps
+
+
+def topological_order(cases: list[dict], deps: dict[str, set[str]]) -> list[dict]:
+    """Order cases so dependencies come first, keeping catalog order otherwise."""
+    by_id = {case["id"]: case for case in cases}
+    ordered: list[dict] = []
+    state: dict[str, str] = {}
+
+    def _visit(case_id: str, chain: list[str]) -> None:
+        if state.get(case_id) == "done":
+            return
+        if state.get(case_id) == "active":
+            raise ValueError(f"dependency cycle: {' -> '.join(chain + [case_id])}")
+        state[case_id] = "active"
+        for dep in sorted(deps[case_id], key=list(by_id).index):
+            _visit(dep, chain + [case_id])
+        state[case_id] = "done"
+        ordered.append(by_id[case_id])
+
+    for case in cases:
+        _visit(case["id"], [])
+    return ordered
+
+
+def run_dag(
+    cases: list[dict],
+    run_case: Callable[[dict], CaseResult],
+    jobs: int,
+    known_ids: set[str] | None = None,
+    log: Callable[[str], None] = print,
+) -> list[CaseResult]:
+    """Run cases with at most ``jobs`` in flight; skip cases whose upstream failed.
+
+    Results are returned in catalog order. ``log`` receives the skip lines, so
+    callers can serialize them with the output of running cases.
+    """
+    deps = case_dependencies(cases, known_ids)
+    pending = topological_order(cases, deps)
+    results: dict[str, CaseResult] = {}
+    running: dict[Future, str] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            progressed = False
+            for case in list(pending):
+                case_deps = deps[case["id"]]
+                failed = sorted(dep for dep in case_deps if dep in results and results[dep][0] != 0)
+                if failed:
+                    pending.remove(case)
+                    progressed = True
+                    log(f"case={case['id']} skipped upstream_failed={','.join(failed)}")
+                    results[case["id"]] = (
+                        2,
+                        {"case": case["id"], "returncode": None, "skipped": True, "upstream_failed": failed},
+                    )
+                elif len(running) < max(1, jobs) and all(dep in results for dep in case_deps):
+                    pending.remove(case)
+                    progressed = True
+                    running[pool.submit(run_case, case)] = case["id"]
+
+            if not running:
+                if progressed:
+                    continue
+                raise RuntimeError("scheduler stalled with unresolved dependencies")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    return [results[case["id"]] for case in cases]
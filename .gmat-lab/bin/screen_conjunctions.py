@@ -2,51 +2,737 @@ from __future__ import annotations
 
 import argparse
 import csv
+import json
 import math
+import shutil
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain, groupby, islice
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
+import numpy as np
 
+from propagate_tle_sgp4 import (
+    TleEntry,
+    _parse_tles,
+    _read_tle_lines,
+    csv_time_path,
+    propagate_offsets,
+    read_csv_time,
+    utc_start,
+)
+from propagation_store import PropagationStore, is_store, open_store
+from screening import (
+    Pair,
+    Shells,
+    brute_pairs,
+    grid_pairs,
+    grid_pairs_touching,
+    has_shell_partner,
+    merge_windows,
+    orbit_shells,
+    pair_distances,
+    refine_windows,
+    shell_pairs,
+)
+from tle_catalog import load_catalog, load_diff
 
-def _dist(a: tuple[float, float, float], b: tuple[float, float, float]) -> float:
-    return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2)
+# Worst-case LEO relative speed; an encounter can fall anywhere between two
+# coarse samples, so the coarse screen must reach half a step at this speed.
+_MAX_REL_SPEED_KMS = 15.0
+# Refinement candidates are screened at sub-steps of at most _SUBSTEP_S
+# between the grid samples, interpolated from the stored states. An object
+# whose interpolation error bound exceeds _INTERP_CAP_KM is propagated at the
+# sub-steps instead.
+_SUBSTEP_S = 30.0
+_INTERP_CAP_KM = 15.0
+# Bound on the relative acceleration per km of separation (tidal gravity at
+# the Earth's surface), 1/s^2.
+_GRAVITY_GRADIENT = 2 * 398600.4418 / 6378.137**3
+
+
+def _prefilter_shells(sats, pad_km: float, threshold_km: float) -> dict[str, tuple[float, float]]:
+    # Objects whose shell overlaps no other shell can never be flagged, so
+    # they are dropped before any per-timestep work.
+    shells = orbit_shells(sats, pad_km)
+    names = list(shells)
+    low = np.array([shells[n][0] for n in names])
+    high = np.array([shells[n][1] for n in names])
+    partnered = has_shell_partner(low, high, threshold_km)
+    print(f"prefilter: objects={len(names)} kept={int(partnered.sum())}")
+    return {name: shells[name] for name, keep in zip(names, partnered.tolist()) if keep}
+
+
+Start = tuple[float, float] | None
+
+
+def _pair_separation(sat_a, sat_b, start: Start):
+    def separation(minutes: np.ndarray) -> np.ndarray:
+        err_a, r_a, _v_a = propagate_offsets(sat_a, minutes, start)
+        err_b, r_b, _v_b = propagate_offsets(sat_b, minutes, start)
+        d = np.linalg.norm(r_a - r_b, axis=1)
+        d[(err_a != 0) | (err_b != 0)] = np.nan
+        return d
+
+    return separation
+
+
+def _relative_speed(sat_a, sat_b, minute: float, start: Start) -> float:
+    at = np.array([minute])
+    _err_a, _r_a, v_a = propagate_offsets(sat_a, at, start)
+    _err_b, _r_b, v_b = propagate_offsets(sat_b, at, start)
+    return float(np.linalg.norm(v_a[0] - v_b[0]))
+
+
+Candidates = dict[tuple[str, str], list[float]]
+TcaRow = tuple[float, str, str, float, float]
+
+
+def _refine_rows(
+    items: list[tuple[tuple[str, str], list[float]]],
+    sats: dict,
+    half_width: float,
+    span: tuple[int, int],
+    threshold_km: float,
+    start: Start = None,
+) -> list[TcaRow]:
+    # Re-propagate only the candidate pairs around their coarse hits and
+    # locate each approach between the grid samples. Minutes count from
+    # `start` (jd, fr) on an absolute grid, else from each TLE epoch.
+    rows = []
+    for (name_a, name_b), minutes in items:
+        sat_a, sat_b = sats[name_a], sats[name_b]
+        separation = _pair_separation(sat_a, sat_b, start)
+        windows = merge_windows(minutes, half_width, *span)
+        for tca, miss in refine_windows(separation, windows, threshold_km, *span):
+            rows.append((tca, name_a, name_b, miss, _relative_speed(sat_a, sat_b, tca, start)))
+    return rows
+
+
+def _refine_part(
+    items: list[tuple[tuple[str, str], list[float]]],
+    entries: list[TleEntry],
+    half_width: float,
+    span: tuple[int, int],
+    threshold_km: float,
+    start: Start,
+) -> list[TcaRow]:
+    # Worker: Satrec objects do not pickle, so the pair TLEs are re-parsed.
+    return _refine_rows(items, dict(_parse_tles(entries)), half_width, span, threshold_km, start)
+
+
+def _write_tca(out_path: Path, rows: list[TcaRow], candidate_pairs: int) -> None:
+    # Sorted at the written precision: rows carried over by --diff are read
+    # back from this file, and must order like freshly refined ones.
+    rows = sorted((round(tca, 4), a, b, round(miss, 6), round(speed, 6)) for tca, a, b, miss, speed in rows)
+    with out_path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["tca_minutes", "sat_a", "sat_b", "miss_km", "rel_speed_kms"])
+        for tca, name_a, name_b, miss, speed in rows:
+            w.writerow([f"{tca:.4f}", name_a, name_b, f"{miss:.6f}", f"{speed:.6f}"])
+    print(f"saved={out_path} candidate_pairs={candidate_pairs} approaches={len(rows)}")
+
+
+# (minute, names, ids, positions, velocities): ids tell objects apart across
+# frames (store rows, or the row's place within its minute in a CSV, where
+# every object has a row per minute); velocities are None unless requested.
+Frame = tuple[int, list[str], np.ndarray, np.ndarray, np.ndarray | None]
+Entry = tuple[str, int, tuple[float, float, float], tuple[float, float, float]]
+
+
+def _row_entry(row: dict[str, str], ordinal: int, keep: Callable[[str], bool] | None) -> Entry | None:
+    if int(row["err"]) != 0:
+        return None
+    sat = row["sat"]
+    if keep is not None and not keep(sat):
+        return None
+    position = (float(row["x_km"]), float(row["y_km"]), float(row["z_km"]))
+    return sat, ordinal, position, (float(row["vx_kms"]), float(row["vy_kms"]), float(row["vz_kms"]))
+
+
+def _frame(minute: int, entries: list[Entry]) -> Frame:
+    names, ids, positions, velocities = zip(*entries)
+    return (
+        minute,
+        list(names),
+        np.array(ids, dtype=np.int64),
+        np.array(positions, dtype=np.float64),
+        np.array(velocities, dtype=np.float64),
+    )
+
+
+def _csv_frames(path: Path, keep: Callable[[str], bool] | None) -> Iterator[Frame]:
+    # propagate_tle_sgp4 writes satellite-major rows, so the whole file is
+    # bucketed by minute before the first frame is available.
+    by_minute: dict[int, list[Entry]] = defaultdict(list)
+    seen: dict[int, int] = defaultdict(int)
+    with path.open("r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            minute = int(row["minutes"])
+            entry = _row_entry(row, seen[minute], keep)
+            seen[minute] += 1
+            if entry is not None:
+                by_minute[minute].append(entry)
+    for minute, entries in sorted(by_minute.items()):
+        yield _frame(minute, entries)
+
+
+def _csv_stream_frames(path: Path, keep: Callable[[str], bool] | None) -> Iterator[Frame]:
+    # Minute-sorted input: hold one minute of rows at a time.
+    previous = None
+    with path.open("r", encoding="utf-8") as f:
+        for minute, rows in groupby(csv.DictReader(f), key=lambda row: int(row["minutes"])):
+            if previous is not None and minute <= previous:
+                raise SystemExit(f"--stream needs input sorted by minutes: {path} has minute {minute} after {previous}")
+            previous = minute
+            entries = [entry for k, row in enumerate(rows) if (entry := _row_entry(row, k, keep)) is not None]
+            if entries:
+                yield _frame(minute, entries)
+
+
+def _store_frames(
+    store: PropagationStore,
+    keep: Callable[[str], bool] | None,
+    window_steps: int,
+    first_step: int = 0,
+    last_step: int | None = None,
+    velocities: bool = False,
+) -> Iterator[Frame]:
+    # Same frames as the CSV path (satellite order, err != 0 dropped), read
+    # from the memory-mapped columns one window of timesteps at a time.
+    selected = np.ones(len(store.names), dtype=bool)
+    if keep is not None:
+        selected = np.array([keep(name) for name in store.names], dtype=bool)
+    minutes = store.minutes.tolist()
+    last_step = len(minutes) if last_step is None else min(last_step, len(minutes))
+    previous_index, names = None, []
+    for first in range(first_step, last_step, window_steps):
+        last = min(first + window_steps, last_step)
+        err = np.asarray(store.err[:, first:last])
+        positions = np.asarray(store.positions[:, first:last, :])
+        window = np.asarray(store.velocities[:, first:last, :]) if velocities else None
+        for k in range(last - first):
+            index = np.flatnonzero(selected & (err[:, k] == 0))
+            if previous_index is None or not np.array_equal(index, previous_index):
+                previous_index, names = index, [store.names[i] for i in index.tolist()]
+            if len(index):
+                v = None if window is None else window[index, k, :]
+                yield int(minutes[first + k]), names, index, positions[index, k, :], v
+
+
+@dataclass
+class Interpolation:
+    # Candidate screening between grid samples. A sub-step state is the cubic
+    # Hermite interpolant of the positions and velocities at the two
+    # neighbouring samples; its position error stays below scale[name] * dt**4
+    # for a step of dt seconds. Objects above _INTERP_CAP_KM for a step are
+    # propagated from their TLE at the sub-steps instead.
+    scale: dict[str, float]
+    entries: dict[str, TleEntry]
+    start: Start
+
+
+def _interp_scale(sats) -> dict[str, float]:
+    # The interpolant misses by at most dt**4 / 384 times the fourth
+    # derivative of the position, taken as (v/r)**4 * r at perigee and
+    # doubled. The bound fails only for objects already decaying below
+    # ~100 km, which end up propagated anyway.
+    scale: dict[str, float] = {}
+    for name, sat in sats:
+        perigee = (1.0 + sat.altp) * sat.radiusearthkm
+        rate = math.sqrt(sat.mu * (1.0 + sat.ecco) / perigee) / perigee
+        scale[name] = max(scale.get(name, 0.0), 2.0 * rate**4 * perigee / 384.0)
+    return scale
+
+
+# (minute, names, positions, velocities, slack): slack is each object's
+# worst-case displacement error over _SUBSTEP_S / 2 from interpolation, or
+# None for exact states.
+SubFrame = tuple[float, list[str], np.ndarray, np.ndarray, np.ndarray | None]
+
+
+def _subframes(previous: Frame, frame: Frame, interp: Interpolation, sats: dict) -> Iterator[SubFrame]:
+    # States at the sub-steps strictly between two frames, for the objects
+    # valid in both. `sats` caches parsed TLEs.
+    minute0, _names0, ids0, r0, v0 = previous
+    minute1, names1, ids1, r1, v1 = frame
+    _ids, a, b = np.intersect1d(ids0, ids1, assume_unique=True, return_indices=True)
+    dt = (minute1 - minute0) * 60.0
+    count = math.ceil(dt / _SUBSTEP_S)
+    if count < 2 or not len(b):
+        return
+    names = [names1[k] for k in b.tolist()]
+    tau = (np.arange(1, count) / count)[:, None, None]
+    r0, v0, r1, v1 = r0[a], v0[a] * dt, r1[b], v1[b] * dt
+    positions = (
+        (2 * tau**3 - 3 * tau**2 + 1) * r0
+        + (tau**3 - 2 * tau**2 + tau) * v0
+        + (3 * tau**2 - 2 * tau**3) * r1
+        + (tau**3 - tau**2) * v1
+    )
+    velocities = (
+        (6 * tau**2 - 6 * tau) * r0
+        + (3 * tau**2 - 4 * tau + 1) * v0
+        + (6 * tau - 6 * tau**2) * r1
+        + (3 * tau**2 - 2 * tau) * v1
+    ) / dt
+    # The velocity error is at most 384 * sqrt(3) / 216 / dt times the
+    # position bound.
+    error = np.array([interp.scale[name] for name in names]) * dt**4
+    slack = error * (1.0 + 384.0 * math.sqrt(3.0) / 216.0 * _SUBSTEP_S / 2.0 / dt)
+    times = minute0 + tau.ravel() * (minute1 - minute0)
+    valid = np.ones(positions.shape[:2], dtype=bool)
+    for k in np.flatnonzero(error > _INTERP_CAP_KM).tolist():
+        name = names[k]
+        if name not in sats:
+            sats.update(_parse_tles([interp.entries[name]]))
+        err, positions[:, k], velocities[:, k] = propagate_offsets(sats[name], times, interp.start)
+        valid[:, k] = err == 0
+        slack[k] = 0.0
+    for s, minute in enumerate(times.tolist()):
+        if valid[s].all():
+            yield minute, names, positions[s], velocities[s], slack
+        else:
+            index = np.flatnonzero(valid[s])
+            yield minute, [names[k] for k in index.tolist()], positions[s, index], velocities[s, index], slack[index]
+
+
+def _approaching(
+    pairs: list[Pair], positions: np.ndarray, velocities: np.ndarray, slack: np.ndarray | None, threshold_km: float
+) -> list[tuple[int, int]]:
+    # The pairs whose straight-line relative motion within _SUBSTEP_S / 2 of
+    # this state passes within threshold_km, widened by the objects' slack
+    # and the gravity-gradient bend of the relative path (under 1 km here).
+    if not pairs:
+        return []
+    i, j, d = (np.array(column) for column in zip(*pairs))
+    reach = _SUBSTEP_S / 2.0
+    delta = positions[i] - positions[j]
+    rate = velocities[i] - velocities[j]
+    speed2 = (rate * rate).sum(axis=1)
+    when = -(delta * rate).sum(axis=1) / np.where(speed2 > 0.0, speed2, 1.0)
+    when = np.clip(when, -reach, reach)
+    miss = np.linalg.norm(delta + rate * when[:, None], axis=1)
+    bend = _GRAVITY_GRADIENT * (d + np.sqrt(speed2) * reach) * reach**2 / 2.0
+    limit = threshold_km + bend + (0.0 if slack is None else slack[i] + slack[j])
+    keep = np.flatnonzero(miss <= limit)
+    return list(zip(i[keep].tolist(), j[keep].tolist()))
+
+
+def _object_arrays(shells: dict[str, tuple[float, float]] | None, stale: set[str] | None):
+    # Per-object shell bounds and stale mask for a list of names; they only
+    # change when the set of valid objects does, so the last one is reused.
+    last: list = [None, (None, None)]
+
+    def arrays(names: list[str]) -> tuple[Shells | None, np.ndarray | None]:
+        if names != last[0]:
+            bounds = touched = None
+            if shells is not None:
+                bounds = (
+                    np.array([shells[sat][0] for sat in names]),
+                    np.array([shells[sat][1] for sat in names]),
+                )
+            if stale is not None:
+                touched = np.array([sat in stale for sat in names], dtype=bool)
+            last[:] = [names, (bounds, touched)]
+        return last[1]
+
+    return arrays
+
+
+def _find_pairs(
+    positions: np.ndarray, bounds: Shells | None, touched: np.ndarray | None, screen_km: float, engine: str
+) -> list[Pair]:
+    if engine == "grid":
+        if touched is None:
+            return grid_pairs(positions, screen_km, bounds)
+        return grid_pairs_touching(positions, touched, screen_km, bounds)
+    if bounds is not None:
+        i, j = shell_pairs(*bounds, screen_km)
+        if touched is not None:
+            hit = touched[i] | touched[j]
+            i, j = i[hit], j[hit]
+        return pair_distances(positions, i, j, screen_km)
+    pairs = brute_pairs(positions.tolist(), screen_km)
+    if touched is not None:
+        pairs = [(i, j, d) for i, j, d in pairs if touched[i] or touched[j]]
+    return pairs
+
+
+def _screen_frames(
+    frames: Iterable[Frame],
+    f,
+    shells: dict[str, tuple[float, float]] | None,
+    args: argparse.Namespace,
+    screen_km: float,
+    stale: set[str] | None = None,
+    interp: Interpolation | None = None,
+    from_minute: int | None = None,
+) -> tuple[Candidates, tuple[int, int] | None]:
+    # Writes flag rows for the frames to f and returns the refinement
+    # candidates and the (first, last) minute seen. With `stale`, only pairs
+    # involving a stale object are screened. With `interp`, candidates are
+    # also screened at sub-steps between frames; frames before `from_minute`
+    # only open that interpolation (they belong to the previous time slab).
+    w = csv.writer(f)
+    candidates: Candidates = defaultdict(list)
+    span = None
+    arrays = _object_arrays(shells, stale)
+    sats: dict = {}
+    previous = None
+    for frame in frames:
+        minute, names, _ids, positions, velocities = frame
+        if interp is not None and previous is not None:
+            for sub in _subframes(previous, frame, interp, sats):
+                sub_minute, sub_names, sub_positions, sub_velocities, slack = sub
+                pairs = _find_pairs(sub_positions, *arrays(sub_names), screen_km, args.engine)
+                for i, j in _approaching(pairs, sub_positions, sub_velocities, slack, args.threshold_km):
+                    if sub_names[i] != sub_names[j]:
+                        candidates[(sub_names[i], sub_names[j])].append(sub_minute)
+        previous = frame
+        if from_minute is not None and minute < from_minute:
+            continue
+        span = (span[0] if span else minute, minute)
+        pairs = _find_pairs(positions, *arrays(names), screen_km, args.engine)
+        if args.refine:
+            if interp is None:
+                hits = [(i, j) for i, j, _d in pairs]
+            else:
+                hits = _approaching(pairs, positions, velocities, None, args.threshold_km)
+            for i, j in hits:
+                if names[i] != names[j]:
+                    candidates[(names[i], names[j])].append(minute)
+        for i, j, d in pairs:
+            if d <= args.threshold_km:
+                w.writerow([minute, names[i], names[j], f"{d:.6f}"])
+        f.flush()
+    return candidates, span
+
+
+def _screen_slab(
+    store_path: str,
+    first: int,
+    last: int,
+    shells: dict[str, tuple[float, float]] | None,
+    args: argparse.Namespace,
+    screen_km: float,
+    part_path: str,
+    interp: Interpolation | None = None,
+) -> Candidates:
+    # Worker: screen timesteps [first, last) of the store into a part file.
+    # Interpolation starts from the slab's preceding timestep.
+    keep = None if shells is None else shells.__contains__
+    store = open_store(Path(store_path))
+    lead = 1 if interp is not None and first > 0 else 0
+    frames = _store_frames(store, keep, args.window_steps, first - lead, last, interp is not None)
+    from_minute = int(store.minutes[first]) if first < len(store.minutes) else None
+    with open(part_path, "w", newline="", encoding="utf-8") as f:
+        candidates, _span = _screen_frames(frames, f, shells, args, screen_km, interp=interp, from_minute=from_minute)
+    return dict(candidates)
+
+
+def _screen_parallel(
+    store_path: Path,
+    n_steps: int,
+    f,
+    shells: dict[str, tuple[float, float]] | None,
+    args: argparse.Namespace,
+    screen_km: float,
+    interp: Interpolation | None = None,
+) -> Candidates:
+    # Time slabs are screened independently and their part files appended in
+    # time order, so the output matches a serial run.
+    size = max(1, math.ceil(n_steps / (args.workers * 4)))
+    firsts = list(range(0, n_steps, size))
+    parts = [Path(f.name).with_name(f"{Path(f.name).name}.part-{n:04d}") for n in range(len(firsts))]
+    candidates: Candidates = defaultdict(list)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        jobs = [
+            pool.submit(_screen_slab, str(store_path), first, first + size, shells, args, screen_km, str(part), interp)
+            for first, part in zip(firsts, parts)
+        ]
+        for job, part in zip(jobs, parts):
+            for pair, minutes in job.result().items():
+                candidates[pair].extend(minutes)
+            with part.open(encoding="utf-8", newline="") as slab:
+                shutil.copyfileobj(slab, f)
+            part.unlink()
+    return candidates
+
+
+def _refine_parallel(
+    candidates: Candidates,
+    entries: dict[str, TleEntry],
+    half_width: float,
+    span: tuple[int, int],
+    args: argparse.Namespace,
+    start: Start,
+) -> list[TcaRow]:
+    items = sorted(candidates.items())
+    size = max(1, math.ceil(len(items) / (args.workers * 4)))
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        jobs = []
+        for first in range(0, len(items), size):
+            chunk = items[first : first + size]
+            names = {name for pair, _minutes in chunk for name in pair}
+            jobs.append(
+                pool.submit(
+                    _refine_part, chunk, [entries[name] for name in names], half_width, span, args.threshold_km, start
+                )
+            )
+        return [row for job in jobs for row in job.result()]
+
+
+def _previous_rows(path: Path, stale: set[str]) -> list[list[str]]:
+    # Rows of the previous run (flags or TCA, sat_a/sat_b in columns 1 and 2)
+    # that involve no stale object, kept verbatim.
+    if not path.exists():
+        raise SystemExit(f"--diff needs the previous results at {path}")
+    with path.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))[1:]
+    return [row for row in rows if row[1] not in stale and row[2] not in stale]
+
+
+def _merge_flags(out_path: Path, previous: list[list[str]], fresh_path: Path, names: list[str]) -> None:
+    # Carried-over and re-screened rows, in the order of a full run: by
+    # minute, then by the objects' positions in the store.
+    rank: dict[str, int] = {}
+    for k, name in enumerate(names):
+        rank.setdefault(name, k)
+    with fresh_path.open(newline="", encoding="utf-8") as f:
+        fresh = list(csv.reader(f))
+    rows = [row for row in chain(previous, fresh) if row[1] in rank and row[2] in rank]
+    rows.sort(key=lambda row: (int(row[0]), rank[row[1]], rank[row[2]]))
+    with out_path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["minutes", "sat_a", "sat_b", "distance_km"])
+        w.writerows(rows)
+    fresh_path.unlink()
+    print(f"merged: carried={len(previous)} rescreened={len(fresh)}")
+
+
+def _screen_settings(args: argparse.Namespace, screen_km: float, store: PropagationStore) -> dict:
+    # Everything besides the element sets that decides which rows a store
+    # screening produces; an incremental merge needs them unchanged.
+    settings = {
+        "threshold_km": args.threshold_km,
+        "screen_km": screen_km,
+        "refine": args.refine,
+        "substep_s": _SUBSTEP_S if args.refine and args.coarse_threshold_km is None else None,
+        "pad_km": args.pad_km if args.tle else None,
+        "minutes": store.minutes.tolist(),
+        "time": store.time,
+    }
+    return json.loads(json.dumps(settings))
+
+
+def _store_sources(store: PropagationStore) -> dict[str, list[str]]:
+    # Element sets behind each object name (names can repeat, e.g. debris).
+    sources: dict[str, list[str]] = defaultdict(list)
+    for name, tle in zip(store.names, store.tle_hashes):
+        sources[name].append(tle)
+    return {name: sorted(tles) for name, tles in sources.items()}
+
+
+def _write_sources(path: Path, store: PropagationStore, settings: dict) -> None:
+    payload = {"settings": settings, "sources": _store_sources(store)}
+    path.write_text(json.dumps(payload) + "\n", encoding="utf-8")
+
+
+def _stale_names(path: Path, store: PropagationStore, settings: dict, hint: set[str]) -> set[str]:
+    # Names whose element sets differ between the store the previous results
+    # were screened from (recorded beside them) and this one. The catalog
+    # diff covers only the latest fetch, so it is cross-checked, not trusted.
+    if not path.exists():
+        raise SystemExit(f"--diff needs {path} from a previous store screening; run a full screening")
+    previous = json.loads(path.read_text(encoding="utf-8"))
+    if previous["settings"] != settings:
+        raise SystemExit(
+            f"--diff: thresholds or time grid differ from the run recorded in {path}; run a full screening"
+        )
+    current, old = _store_sources(store), previous["sources"]
+    stale = {name for name in current.keys() | old.keys() if current.get(name) != old.get(name)}
+    missed = stale - hint
+    if missed:
+        print(
+            f"WARN: {len(missed)} objects changed since the previous screening but are not in --diff "
+            "(it was taken against a different fetch); re-screening them too"
+        )
+    return stale
+
+
+def _refine_start(args: argparse.Namespace, store: PropagationStore | None, input_path: Path) -> Start:
+    # What the input's minutes count from: (jd, fr) on an absolute grid, None
+    # for each TLE's epoch. Stores and propagate_tle_sgp4 CSVs record their
+    # grid; --start only stands in for a missing record and must agree with
+    # one that exists.
+    time = store.time if store is not None else read_csv_time(input_path)
+    if time is None:
+        if args.start is None:
+            raise SystemExit(
+                f"--refine: {input_path} has no time grid record ({csv_time_path(input_path).name}); "
+                "re-propagate it, or pass --start if it was propagated on an absolute grid"
+            )
+        return utc_start(args.start)
+    if time["grid"] == "absolute":
+        start = (time["start_jd"], time["start_fr"])
+        if args.start and utc_start(args.start) != start:
+            raise SystemExit(f"--start {args.start} differs from the grid start {time['start_utc']} of {input_path}")
+        return start
+    if args.start:
+        raise SystemExit(f"--start given, but {input_path} was propagated on the per-TLE epoch grid")
+    return None
+
+
+def _screen_threshold(args: argparse.Namespace) -> float:
+    if not args.refine:
+        return args.threshold_km
+    screen_km = args.coarse_threshold_km
+    if screen_km is None:
+        # Half a sub-step at the worst-case relative speed, plus the
+        # interpolation error of both objects.
+        screen_km = args.threshold_km + _MAX_REL_SPEED_KMS * _SUBSTEP_S / 2 + 2 * _INTERP_CAP_KM
+    screen_km = max(screen_km, args.threshold_km)
+    print(f"coarse_threshold_km={screen_km:.1f}")
+    return screen_km
 
 
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", required=True)
     parser.add_argument("--threshold-km", type=float, default=5.0)
+    parser.add_argument("--engine", choices=["grid", "brute"], default="grid")
+    parser.add_argument(
+        "--tle", default=None, help="TLE file or .npz catalog the input was propagated from (enables the prefilter)"
+    )
+    parser.add_argument("--pad-km", type=float, default=50.0, help="apogee/perigee padding for the shell prefilter")
+    parser.add_argument("--refine", action="store_true", help="find TCA and miss distance between samples (needs --tle)")
+    parser.add_argument(
+        "--coarse-threshold-km",
+        type=float,
+        default=None,
+        help="screen only the grid samples, at this distance, for refinement candidates (default: interpolate "
+        f"sub-steps of {_SUBSTEP_S:g} s between samples)",
+    )
+    parser.add_argument("--stream", action="store_true", help="read a minute-sorted CSV one minute at a time")
+    parser.add_argument(
+        "--start",
+        default=None,
+        help="UTC start of an absolute-grid CSV without a .time.json record (propagate_tle_sgp4 writes one)",
+    )
+    parser.add_argument("--window-steps", type=int, default=64, help="timesteps per read from a columnar store")
+    parser.add_argument("--workers", type=int, default=1, help="screen time slabs (store input) in N processes")
+    parser.add_argument(
+        "--diff",
+        default=None,
+        help="catalog diff from fetch_celestrak: re-screen only pairs with changed objects and merge with the "
+        "previous results",
+    )
     args = parser.parse_args()
+    if args.refine and not args.tle:
+        parser.error("--refine requires --tle")
+    if args.window_steps < 1:
+        parser.error("--window-steps must be >= 1")
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
 
     input_path = Path(args.input)
-    by_minute: dict[int, list[tuple[str, tuple[float, float, float]]]] = defaultdict(list)
+    if args.workers > 1 and not is_store(input_path):
+        parser.error("--workers needs a columnar store input (propagate with --format npy)")
+    if args.diff and (args.workers > 1 or not is_store(input_path)):
+        parser.error("--diff needs a columnar store input and --workers 1")
 
-    with input_path.open("r", encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            if int(row["err"]) != 0:
-                continue
-            minute = int(row["minutes"])
-            sat = row["sat"]
-            pos = (float(row["x_km"]), float(row["y_km"]), float(row["z_km"]))
-            by_minute[minute].append((sat, pos))
+    entries = None
+    if args.tle:
+        tle_path = Path(args.tle)
+        entries = load_catalog(tle_path).entries() if tle_path.suffix == ".npz" else _read_tle_lines(tle_path)
+    tles = _parse_tles(entries) if entries is not None else None
+    shells = _prefilter_shells(tles, args.pad_km, args.threshold_km) if tles is not None else None
 
     out_path = Path(".gmat-lab/outputs/conjunction_flags.csv")
     out_path.parent.mkdir(parents=True, exist_ok=True)
+    tca_path = out_path.with_name("conjunction_tca.csv")
 
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["minutes", "sat_a", "sat_b", "distance_km"])
-        for minute, entries in sorted(by_minute.items()):
-            for i in range(len(entries)):
-                for j in range(i + 1, len(entries)):
-                    sa, pa = entries[i]
-                    sb, pb = entries[j]
-                    d = _dist(pa, pb)
-                    if d <= args.threshold_km:
-                        w.writerow([minute, sa, sb, f"{d:.6f}"])
+    sources_path = out_path.with_name("conjunction_flags.sources.json")
+
+    store = open_store(input_path) if is_store(input_path) else None
+    screen_km = _screen_threshold(args)
+    by_name: dict[str, TleEntry] = {}
+    for entry in entries or ():
+        by_name.setdefault(entry[0], entry)
+    start = _refine_start(args, store, input_path) if args.refine else None
+    # By default candidates are screened at interpolated sub-steps, and each
+    # refinement window spans one sub-step around a hit; with an explicit
+    # --coarse-threshold-km only the grid samples are screened and windows
+    # span a grid step.
+    interp = None
+    if args.refine and args.coarse_threshold_km is None:
+        interp = Interpolation(_interp_scale(tles), by_name, start)
+        half_width = _SUBSTEP_S / 60.0
+    elif store is not None:
+        minutes = store.minutes.tolist()
+        half_width = minutes[1] - minutes[0] if len(minutes) > 1 else 0
+
+    # Incremental mode: results for pairs of unchanged objects are carried
+    # over and only pairs touching a stale object are screened again.
+    stale = previous_flags = previous_tca = None
+    screen_path = out_path
+    if args.diff:
+        if store.tle_hashes is None:
+            raise SystemExit(f"--diff needs a store with TLE hashes; re-propagate {input_path} in full")
+        hint = set(load_diff(Path(args.diff)).stale_names)
+        stale = _stale_names(sources_path, store, _screen_settings(args, screen_km, store), hint)
+        previous_flags = _previous_rows(out_path, stale)
+        previous_tca = _previous_rows(tca_path, stale) if args.refine else None
+        screen_path = out_path.with_name(out_path.name + ".part")
+    # The record is rewritten once these results are complete; an interrupted
+    # run must not leave a record describing results it overwrote.
+    sources_path.unlink(missing_ok=True)
+
+    with screen_path.open("w", newline="", encoding="utf-8") as f:
+        if stale is None:
+            csv.writer(f).writerow(["minutes", "sat_a", "sat_b", "distance_km"])
+        f.flush()
+        if args.workers > 1:
+            n_steps = len(store.minutes)
+            candidates = _screen_parallel(input_path, n_steps, f, shells, args, screen_km, interp)
+            span = (int(store.minutes[0]), int(store.minutes[-1])) if n_steps else None
+        else:
+            keep = None if shells is None else shells.__contains__
+            if store is not None:
+                frames = _store_frames(store, keep, args.window_steps, velocities=interp is not None)
+            elif args.stream:
+                frames = _csv_stream_frames(input_path, keep)
+            else:
+                frames = _csv_frames(input_path, keep)
+            if args.refine and interp is None and store is None:
+                # The grid step comes from the first two frames; the rest
+                # stay lazy.
+                head = list(islice(frames, 2))
+                half_width = head[1][0] - head[0][0] if len(head) == 2 else 0
+                frames = chain(head, frames)
+            candidates, span = _screen_frames(frames, f, shells, args, screen_km, stale, interp)
 
+    if stale is not None:
+        _merge_flags(out_path, previous_flags, screen_path, store.names)
     print(f"saved={out_path}")
+    if args.refine:
+        span = span or (0, 0)
+        if args.workers > 1:
+            rows = _refine_parallel(candidates, by_name, half_width, span, args, start)
+        else:
+            # Only the objects in candidate pairs are re-propagated.
+            names = sorted({name for pair in candidates for name in pair})
+            sats = dict(_parse_tles([by_name[name] for name in names]))
+            rows = _refine_rows(list(candidates.items()), sats, half_width, span, args.threshold_km, start)
+        if previous_tca is not None:
+            rows += [(float(tca), a, b, float(miss), float(speed)) for tca, a, b, miss, speed in previous_tca]
+        _write_tca(tca_path, rows, len(candidates))
+    # Record what these results were screened from for the next --diff run.
+    if store is not None and store.tle_hashes is not None:
+        _write_sources(sources_path, store, _screen_settings(args, screen_km, store))
     return 0
 
 
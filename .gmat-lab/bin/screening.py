@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import math
+from typing import Callable
+
+import numpy as np
+
+# Cell coordinates are packed into one int64 key, 21 bits per axis.
+_AXIS_BITS = 21
+_MAX_CELL = (1 << _AXIS_BITS) - 3
+# The home cell plus the 13 neighbours "after" it, so each cell pair is visited once.
+_OFFSETS = [(0, 0, 0)] + [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1)
+    for dy in (-1, 0, 1)
+    for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+]
+_ALL_OFFSETS = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+
+Pair = tuple[int, int, float]
+Shells = tuple[np.ndarray, np.ndarray]
+Separation = Callable[[np.ndarray], np.ndarray]
+
+_INV_PHI = (math.sqrt(5.0) - 1.0) / 2.0
+
+
+def dist(a: tuple[float, float, float], b: tuple[float, float, float]) -> float:
+    return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2)
+
+
+def brute_pairs(positions: list[tuple[float, float, float]], threshold_km: float) -> list[Pair]:
+    pairs = []
+    for i in range(len(positions)):
+        for j in range(i + 1, len(positions)):
+            d = dist(positions[i], positions[j])
+            if d <= threshold_km:
+                pairs.append((i, j, d))
+    return pairs
+
+
+def orbit_shells(sats, pad_km: float) -> dict[str, tuple[float, float]]:
+    # Radial shell [perigee - pad, apogee + pad] from the mean elements; the
+    # pad absorbs short-period and drag deviations of the osculating radius.
+    # Objects sharing a name get the union of their shells.
+    shells: dict[str, tuple[float, float]] = {}
+    for name, sat in sats:
+        low = (1.0 + sat.altp) * sat.radiusearthkm - pad_km
+        high = (1.0 + sat.alta) * sat.radiusearthkm + pad_km
+        if name in shells:
+            low, high = min(low, shells[name][0]), max(high, shells[name][1])
+        shells[name] = (low, high)
+    return shells
+
+
+def shell_pairs(low: np.ndarray, high: np.ndarray, threshold_km: float) -> tuple[np.ndarray, np.ndarray]:
+    # Sort-and-sweep: two objects can only come within threshold_km if their
+    # shells overlap once widened by it. After sorting by lower bound, the
+    # partners of each shell are the later ones starting below its top.
+    n = len(low)
+    order = np.argsort(low, kind="stable")
+    sorted_low = low[order]
+    start = np.arange(1, n + 1)
+    stop = np.searchsorted(sorted_low, high[order] + threshold_km, "right")
+    a, b = _expand_ranges(start, stop)
+    i, j = order[a], order[b]
+    first, second = np.minimum(i, j), np.maximum(i, j)
+    ranked = np.lexsort((second, first))
+    return first[ranked], second[ranked]
+
+
+def has_shell_partner(low: np.ndarray, high: np.ndarray, threshold_km: float) -> np.ndarray:
+    # Same sweep without enumerating pairs: a shell has a partner if the next
+    # shell starts below its top, or an earlier shell reaches up to it.
+    order = np.argsort(low, kind="stable")
+    sorted_low = low[order]
+    reach = high[order] + threshold_km
+    after = np.zeros(len(low), dtype=bool)
+    after[:-1] = sorted_low[1:] <= reach[:-1]
+    before = np.zeros(len(low), dtype=bool)
+    before[1:] = np.maximum.accumulate(reach)[:-1] >= sorted_low[1:]
+    partnered = np.empty(len(low), dtype=bool)
+    partnered[order] = after | before
+    return partnered
+
+
+def _shells_overlap(shells: Shells, i: np.ndarray, j: np.ndarray, threshold_km: float) -> np.ndarray:
+    low, high = shells
+    return (low[i] <= high[j] + threshold_km) & (low[j] <= high[i] + threshold_km)
+
+
+def _expand_ranges(start: np.ndarray, stop: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # For each k, pair k with every index in [start[k], stop[k]).
+    counts = np.maximum(stop - start, 0)
+    total = int(counts.sum())
+    run_starts = np.cumsum(counts) - counts
+    firsts = np.repeat(np.arange(len(start)), counts)
+    seconds = np.repeat(start - run_starts, counts) + np.arange(total)
+    return firsts, seconds
+
+
+def pair_distances(positions: np.ndarray, i: np.ndarray, j: np.ndarray, threshold_km: float) -> list[Pair]:
+    # Distances use the same operation order as dist(); pairs come back as
+    # (i, j) with i < j in input order.
+    delta = positions[i] - positions[j]
+    d = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2 + delta[:, 2] ** 2)
+    keep = d <= threshold_km
+    i, j, d = i[keep], j[keep], d[keep]
+    first, second = np.minimum(i, j), np.maximum(i, j)
+    ranked = np.lexsort((second, first))
+    return list(zip(first[ranked].tolist(), second[ranked].tolist(), d[ranked].tolist()))
+
+
+def _cell_keys(positions: np.ndarray, threshold_km: float) -> np.ndarray:
+    origin = positions.min(axis=0)
+    span = float((positions.max(axis=0) - origin).max())
+    # Grow cells for very small thresholds so keys fit, and pad slightly so
+    # floor() rounding can never push a qualifying pair two cells apart.
+    cell = max(threshold_km, span / _MAX_CELL) * (1 + 1e-6) or 1.0
+    coords = np.floor((positions - origin) / cell).astype(np.int64) + 1
+    return (coords[:, 0] << (2 * _AXIS_BITS)) | (coords[:, 1] << _AXIS_BITS) | coords[:, 2]
+
+
+def _offset_key(dx: int, dy: int, dz: int) -> int:
+    return (dx << (2 * _AXIS_BITS)) + (dy << _AXIS_BITS) + dz
+
+
+def grid_pairs(positions: np.ndarray, threshold_km: float, shells: Shells | None = None) -> list[Pair]:
+    # Uniform grid hashing: with cells at least threshold_km wide, any pair
+    # within the threshold lies in the same or an adjacent cell. Points are
+    # sorted by cell key and each neighbour cell is found with searchsorted,
+    # so only nearby candidates (whose shells overlap, when given) are
+    # measured. Output matches brute_pairs exactly.
+    n = len(positions)
+    if n < 2:
+        return []
+    keys = _cell_keys(positions, threshold_km)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    index = np.arange(n)
+
+    firsts, seconds = [], []
+    for dx, dy, dz in _OFFSETS:
+        target = sorted_keys + _offset_key(dx, dy, dz)
+        if (dx, dy, dz) == (0, 0, 0):
+            start = index + 1
+        else:
+            start = np.searchsorted(sorted_keys, target, "left")
+        stop = np.searchsorted(sorted_keys, target, "right")
+        a, b = _expand_ranges(start, stop)
+        firsts.append(a)
+        seconds.append(b)
+
+    i = order[np.concatenate(firsts)]
+    j = order[np.concatenate(seconds)]
+    if shells is not None:
+        overlap = _shells_overlap(shells, i, j, threshold_km)
+        i, j = i[overlap], j[overlap]
+    return pair_distances(positions, i, j, threshold_km)
+
+
+def grid_pairs_touching(
+    positions: np.ndarray,
+    touched: np.ndarray,
+    threshold_km: float,
+    shells: Shells | None = None,
+) -> list[Pair]:
+    # The subset of grid_pairs with at least one point in the boolean mask
+    # `touched`: only touched points search their full 27-cell neighbourhood
+    # (all offsets in one searchsorted), so the pair work scales with the
+    # touched count rather than all pairs.
+    if len(positions) < 2 or not touched.any():
+        return []
+    keys = _cell_keys(positions, threshold_km)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    sources = np.flatnonzero(touched)
+    offsets = np.array([_offset_key(*offset) for offset in _ALL_OFFSETS], dtype=np.int64)
+    target = (keys[sources][:, None] + offsets).ravel()
+    a, b = _expand_ranges(np.searchsorted(sorted_keys, target, "left"), np.searchsorted(sorted_keys, target, "right"))
+    i = sources[a // len(offsets)]
+    j = order[b]
+    # Pairs of two touched points are found from both ends; keep one.
+    single = (i != j) & (~touched[j] | (i < j))
+    i, j = i[single], j[single]
+    if shells is not None:
+        overlap = _shells_overlap(shells, i, j, threshold_km)
+        i, j = i[overlap], j[overlap]
+    return pair_distances(positions, i, j, threshold_km)
+
+
+def merge_windows(minutes: list[int], half_width: float, lower: float, upper: float) -> list[tuple[float, float]]:
+    # One [m - half_width, m + half_width] window per coarse hit, clipped to
+    # the propagated span, with overlapping windows merged.
+    windows: list[tuple[float, float]] = []
+    for minute in sorted(minutes):
+        start, stop = max(lower, minute - half_width), min(upper, minute + half_width)
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], stop))
+        else:
+            windows.append((start, stop))
+    return windows
+
+
+def refine_tca(
+    separation: Separation,
+    start: float,
+    stop: float,
+    threshold_km: float,
+    sample_min: float = 0.25,
+    tol_min: float = 1e-4,
+    max_rate_kms: float = 15.0,
+    lower: float | None = None,
+    upper: float | None = None,
+) -> list[tuple[float, float]]:
+    # Sample the pair separation across the window, then golden-section
+    # search the bracket around each local minimum that could still dip below
+    # threshold_km between samples at max_rate_kms. A minimum on a window edge
+    # is followed outwards, at most to lower / upper (the propagated span;
+    # default the window), and clamped there if the separation is still
+    # falling. Returns (tca_minutes, miss_km) for every approach within
+    # threshold_km.
+    count = max(3, math.ceil((stop - start) / sample_min) + 1)
+    times = np.linspace(start, stop, count)
+    d = separation(times)
+    step = float(times[1] - times[0])
+    slack = max_rate_kms * step * 60.0 / 2.0
+    near = d - slack <= threshold_km
+    dips = (d[1:-1] <= d[:-2]) & (d[1:-1] < d[2:]) & near[1:-1]
+    brackets = [(times[k - 1], times[k + 1]) for k in (np.flatnonzero(dips) + 1).tolist()]
+
+    def f(t: float) -> float:
+        return float(separation(np.array([t]))[0])
+
+    if d[0] < d[1] and near[0]:
+        brackets.append(_edge_bracket(f, times[1], times[0], float(d[0]), -step, start if lower is None else lower))
+    if d[-1] <= d[-2] and near[-1]:
+        brackets.append(_edge_bracket(f, times[-2], times[-1], float(d[-1]), step, stop if upper is None else upper))
+    approaches = []
+    for a, b in brackets:
+        tca = _golden_min(f, float(a), float(b), tol_min)
+        miss = f(tca)
+        if miss <= threshold_km:
+            approaches.append((tca, miss))
+    return sorted(approaches)
+
+
+def refine_windows(
+    separation: Separation,
+    windows: list[tuple[float, float]],
+    threshold_km: float,
+    lower: float,
+    upper: float,
+    sample_min: float = 0.25,
+) -> list[tuple[float, float]]:
+    # refine_tca over all windows of one pair. A minimum followed out of one
+    # window may be the one a neighbouring window found; it is kept once.
+    found = sorted(
+        approach
+        for start, stop in windows
+        for approach in refine_tca(separation, start, stop, threshold_km, sample_min, lower=lower, upper=upper)
+    )
+    approaches: list[tuple[float, float]] = []
+    for tca, miss in found:
+        if approaches and tca - approaches[-1][0] < sample_min:
+            if miss < approaches[-1][1]:
+                approaches[-1] = (tca, miss)
+        else:
+            approaches.append((tca, miss))
+    return approaches
+
+
+def _edge_bracket(
+    f: Callable[[float], float], inner: float, edge: float, f_edge: float, step: float, limit: float
+) -> tuple[float, float]:
+    # Steps from a window edge towards `limit` while the separation keeps
+    # falling. Returns the bracket around the lowest sample, or (limit, limit)
+    # when it falls all the way there.
+    while edge != limit:
+        outer = min(edge + step, limit) if step > 0 else max(edge + step, limit)
+        f_outer = f(outer)
+        if not f_outer < f_edge:
+            return min(inner, outer), max(inner, outer)
+        inner, edge, f_edge = edge, outer, f_outer
+    return edge, edge
+
+
+def _golden_min(f: Callable[[float], float], a: float, b: float, tol: float) -> float:
+    c = b - _INV_PHI * (b - a)
+    d = a + _INV_PHI * (b - a)
+    fc, fd = f(c), f(d)
+    while b - a > tol:
+        if fc < fd:
+            b, d, fd = d, c, fc
+            c = b - _INV_PHI * (b - a)
+            fc = f(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + _INV_PHI * (b - a)
+            fd = f(d)
+    return (a + b) / 2.0
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from sgp4.api import jday
+
+from common import LAB
+from propagate_tle_sgp4 import TleEntry, norad_id
+
+CACHE = LAB / "cache"
+
+
+@dataclass(frozen=True)
+class TleCatalog:
+    # One row per NORAD id, in the order of the latest ingested file.
+    norad: np.ndarray
+    names: np.ndarray
+    line1: np.ndarray
+    line2: np.ndarray
+    epoch: np.ndarray  # Julian date of the element set
+
+    def __len__(self) -> int:
+        return len(self.norad)
+
+    def entries(self, norad_ids: list[str] | None = None) -> list[TleEntry]:
+        rows = range(len(self)) if norad_ids is None else [self.index()[n] for n in norad_ids]
+        return [self.entry(k) for k in rows]
+
+    def entry(self, row: int) -> TleEntry:
+        return str(self.names[row]), str(self.line1[row]), str(self.line2[row])
+
+    def index(self) -> dict[str, int]:
+        return {norad: k for k, norad in enumerate(self.norad.tolist())}
+
+
+@dataclass(frozen=True)
+class CatalogDiff:
+    added: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    # Every name an added, updated or removed object had before or after the
+    # refresh; conjunction results are keyed by name, so these go stale.
+    stale_names: list[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> list[str]:
+        return self.added + self.updated
+
+    def to_json(self) -> dict:
+        return {
+            "added": self.added,
+            "updated": self.updated,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+            "stale_names": self.stale_names,
+        }
+
+
+def catalog_path(group: str) -> Path:
+    return CACHE / f"catalog_{group.lower()}.npz"
+
+
+def diff_path(group: str) -> Path:
+    return CACHE / f"catalog_{group.lower()}.diff.json"
+
+
+def tle_epoch(line1: str) -> float:
+    year = int(line1[18:20])
+    jd, fr = jday(2000 + year if year < 57 else 1900 + year, 1, 1, 0, 0, 0)
+    return jd + fr + float(line1[20:32]) - 1.0
+
+
+def build_catalog(entries: list[TleEntry]) -> TleCatalog:
+    return TleCatalog(
+        norad=np.array([norad_id(l1) for _name, l1, _l2 in entries], dtype=str),
+        names=np.array([name for name, _l1, _l2 in entries], dtype=str),
+        line1=np.array([l1 for _name, l1, _l2 in entries], dtype=str),
+        line2=np.array([l2 for _name, _l1, l2 in entries], dtype=str),
+        epoch=np.array([tle_epoch(l1) for _name, l1, _l2 in entries], dtype=np.float64),
+    )
+
+
+def load_catalog(path: Path) -> TleCatalog | None:
+    if not path.exists():
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        return TleCatalog(**{name: data[name] for name in ("norad", "names", "line1", "line2", "epoch")})
+
+
+def save_catalog(path: Path, catalog: TleCatalog) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        np.savez_compressed(
+            f,
+            norad=catalog.norad,
+            names=catalog.names,
+            line1=catalog.line1,
+            line2=catalog.line2,
+            epoch=catalog.epoch,
+        )
+    os.replace(tmp, path)
+
+
+def ingest(entries: list[TleEntry], previous: TleCatalog | None) -> tuple[TleCatalog, CatalogDiff]:
+    # The incoming file is authoritative for which objects exist. An object
+    # is updated when its element set epoch moves forward; an older epoch
+    # (stale mirror) keeps the cached set. Within one file the newest set per
+    # NORAD id wins.
+    incoming: dict[str, TleEntry] = {}
+    epochs: dict[str, float] = {}
+    for entry in entries:
+        key, epoch = norad_id(entry[1]), tle_epoch(entry[1])
+        if key not in incoming or epoch > epochs[key]:
+            incoming[key], epochs[key] = entry, epoch
+
+    known = previous.index() if previous is not None else {}
+    merged: list[TleEntry] = []
+    added, updated, unchanged = [], [], 0
+    stale: set[str] = set()
+    for key, entry in incoming.items():
+        k = known.get(key)
+        if k is None:
+            added.append(key)
+            merged.append(entry)
+            stale.add(entry[0])
+            continue
+        cached = previous.entry(k)
+        if epochs[key] > previous.epoch[k] or (epochs[key] == previous.epoch[k] and entry != cached):
+            updated.append(key)
+            merged.append(entry)
+            stale.update((entry[0], cached[0]))
+        else:
+            unchanged += 1
+            merged.append(cached)
+    removed = [key for key in known if key not in incoming]
+    stale.update(str(previous.names[known[key]]) for key in removed)
+    return build_catalog(merged), CatalogDiff(added, updated, removed, unchanged, sorted(stale))
+
+
+def write_diff(path: Path, diff: CatalogDiff) -> None:
+    path.write_text(json.dumps(diff.to_json(), indent=2) + "\n", encoding="utf-8")
+
+
+def load_diff(path: Path) -> CatalogDiff:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return CatalogDiff(data["added"], data["updated"], data["removed"], data["unchanged"], data.get("stale_names", []))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Micro-benchmark the per-run overhead of SubprocessGmatRunner itself (no real GMAT)."""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from gmat_tests.adapters import subprocess_runner  # noqa: E402
+from gmat_tests.adapters.subprocess_runner import SubprocessGmatRunner, prepare_script_in_workdir  # noqa: E402
+from gmat_tests.config import resolve_gmat_bin  # noqa: E402
+from gmat_tests.domain.models import GmatExecutionRequest  # noqa: E402
+
+_NOOP_GMAT = "#!/bin/sh\nexit 0\n"
+
+
+def _synthetic_startup() -> str:
+    lines = ["ROOT_PATH                = ../", "OUTPUT_PATH              = ../output/", "LOG_FILE = ../output/GmatLog.txt"]
+    lines += [f"DATA_PATH_{i:02d}             = ../data/path_{i:02d}/" for i in range(60)]
+    lines += [f"PLUGIN                   = ../plugins/libPlugin{i:02d}" for i in range(20)]
+    return "\n".join(lines) + "\n"
+
+
+def _make_fake_install(base: Path) -> Path:
+    bin_dir = base / "R2025a" / "bin"
+    bin_dir.mkdir(parents=True)
+    real_startup = resolve_gmat_bin().parent / "gmat_startup_file.txt"
+    startup_text = real_startup.read_text(encoding="utf-8") if real_startup.exists() else _synthetic_startup()
+    (bin_dir / "gmat_startup_file.txt").write_text(startup_text, encoding="utf-8")
+    gmat_bin = bin_dir / "GmatConsole"
+    gmat_bin.write_text(_NOOP_GMAT, encoding="utf-8")
+    gmat_bin.chmod(0o755)
+    return gmat_bin
+
+
+def _timed(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    median_us = statistics.median(samples) * 1e6
+    p95_us = sorted(samples)[int(0.95 * (len(samples) - 1))] * 1e6
+    print(f"{label:<34} median={median_us:10.1f} us  p95={p95_us:10.1f} us  n={len(samples)}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="gmat-bench-") as tmp:
+        base = Path(tmp)
+        gmat_bin = _make_fake_install(base)
+        runner = SubprocessGmatRunner(gmat_bin=gmat_bin)
+        work_dir = runner.create_contained_workdir(base / "runs")
+        script = base / "bench.script"
+        script.write_text("Create Spacecraft Sat;\n", encoding="utf-8")
+        staged = prepare_script_in_workdir(script, work_dir)
+        request = GmatExecutionRequest(script_path=staged, work_dir=work_dir)
+
+        def _cold_startup() -> None:
+            subprocess_runner._startup_templates.clear()
+            runner._build_contained_startup_file(work_dir)
+
+        _report("startup file (uncached template)", _timed(_cold_startup, args.repeat))
+        _report("startup file (cached template)", _timed(lambda: runner._build_contained_startup_file(work_dir), args.repeat))
+
+        spawn = _timed(lambda: subprocess.run([str(gmat_bin)], cwd=work_dir, capture_output=True, check=False), args.repeat)
+        full = _timed(lambda: runner.run(request), args.repeat)
+        _report("bare subprocess spawn", spawn)
+        _report("SubprocessGmatRunner.run()", full)
+        print(f"{'adapter overhead (median)':<34} {(statistics.median(full) - statistics.median(spawn)) * 1e6:10.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,128 +4,98 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from gmat_tests.reports import (  # noqa: E402
+    count_data_rows,
+    find_report,
+    first_data_line,
+    last_data_line,
+    read_last_row,
+    read_report_header,
+    read_scenario_row,
+)
+
+SCENARIOS = ROOT / "scenarios"
+
+# (case, report file). Columns come from each report's header; only a
+# headerless report is named from the Report statement in
+# scenarios/<case>.script.
+_REQUIRED_CASES: list[tuple[str, str]] = [
+    ("basic_leo_two_body", "basic_leo_two_body_results.txt"),
+    ("advanced_j2_raan_drift", "advanced_j2_raan_drift_results.txt"),
+    ("advanced_oumuamua_hyperbolic", "advanced_oumuamua_hyperbolic_results.txt"),
+]
+
+_STRESS_CASES: list[tuple[str, str]] = [
+    ("stress_high_gravity_leo", "stress_high_gravity_leo_results.txt"),
+    ("stress_drag_decay_vleo", "stress_drag_decay_vleo_results.txt"),
+    ("stress_srp_geo_long_duration", "stress_srp_geo_long_duration_results.txt"),
+    ("stress_molniya_thirdbody", "stress_molniya_thirdbody_results.txt"),
+    ("stress_cislunar_nrho", "stress_cislunar_nrho_results.txt"),
+    ("stress_sun_synch_full_fidelity", "stress_sun_synch_full_fidelity_results.txt"),
+    ("stress_jupiter_flyby", "stress_jupiter_flyby_results.txt"),
+    ("stress_rk4_energy_drift", "stress_rk4_energy_drift_results.txt"),
+]
+
+# Payload keys drop the spacecraft name from elapsed-time columns
+# ("Sat.ElapsedDays" -> "elapsedDays") so cases compare across scenarios.
+_ELAPSED_KEYS = {"ElapsedSecs": "elapsedSecs", "ElapsedDays": "elapsedDays"}
+
+
+def _export_key(column: str) -> str:
+    return _ELAPSED_KEYS.get(column.rsplit(".", 1)[-1], column)
+
 
-def _read_last_numeric_row(path: Path, expected_values: int) -> list[float]:
-    lines = [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
-    for line in reversed(lines):
-        parts = line.split()
-        try:
-            values = [float(token) for token in parts]
-        except ValueError:
-            continue
-        if len(values) == expected_values:
-            return values
-    raise ValueError(f"No numeric row with {expected_values} values in {path}")
+def _report_path(cases: Path, case_name: str, report_name: str) -> Path:
+    # Archived snapshots may hold the report compressed (<name>.zst / .gz).
+    path = cases / case_name / report_name
+    return find_report(path) or path
 
 
-def _try_read_last_numeric_row(path: Path, expected_values: int) -> list[float] | None:
-    """Read last numeric row, returning None if file missing or unparseable."""
-    if not path.exists():
+def _case_values(cases: Path, case_name: str, report_name: str) -> dict[str, float]:
+    # An archived run's header describes that run, whereas today's script may
+    # have changed its Report statement since.
+    report_path = _report_path(cases, case_name, report_name)
+    if read_report_header(report_path) is not None:
+        row = read_last_row(report_path)
+    else:
+        row = read_scenario_row(SCENARIOS / f"{case_name}.script", report_path)
+    return {_export_key(name): value for name, value in row.items()}
+
+
+def _try_case_values(cases: Path, case_name: str, report_name: str) -> dict[str, float] | None:
+    """Read a case's last row by name, returning None if file missing or unparseable."""
+    if not _report_path(cases, case_name, report_name).exists():
         return None
     try:
-        return _read_last_numeric_row(path, expected_values)
+        return _case_values(cases, case_name, report_name)
     except ValueError:
         return None
 
 
-_STRESS_CASES: list[tuple[str, str, list[str]]] = [
-    (
-        "stress_high_gravity_leo",
-        "stress_high_gravity_leo_results.txt",
-        ["startSMA", "endSMA", "startECC", "endECC", "startAOP", "endAOP", "elapsedDays"],
-    ),
-    (
-        "stress_drag_decay_vleo",
-        "stress_drag_decay_vleo_results.txt",
-        ["startSMA", "endSMA", "startECC", "endECC", "startALT", "endALT", "elapsedDays"],
-    ),
-    (
-        "stress_srp_geo_long_duration",
-        "stress_srp_geo_long_duration_results.txt",
-        ["startSMA", "endSMA", "startECC", "endECC", "startRMAG", "endRMAG", "elapsedDays"],
-    ),
-    (
-        "stress_molniya_thirdbody",
-        "stress_molniya_thirdbody_results.txt",
-        ["startAOP", "endAOP", "startECC", "endECC", "startRAAN", "endRAAN", "elapsedDays"],
-    ),
-    (
-        "stress_cislunar_nrho",
-        "stress_cislunar_nrho_results.txt",
-        ["startMoonRMAG", "endMoonRMAG", "startEarthRMAG", "endEarthRMAG",
-         "startVMAG", "endVMAG", "elapsedDays"],
-    ),
-    (
-        "stress_sun_synch_full_fidelity",
-        "stress_sun_synch_full_fidelity_results.txt",
-        ["startSMA", "endSMA", "startRAAN", "endRAAN", "startECC", "endECC", "elapsedDays"],
-    ),
-    (
-        "stress_jupiter_flyby",
-        "stress_jupiter_flyby_results.txt",
-        ["startECC", "endECC", "startINC", "endINC", "startRMAG", "endRMAG", "elapsedDays"],
-    ),
-    (
-        "stress_rk4_energy_drift",
-        "stress_rk4_energy_drift_results.txt",
-        ["startSMA", "endSMA", "startECC", "endECC", "startRMAG", "endRMAG", "elapsedDays"],
-    ),
-]
-
-
 def export_baseline(run_dir: Path, out_path: Path) -> Path:
     cases = run_dir / "cases"
-    basic = _read_last_numeric_row(cases / "basic_leo_two_body" / "basic_leo_two_body_results.txt", 7)
-    j2 = _read_last_numeric_row(cases / "advanced_j2_raan_drift" / "advanced_j2_raan_drift_results.txt", 7)
-    hyp = _read_last_numeric_row(cases / "advanced_oumuamua_hyperbolic" / "advanced_oumuamua_hyperbolic_results.txt", 7)
-
-    kepler_path = cases / "headless_oem_ephemeris_propagation" / "KeplerianElements.txt"
-    rows = [ln.strip() for ln in kepler_path.read_text(encoding="utf-8").splitlines() if ln.strip()]
+    kepler_path = _report_path(cases, "headless_oem_ephemeris_propagation", "KeplerianElements.txt")
 
     payload = {
         "run_id": run_dir.name,
-        "cases": {
-            "basic_leo_two_body": {
-                "startSMA": basic[0],
-                "startECC": basic[1],
-                "startRMAG": basic[2],
-                "endSMA": basic[3],
-                "endECC": basic[4],
-                "endRMAG": basic[5],
-                "elapsedSecs": basic[6],
-            },
-            "advanced_j2_raan_drift": {
-                "startRAAN": j2[0],
-                "startINC": j2[1],
-                "startECC": j2[2],
-                "endRAAN": j2[3],
-                "endINC": j2[4],
-                "endECC": j2[5],
-                "elapsedDays": j2[6],
-            },
-            "advanced_oumuamua_hyperbolic": {
-                "startECC": hyp[0],
-                "startINC": hyp[1],
-                "startRMAG": hyp[2],
-                "endECC": hyp[3],
-                "endINC": hyp[4],
-                "endRMAG": hyp[5],
-                "elapsedDays": hyp[6],
-            },
-        },
+        "cases": {case_name: _case_values(cases, case_name, report_name) for case_name, report_name in _REQUIRED_CASES},
         "oem_summary": {
-            "rows": max(0, len(rows) - 1),
-            "first": rows[1] if len(rows) > 1 else "",
-            "last": rows[-1] if len(rows) > 1 else "",
+            "rows": count_data_rows(kepler_path),
+            "first": first_data_line(kepler_path),
+            "last": last_data_line(kepler_path),
         },
     }
 
-    for case_name, report_name, keys in _STRESS_CASES:
-        row = _try_read_last_numeric_row(cases / case_name / report_name, 7)
-        if row is not None:
-            payload["cases"][case_name] = dict(zip(keys, row))
+    for case_name, report_name in _STRESS_CASES:
+        values = _try_case_values(cases, case_name, report_name)
+        if values is not None:
+            payload["cases"][case_name] = values
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
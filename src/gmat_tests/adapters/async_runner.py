@@ -0,0 +1,160 @@
+import asyncio
+import os
+import subprocess
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Callable, Iterable, TextIO
+
+from gmat_tests.adapters.subprocess_runner import (
+    SubprocessGmatRunner,
+    _bytes_written,
+    _workdir_state,
+    kill_process_group,
+    limit_command,
+)
+from gmat_tests.domain.models import GmatExecutionRequest, GmatExecutionResult
+from gmat_tests.reports import count_data_rows
+
+LineCallback = Callable[[str], None]
+
+_STREAM_LIMIT = 1024 * 1024
+
+
+class AsyncGmatRunner(SubprocessGmatRunner):
+    # asyncio-based runner: output is streamed line by line to callbacks and/or
+    # files as GMAT produces it, so long logs need not be held in memory, and a
+    # single event loop can drive many concurrent GMAT processes. Each run gets
+    # its own process group so a timeout kills GMAT and anything it spawned.
+    # GMAT is reaped with os.wait4 on a thread of its own (not asyncio's child
+    # watcher) so every run reports its own rusage, as in run_measured.
+
+    async def run_async(
+        self,
+        request: GmatExecutionRequest,
+        on_stdout: LineCallback | None = None,
+        on_stderr: LineCallback | None = None,
+        stdout_path: Path | None = None,
+        stderr_path: Path | None = None,
+        capture: bool = True,
+        timeout_s: float | None = None,
+    ) -> GmatExecutionResult:
+        if not self._gmat_bin.exists():
+            raise FileNotFoundError(f"GMAT binary not found: {self._gmat_bin}")
+        if not request.script_path.exists():
+            raise FileNotFoundError(f"GMAT script not found: {request.script_path}")
+
+        cmd = self._build_command(request.work_dir, request.script_path)
+        before = _workdir_state(request.work_dir)
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            limit_command(cmd, request.cpu_limit_s, request.memory_limit_bytes, request.niceness),
+            cwd=request.work_dir,
+            env=self._build_env(request.env_overrides),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        exited = _wait4(loop, proc)
+        if timeout_s is None:
+            timeout_s = request.timeout_s
+
+        stdout_lines: list[str] = []
+        stderr_lines: list[str] = []
+        timed_out = False
+        with ExitStack() as stack:
+            out_file = stack.enter_context(stdout_path.open("w", encoding="utf-8")) if stdout_path else None
+            err_file = stack.enter_context(stderr_path.open("w", encoding="utf-8")) if stderr_path else None
+            stdout = await _reader(loop, proc.stdout, stack)
+            stderr = await _reader(loop, proc.stderr, stack)
+            pumps = asyncio.gather(
+                _pump(stdout, on_stdout, out_file, stdout_lines if capture else None),
+                _pump(stderr, on_stderr, err_file, stderr_lines if capture else None),
+                asyncio.shield(exited),
+            )
+            try:
+                await asyncio.wait_for(pumps, timeout=timeout_s)
+            except asyncio.TimeoutError:
+                timed_out = True
+                kill_process_group(proc.pid)
+                await exited
+            except BaseException:
+                # A failing callback or a cancelled caller (e.g. a sibling
+                # failing in run_many) must not leave GMAT running.
+                kill_process_group(proc.pid)
+                await exited
+                raise
+
+        usage, end = exited.result()
+        return GmatExecutionResult(
+            returncode=proc.returncode,
+            stdout="".join(stdout_lines),
+            stderr="".join(stderr_lines),
+            timed_out=timed_out,
+            peak_rss_kb=usage.ru_maxrss,
+            cpu_user_s=usage.ru_utime,
+            cpu_sys_s=usage.ru_stime,
+            wall_time_s=end - start,
+            workdir_bytes_written=_bytes_written(before, _workdir_state(request.work_dir)),
+            report_rows=sum(count_data_rows(request.work_dir / name) for name in request.report_files),
+        )
+
+    async def run_many(
+        self,
+        requests: Iterable[GmatExecutionRequest],
+        concurrency: int,
+        timeout_s: float | None = None,
+    ) -> list[GmatExecutionResult]:
+        slots = asyncio.Semaphore(max(1, concurrency))
+
+        async def _one(request: GmatExecutionRequest) -> GmatExecutionResult:
+            async with slots:
+                return await self.run_async(request, timeout_s=timeout_s)
+
+        return list(await asyncio.gather(*(_one(request) for request in requests)))
+
+    def run(self, request: GmatExecutionRequest) -> GmatExecutionResult:
+        return asyncio.run(self.run_async(request))
+
+
+def _wait4(loop: asyncio.AbstractEventLoop, proc: subprocess.Popen) -> asyncio.Future:
+    # Resolves to (rusage, exit time) once the child is reaped, with
+    # proc.returncode set.
+    exited = loop.create_future()
+
+    def wait() -> None:
+        _, status, usage = os.wait4(proc.pid, 0)
+        end = time.perf_counter()
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        loop.call_soon_threadsafe(exited.set_result, (usage, end))
+
+    threading.Thread(target=wait, daemon=True).start()
+    return exited
+
+
+async def _reader(loop: asyncio.AbstractEventLoop, pipe, stack: ExitStack) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader(limit=_STREAM_LIMIT, loop=loop)
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader, loop=loop), pipe)
+    stack.callback(transport.close)
+    return reader
+
+
+async def _pump(
+    stream: asyncio.StreamReader,
+    callback: LineCallback | None,
+    sink: TextIO | None,
+    lines: list[str] | None,
+) -> None:
+    while True:
+        raw = await stream.readline()
+        if not raw:
+            return
+        line = raw.decode("utf-8", errors="replace")
+        if callback is not None:
+            callback(line)
+        if sink is not None:
+            sink.write(line)
+        if lines is not None:
+            lines.append(line)
@@ -0,0 +1,108 @@
+"""Long-lived gmatpy worker process for PersistentGmatRunner (JSON lines over stdin/stdout)."""
+import argparse
+import json
+import os
+import resource
+import shutil
+import sys
+import traceback
+from pathlib import Path
+
+# GMAT opens its log (LOG_FILE = OUTPUT_PATH/GmatLog.txt) once at Setup and
+# keeps appending to it, so it stays in the output dir; each run gets a copy
+# of the part it wrote.
+_LOG_NAME = "GmatLog.txt"
+
+
+def _output_state(output_dir: Path) -> dict[str, tuple[int, int]]:
+    state = {}
+    for path in output_dir.iterdir():
+        st = path.stat()
+        state[path.name] = (st.st_size, st.st_mtime_ns)
+    return state
+
+
+def _run_one(gmat, request: dict, output_dir: Path, capture_dir: Path) -> dict:
+    work_dir = Path(request["work_dir"])
+    log_path = output_dir / _LOG_NAME
+    log_start = log_path.stat().st_size if log_path.exists() else 0
+    before = _output_state(output_dir)
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+
+    out_path = capture_dir / "stdout.txt"
+    err_path = capture_dir / "stderr.txt"
+    saved_out, saved_err = os.dup(1), os.dup(2)
+    returncode = 1
+    try:
+        with out_path.open("wb") as out_file, err_path.open("wb") as err_file:
+            os.dup2(out_file.fileno(), 1)
+            os.dup2(err_file.fileno(), 2)
+            try:
+                os.chdir(work_dir)
+                if hasattr(gmat, "Clear"):
+                    gmat.Clear()
+                if gmat.LoadScript(request["script_path"]) and gmat.RunScript():
+                    returncode = 0
+            except Exception:
+                traceback.print_exc()
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+    finally:
+        os.dup2(saved_out, 1)
+        os.dup2(saved_err, 2)
+        os.close(saved_out)
+        os.close(saved_err)
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+
+    # Only what this run created or rewrote belongs to it.
+    for name, state in _output_state(output_dir).items():
+        if name != _LOG_NAME and before.get(name) != state:
+            shutil.move(str(output_dir / name), str(work_dir / name))
+    if log_path.exists():
+        with log_path.open("rb") as log, (work_dir / _LOG_NAME).open("wb") as run_log:
+            log.seek(log_start)
+            shutil.copyfileobj(log, run_log)
+
+    return {
+        "returncode": returncode,
+        "stdout": out_path.read_text(encoding="utf-8", errors="replace"),
+        "stderr": err_path.read_text(encoding="utf-8", errors="replace"),
+        # CPU time is this run's share; ru_maxrss can only be the worker's
+        # peak so far, which includes earlier runs and the GMAT setup.
+        "peak_rss_kb": usage.ru_maxrss,
+        "cpu_user_s": usage.ru_utime - usage_before.ru_utime,
+        "cpu_sys_s": usage.ru_stime - usage_before.ru_stime,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--gmat-bin-dir", required=True)
+    parser.add_argument("--startup-file", required=True)
+    parser.add_argument("--output-dir", required=True)
+    args = parser.parse_args()
+
+    # Keep the real stdout for protocol replies only; anything GMAT prints
+    # outside a captured run goes to the worker log on stderr instead.
+    protocol = os.fdopen(os.dup(1), "w", buffering=1, encoding="utf-8")
+    os.dup2(2, 1)
+    sys.path.insert(0, args.gmat_bin_dir)
+    import gmatpy as gmat
+
+    gmat.Setup(args.startup_file)
+    output_dir = Path(args.output_dir)
+    capture_dir = output_dir.parent
+    protocol.write(json.dumps({"ready": True}) + "\n")
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        response = _run_one(gmat, json.loads(line), output_dir, capture_dir)
+        protocol.write(json.dumps(response) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
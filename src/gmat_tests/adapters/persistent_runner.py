@@ -0,0 +1,210 @@
+import json
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import gmat_tests
+from gmat_tests.adapters.subprocess_runner import SubprocessGmatRunner, _bytes_written, _workdir_state
+from gmat_tests.domain.models import GmatExecutionRequest, GmatExecutionResult
+from gmat_tests.reports import count_data_rows
+
+_EnvKey = tuple[tuple[str, str], ...]
+
+
+class _Worker:
+    def __init__(self, proc: subprocess.Popen, root: Path) -> None:
+        self.proc = proc
+        self.root = root
+
+    def submit(self, request: GmatExecutionRequest) -> dict:
+        payload = {"script_path": str(request.script_path.resolve()), "work_dir": str(request.work_dir.resolve())}
+        self.proc.stdin.write(json.dumps(payload) + "\n")
+        self.proc.stdin.flush()
+        line = self.proc.stdout.readline()
+        if not line:
+            raise EOFError("GMAT worker exited")
+        return json.loads(line)
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+            self.proc.wait()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def _expire(worker: _Worker, expired: threading.Event) -> None:
+    expired.set()
+    worker.proc.kill()
+
+
+class PersistentGmatRunner(SubprocessGmatRunner):
+    # Keeps up to `workers` long-lived gmatpy processes and feeds them scripts,
+    # so plugin and data file loading is paid once per worker instead of once
+    # per script. Each run clears the GMAT configuration, executes in the
+    # request work_dir, and gets the files the script produced moved there.
+    # Workers are keyed by env overrides since those are fixed at spawn time.
+    # A timed-out run kills (and later replaces) its worker; CPU/memory limits
+    # and niceness are per-process and therefore not applied here.
+
+    def __init__(
+        self,
+        gmat_bin: Path,
+        compat_lib_dir: Path | None = None,
+        workers: int = 1,
+        scratch_dir: Path | None = None,
+    ) -> None:
+        super().__init__(gmat_bin=gmat_bin, compat_lib_dir=compat_lib_dir)
+        self._max_workers = max(1, workers)
+        self._scratch_dir = scratch_dir
+        self._slots = threading.BoundedSemaphore(self._max_workers)
+        self._lock = threading.Lock()
+        self._idle: dict[_EnvKey, list[_Worker]] = {}
+        self._live = 0
+
+    def run(self, request: GmatExecutionRequest) -> GmatExecutionResult:
+        if not self._gmat_bin.exists():
+            raise FileNotFoundError(f"GMAT binary not found: {self._gmat_bin}")
+        if not (self._gmat_bin.parent / "gmatpy").exists():
+            raise FileNotFoundError(f"GMAT Python API (gmatpy) not found next to {self._gmat_bin}")
+        if not request.script_path.exists():
+            raise FileNotFoundError(f"GMAT script not found: {request.script_path}")
+
+        env_key: _EnvKey = tuple(sorted((request.env_overrides or {}).items()))
+        with self._slots:
+            worker = self._acquire(env_key)
+            expired = threading.Event()
+            timer = None
+            if request.timeout_s is not None:
+                timer = threading.Timer(request.timeout_s, _expire, args=(worker, expired))
+                timer.daemon = True
+                timer.start()
+            before = _workdir_state(request.work_dir)
+            start = time.perf_counter()
+            try:
+                response = worker.submit(request)
+            except (OSError, EOFError, ValueError):
+                self._discard(worker)
+                if expired.is_set():
+                    shutil.rmtree(worker.root, ignore_errors=True)
+                    return GmatExecutionResult(
+                        returncode=-9,
+                        stdout="",
+                        stderr=f"GMAT worker killed after {request.timeout_s}s timeout",
+                        timed_out=True,
+                    )
+                log = worker.root / "worker.log"
+                detail = log.read_text(encoding="utf-8", errors="replace") if log.exists() else ""
+                shutil.rmtree(worker.root, ignore_errors=True)
+                return GmatExecutionResult(returncode=-1, stdout="", stderr=f"GMAT worker exited unexpectedly\n{detail}")
+            finally:
+                if timer is not None:
+                    timer.cancel()
+                    timer.join()
+            if expired.is_set():
+                # The timeout fired after the response arrived: the result
+                # stands, but the worker has been killed and must not be reused.
+                self._discard(worker)
+                shutil.rmtree(worker.root, ignore_errors=True)
+            else:
+                self._release(env_key, worker)
+        return GmatExecutionResult(
+            returncode=response["returncode"],
+            stdout=response["stdout"],
+            stderr=response["stderr"],
+            peak_rss_kb=response["peak_rss_kb"],
+            cpu_user_s=response["cpu_user_s"],
+            cpu_sys_s=response["cpu_sys_s"],
+            wall_time_s=time.perf_counter() - start,
+            workdir_bytes_written=_bytes_written(before, _workdir_state(request.work_dir)),
+            report_rows=sum(count_data_rows(request.work_dir / name) for name in request.report_files),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            workers = [w for idle in self._idle.values() for w in idle]
+            self._idle.clear()
+            self._live -= len(workers)
+        for worker in workers:
+            worker.close()
+
+    def __enter__(self) -> "PersistentGmatRunner":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _acquire(self, env_key: _EnvKey) -> _Worker:
+        evicted = None
+        with self._lock:
+            idle = self._idle.get(env_key)
+            if idle:
+                return idle.pop()
+            if self._live >= self._max_workers:
+                # All slots hold idle workers for other env overrides; recycle one.
+                other = next(k for k, ws in self._idle.items() if ws)
+                evicted = self._idle[other].pop()
+                self._live -= 1
+            self._live += 1
+        if evicted is not None:
+            evicted.close()
+        try:
+            return self._spawn(dict(env_key))
+        except Exception:
+            with self._lock:
+                self._live -= 1
+            raise
+
+    def _release(self, env_key: _EnvKey, worker: _Worker) -> None:
+        with self._lock:
+            self._idle.setdefault(env_key, []).append(worker)
+
+    def _discard(self, worker: _Worker) -> None:
+        with self._lock:
+            self._live -= 1
+        worker.proc.kill()
+        worker.proc.wait()
+
+    def _spawn(self, env_overrides: dict[str, str]) -> _Worker:
+        root = self.create_contained_workdir(self._scratch_dir)
+        output_dir = root / "output"
+        output_dir.mkdir()
+        startup = self._build_contained_startup_file(output_dir)
+        startup = startup.rename(root / startup.name)
+
+        env = self._build_env(env_overrides)
+        src_dir = str(Path(gmat_tests.__file__).resolve().parents[1])
+        env["PYTHONPATH"] = f"{src_dir}:{env['PYTHONPATH']}" if env.get("PYTHONPATH") else src_dir
+        cmd = [
+            sys.executable,
+            "-m",
+            "gmat_tests.adapters.gmatpy_worker",
+            "--gmat-bin-dir",
+            str(self._gmat_bin.parent),
+            "--startup-file",
+            str(startup),
+            "--output-dir",
+            str(output_dir),
+        ]
+        with (root / "worker.log").open("ab") as log:
+            proc = subprocess.Popen(
+                cmd,
+                cwd=root,
+                env=env,
+                text=True,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=log,
+            )
+        worker = _Worker(proc, root)
+        if not proc.stdout.readline():
+            proc.wait()
+            detail = (root / "worker.log").read_text(encoding="utf-8", errors="replace")
+            shutil.rmtree(root, ignore_errors=True)
+            raise RuntimeError(f"GMAT worker failed to start:\n{detail}")
+        return worker
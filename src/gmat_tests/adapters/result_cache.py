@@ -0,0 +1,143 @@
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from gmat_tests.domain.models import GmatExecutionRequest, GmatExecutionResult
+
+_CHUNK = 1024 * 1024
+_digest_memo: dict[tuple[str, int, int], str] = {}
+
+
+def file_digest(path: Path) -> str:
+    # Memoized on (path, size, mtime) so the GMAT binary is hashed once per process.
+    st = path.stat()
+    memo_key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    cached = _digest_memo.get(memo_key)
+    if cached is not None:
+        return cached
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    _digest_memo[memo_key] = digest
+    return digest
+
+
+def list_workdir_files(work_dir: Path) -> list[str]:
+    return sorted(p.relative_to(work_dir).as_posix() for p in work_dir.rglob("*") if p.is_file())
+
+
+class GmatResultCache:
+    # Entries live under root/<key[:2]>/<key>/ and hold result.json plus the
+    # artifacts a successful run produced. Hits refresh the entry mtime, and the
+    # least recently used entries are evicted once the cache exceeds max_bytes.
+    # Concurrent runs (threads or processes) share root/.lock: loads hold it
+    # shared, publishing and evicting entries hold it exclusively, so an entry
+    # is never removed while it is being restored or measured.
+
+    def __init__(self, root: Path, max_bytes: int = 2 * 1024**3) -> None:
+        self._root = Path(root)
+        self._max_bytes = max_bytes
+
+    def key_for(
+        self,
+        request: GmatExecutionRequest,
+        fixed_inputs: Iterable[Path] = (),
+        extra: Iterable[str] = (),
+    ) -> str:
+        h = hashlib.sha256()
+        h.update(f"script={request.script_path.relative_to(request.work_dir).as_posix()}\n".encode())
+        for name in list_workdir_files(request.work_dir):
+            h.update(f"file={name}:{file_digest(request.work_dir / name)}\n".encode())
+        for path in fixed_inputs:
+            h.update(f"fixed={path.name}:{file_digest(path)}\n".encode())
+        for key, value in sorted((request.env_overrides or {}).items()):
+            h.update(f"env={key}={value}\n".encode())
+        for item in extra:
+            h.update(f"extra={item}\n".encode())
+        return h.hexdigest()
+
+    def load(self, key: str, work_dir: Path) -> GmatExecutionResult | None:
+        entry = self._entry_dir(key)
+        meta_path = entry / "result.json"
+        with self._locked(fcntl.LOCK_SH):
+            if not meta_path.exists():
+                return None
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            files_dir = entry / "files"
+            for name in meta["files"]:
+                target = work_dir / name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(files_dir / name, target)
+            os.utime(entry)
+        known = {f.name for f in fields(GmatExecutionResult)}
+        return GmatExecutionResult(**{k: v for k, v in meta["result"].items() if k in known})
+
+    def store(
+        self,
+        key: str,
+        work_dir: Path,
+        result: GmatExecutionResult,
+        exclude: Iterable[str] = (),
+    ) -> None:
+        if result.returncode != 0:
+            return
+        skip = set(exclude)
+        artifacts = [name for name in list_workdir_files(work_dir) if name not in skip]
+
+        self._root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix="entry-", dir=self._root))
+        for name in artifacts:
+            target = staging / "files" / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(work_dir / name, target)
+        meta = {"key": key, "result": asdict(result), "files": artifacts}
+        (staging / "result.json").write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+
+        entry = self._entry_dir(key)
+        with self._locked(fcntl.LOCK_EX):
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Another process stored the same key first; its entry is equivalent.
+                shutil.rmtree(staging, ignore_errors=True)
+            self._evict()
+
+    def evict(self) -> None:
+        with self._locked(fcntl.LOCK_EX):
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in self._root.glob("??/*"):
+            size = sum(p.stat().st_size for p in entry.rglob("*") if p.is_file())
+            entries.append((entry.stat().st_mtime, size, entry))
+            total += size
+        for _mtime, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self._max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    @contextmanager
+    def _locked(self, operation: int) -> Iterator[None]:
+        self._root.mkdir(parents=True, exist_ok=True)
+        with (self._root / ".lock").open("a") as lock_file:
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _entry_dir(self, key: str) -> Path:
+        return self._root / key[:2] / key
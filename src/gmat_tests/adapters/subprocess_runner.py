@@ -1,18 +1,33 @@
 import os
 import re
 import shutil
+import signal
 import subprocess
 import tempfile
+import threading
+import time
+from dataclasses import replace
 from pathlib import Path
+from typing import Mapping
 
+from gmat_tests.adapters.result_cache import GmatResultCache, list_workdir_files
 from gmat_tests.domain.models import GmatExecutionRequest, GmatExecutionResult
 from gmat_tests.ports.gmat_runner import GmatRunner
+from gmat_tests.reports import count_data_rows
+
+_STARTUP_FILE_NAME = "gmat_startup_file.txt"
 
 
 class SubprocessGmatRunner(GmatRunner):
-    def __init__(self, gmat_bin: Path, compat_lib_dir: Path | None = None) -> None:
+    def __init__(
+        self,
+        gmat_bin: Path,
+        compat_lib_dir: Path | None = None,
+        result_cache: GmatResultCache | None = None,
+    ) -> None:
         self._gmat_bin = gmat_bin
         self._compat_lib_dir = compat_lib_dir
+        self._result_cache = result_cache
 
     def create_contained_workdir(self, base_dir: Path | None = None) -> Path:
         root = Path(base_dir) if base_dir else Path(tempfile.gettempdir())
@@ -25,23 +40,59 @@ class SubprocessGmatRunner(GmatRunner):
         if not request.script_path.exists():
             raise FileNotFoundError(f"GMAT script not found: {request.script_path}")
 
-        env = os.environ.copy()
-        if self._compat_lib_dir:
-            existing = env.get("LD_LIBRARY_PATH", "")
-            env["LD_LIBRARY_PATH"] = f"{self._compat_lib_dir}:{existing}" if existing else str(self._compat_lib_dir)
-        if request.env_overrides:
-            env.update(request.env_overrides)
+        cache_key = None
+        staged_inputs: list[str] = []
+        if self._result_cache is not None:
+            cache_key = self._result_cache.key_for(
+                request,
+                fixed_inputs=self._cache_fixed_inputs(),
+                extra=[f"compat_lib_dir={self._compat_lib_dir}"],
+            )
+            cached = self._result_cache.load(cache_key, request.work_dir)
+            if cached is not None:
+                return replace(cached, from_cache=True)
+            staged_inputs = list_workdir_files(request.work_dir)
 
         cmd = self._build_command(request.work_dir, request.script_path)
-        proc = subprocess.run(
+        before = _workdir_state(request.work_dir)
+        result = run_measured(
             cmd,
             cwd=request.work_dir,
-            env=env,
-            text=True,
-            capture_output=True,
-            check=False,
+            env=self._build_env(request.env_overrides),
+            timeout_s=request.timeout_s,
+            cpu_limit_s=request.cpu_limit_s,
+            memory_limit_bytes=request.memory_limit_bytes,
+            niceness=request.niceness,
+        )
+        result = replace(
+            result,
+            workdir_bytes_written=_bytes_written(before, _workdir_state(request.work_dir)),
+            report_rows=sum(count_data_rows(request.work_dir / name) for name in request.report_files),
         )
-        return GmatExecutionResult(returncode=proc.returncode, stdout=proc.stdout, stderr=proc.stderr)
+        if self._result_cache is not None and cache_key is not None:
+            self._result_cache.store(
+                cache_key,
+                request.work_dir,
+                result,
+                exclude=[*staged_inputs, _STARTUP_FILE_NAME],
+            )
+        return result
+
+    def _cache_fixed_inputs(self) -> list[Path]:
+        inputs = [self._gmat_bin]
+        default_startup = self._gmat_bin.parent / _STARTUP_FILE_NAME
+        if default_startup.exists():
+            inputs.append(default_startup)
+        return inputs
+
+    def _build_env(self, env_overrides: Mapping[str, str] | None = None) -> dict[str, str]:
+        env = os.environ.copy()
+        if self._compat_lib_dir:
+            existing = env.get("LD_LIBRARY_PATH", "")
+            env["LD_LIBRARY_PATH"] = f"{self._compat_lib_dir}:{existing}" if existing else str(self._compat_lib_dir)
+        if env_overrides:
+            env.update(env_overrides)
+        return env
 
     def _build_command(self, work_dir: Path, script_path: Path) -> list[str]:
         binary_name = self._gmat_bin.name.lower()
@@ -61,46 +112,208 @@ class SubprocessGmatRunner(GmatRunner):
         ]
 
     def _build_contained_startup_file(self, work_dir: Path) -> Path:
-        default_startup = self._gmat_bin.parent / "gmat_startup_file.txt"
+        default_startup = self._gmat_bin.parent / _STARTUP_FILE_NAME
         if not default_startup.exists():
             raise FileNotFoundError(f"GMAT startup file not found: {default_startup}")
 
-        text = default_startup.read_text(encoding="utf-8")
-        root_path = self._gmat_bin.parent.parent.resolve()
-        output_path = work_dir.resolve()
-        text = re.sub(
-            r"^ROOT_PATH\s*=.*$",
-            lambda _: f"ROOT_PATH                = {root_path}",
-            text,
-            flags=re.MULTILINE,
-        )
-        text = re.sub(
-            r"^OUTPUT_PATH\s*=.*$",
-            lambda _: f"OUTPUT_PATH              = {output_path}/",
-            text,
-            flags=re.MULTILINE,
-        )
-        text = re.sub(r"^LOG_FILE\s*=.*$", "LOG_FILE                 = OUTPUT_PATH/GmatLog.txt", text, flags=re.MULTILINE)
-
-        # Resolve plugin libraries to absolute paths so contained startup files
-        # do not depend on cwd-relative lookup behavior.
-        rewritten_lines: list[str] = []
-        for line in text.splitlines():
-            stripped = line.strip()
-            if stripped.startswith("PLUGIN") and "=" in line:
-                lhs, rhs = line.split("=", 1)
-                plugin_value = rhs.strip()
-                if plugin_value.startswith("../plugins/"):
-                    plugin_abs = root_path / plugin_value.removeprefix("../")
-                    line = f"{lhs}= {plugin_abs}"
-            rewritten_lines.append(line)
-        text = "\n".join(rewritten_lines) + "\n"
-
-        startup_target = work_dir / "gmat_startup_file.txt"
-        startup_target.write_text(text, encoding="utf-8")
+        # Only OUTPUT_PATH differs between runs; everything else comes from a
+        # template parsed once per (startup file, mtime, size).
+        parts = _contained_startup_template(default_startup, self._gmat_bin.parent.parent.resolve())
+        output_line = f"OUTPUT_PATH              = {work_dir.resolve()}/"
+
+        startup_target = work_dir / _STARTUP_FILE_NAME
+        startup_target.write_text(output_line.join(parts), encoding="utf-8")
         return startup_target
 
 
+_OUTPUT_PATH_SLOT = "\0OUTPUT_PATH\0"
+_startup_templates: dict[tuple[str, int, int, str], tuple[str, ...]] = {}
+_startup_templates_lock = threading.Lock()
+
+
+def _contained_startup_template(default_startup: Path, root_path: Path) -> tuple[str, ...]:
+    st = default_startup.stat()
+    key = (str(default_startup.resolve()), st.st_mtime_ns, st.st_size, str(root_path))
+    with _startup_templates_lock:
+        cached = _startup_templates.get(key)
+    if cached is not None:
+        return cached
+
+    text = default_startup.read_text(encoding="utf-8")
+    text = re.sub(
+        r"^ROOT_PATH\s*=.*$",
+        lambda _: f"ROOT_PATH                = {root_path}",
+        text,
+        flags=re.MULTILINE,
+    )
+    text = re.sub(r"^OUTPUT_PATH\s*=.*$", lambda _: _OUTPUT_PATH_SLOT, text, flags=re.MULTILINE)
+    text = re.sub(r"^LOG_FILE\s*=.*$", "LOG_FILE                 = OUTPUT_PATH/GmatLog.txt", text, flags=re.MULTILINE)
+
+    # Resolve plugin libraries to absolute paths so contained startup files
+    # do not depend on cwd-relative lookup behavior.
+    rewritten_lines: list[str] = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("PLUGIN") and "=" in line:
+            lhs, rhs = line.split("=", 1)
+            plugin_value = rhs.strip()
+            if plugin_value.startswith("../plugins/"):
+                plugin_abs = root_path / plugin_value.removeprefix("../")
+                line = f"{lhs}= {plugin_abs}"
+        rewritten_lines.append(line)
+    text = "\n".join(rewritten_lines) + "\n"
+
+    parts = tuple(text.split(_OUTPUT_PATH_SLOT))
+    with _startup_templates_lock:
+        _startup_templates[key] = parts
+    return parts
+
+
+def run_measured(
+    cmd: list[str],
+    cwd: Path,
+    env: Mapping[str, str] | None = None,
+    timeout_s: float | None = None,
+    cpu_limit_s: int | None = None,
+    memory_limit_bytes: int | None = None,
+    niceness: int | None = None,
+) -> GmatExecutionResult:
+    # Popen + os.wait4 instead of subprocess.run so the child's rusage
+    # (peak RSS, CPU time) is available; pipes are drained on threads.
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        limit_command(cmd, cpu_limit_s, memory_limit_bytes, niceness),
+        cwd=cwd,
+        env=env,
+        text=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+    )
+
+    stdout_chunks: list[str] = []
+    stderr_chunks: list[str] = []
+    readers = [
+        threading.Thread(target=_drain, args=(proc.stdout, stdout_chunks), daemon=True),
+        threading.Thread(target=_drain, args=(proc.stderr, stderr_chunks), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    deadline = _Deadline(proc.pid)
+    timer = None
+    if timeout_s is not None:
+        timer = threading.Timer(timeout_s, deadline.expire)
+        timer.daemon = True
+        timer.start()
+    try:
+        # Wait for the exit but leave the child a zombie, so its pid (and
+        # process group) cannot be reused while the timer may still fire.
+        os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+        wall_time_s = time.perf_counter() - start
+        deadline.reap()
+        _, status, usage = os.wait4(proc.pid, 0)
+    finally:
+        if timer is not None:
+            timer.cancel()
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if deadline.timed_out:
+        # The child is gone, but a stray grandchild could still hold the pipes.
+        kill_process_group(proc.pid)
+    for reader in readers:
+        reader.join()
+
+    return GmatExecutionResult(
+        returncode=proc.returncode,
+        stdout="".join(stdout_chunks),
+        stderr="".join(stderr_chunks),
+        timed_out=deadline.timed_out,
+        peak_rss_kb=usage.ru_maxrss,
+        cpu_user_s=usage.ru_utime,
+        cpu_sys_s=usage.ru_stime,
+        wall_time_s=wall_time_s,
+    )
+
+
+def limit_command(
+    cmd: list[str],
+    cpu_limit_s: int | None = None,
+    memory_limit_bytes: int | None = None,
+    niceness: int | None = None,
+) -> list[str]:
+    # Wraps cmd in prlimit(1) / nice(1), which set the limits and exec it, so
+    # they hold from GMAT's first instruction. A preexec_fn would do the same
+    # but is unsafe when runs are launched from worker threads.
+    prefix: list[str] = []
+    if cpu_limit_s is not None or memory_limit_bytes is not None:
+        prefix.append(_limit_tool("prlimit"))
+        if cpu_limit_s is not None:
+            prefix.append(f"--cpu={cpu_limit_s}:{cpu_limit_s + 1}")
+        if memory_limit_bytes is not None:
+            prefix.append(f"--as={memory_limit_bytes}:{memory_limit_bytes}")
+        prefix.append("--")
+    if niceness is not None:
+        # nice(1) adds to the current value; niceness is absolute.
+        increment = niceness - os.getpriority(os.PRIO_PROCESS, 0)
+        prefix += [_limit_tool("nice"), "-n", str(increment), "--"]
+    return prefix + cmd
+
+
+def _limit_tool(name: str) -> str:
+    path = shutil.which(name)
+    if path is None:
+        raise FileNotFoundError(f"{name} not found on PATH; it is needed to apply process limits")
+    return path
+
+
+def kill_process_group(pid: int) -> None:
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class _Deadline:
+    # Timeout state shared with the timer thread. A timer firing after the
+    # child exited must neither mark the run timed out nor signal a process
+    # group that, once the child is reaped, may belong to someone else.
+
+    def __init__(self, pid: int) -> None:
+        self._pid = pid
+        self._lock = threading.Lock()
+        self._reaped = False
+        self.timed_out = False
+
+    def expire(self) -> None:
+        with self._lock:
+            if self._reaped or os.waitid(os.P_PID, self._pid, os.WEXITED | os.WNOHANG | os.WNOWAIT) is not None:
+                return
+            self.timed_out = True
+            kill_process_group(self._pid)
+
+    def reap(self) -> None:
+        with self._lock:
+            self._reaped = True
+
+
+def _drain(stream, chunks: list[str]) -> None:
+    with stream:
+        chunks.append(stream.read())
+
+
+def _workdir_state(work_dir: Path) -> dict[str, tuple[int, int]]:
+    state = {}
+    for path in work_dir.rglob("*"):
+        if path.is_file():
+            st = path.stat()
+            state[str(path)] = (st.st_size, st.st_mtime_ns)
+    return state
+
+
+def _bytes_written(before: dict[str, tuple[int, int]], after: dict[str, tuple[int, int]]) -> int:
+    return sum(size for name, (size, mtime) in after.items() if before.get(name) != (size, mtime))
+
+
 def prepare_script_in_workdir(source_script: Path, work_dir: Path) -> Path:
     work_dir.mkdir(parents=True, exist_ok=True)
     target = work_dir / source_script.name
@@ -13,3 +13,11 @@ def resolve_compat_lib_dir() -> Path | None:
 
 def resolve_test_sandbox() -> Path:
     return Path(os.getenv("GMAT_TEST_SANDBOX", ".gmat-sandbox")).resolve()
+
+
+def resolve_result_cache_dir() -> Path:
+    return Path(os.getenv("GMAT_RESULT_CACHE_DIR", ".gmat-cache")).resolve()
+
+
+def resolve_result_cache_max_bytes() -> int:
+    return int(os.getenv("GMAT_RESULT_CACHE_MAX_BYTES", str(2 * 1024**3)))
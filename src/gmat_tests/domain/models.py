@@ -1,3 +1,4 @@
+"""Domain models for GMAT test execution."""
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Mapping
@@ -8,6 +9,14 @@ class GmatExecutionRequest:
     script_path: Path
     work_dir: Path
     env_overrides: Mapping[str, str] | None = None
+    # Wall-clock limit; the run's whole process group is killed when exceeded.
+    timeout_s: float | None = None
+    # RLIMIT_CPU / RLIMIT_AS applied to the GMAT process, and its nice value.
+    cpu_limit_s: int | None = None
+    memory_limit_bytes: int | None = None
+    niceness: int | None = None
+    # Report files (relative to work_dir) whose data rows are counted in the result.
+    report_files: tuple[str, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -15,3 +24,11 @@ class GmatExecutionResult:
     returncode: int
     stdout: str
     stderr: str
+    timed_out: bool = False
+    peak_rss_kb: int | None = None
+    cpu_user_s: float | None = None
+    cpu_sys_s: float | None = None
+    wall_time_s: float | None = None
+    workdir_bytes_written: int | None = None
+    report_rows: int | None = None
+    from_cache: bool = False
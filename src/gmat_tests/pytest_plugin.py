@@ -0,0 +1,33 @@
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+
+from gmat_tests.adapters.subprocess_runner import SubprocessGmatRunner
+from gmat_tests.config import resolve_compat_lib_dir, resolve_gmat_bin, resolve_test_sandbox
+from gmat_tests.scenario_session import ScenarioSession
+
+
+def _session_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # GMAT_TEST_SANDBOX puts the workspaces of each test run in their own
+    # directory below it; pytest-xdist workers share one through the run uid.
+    if os.getenv("GMAT_TEST_SANDBOX"):
+        run_id = os.getenv("PYTEST_XDIST_TESTRUNUID") or uuid.uuid4().hex
+        return resolve_test_sandbox() / f"session-{run_id}"
+    # Otherwise every xdist worker gets its own basetemp below a shared
+    # per-session parent; keep scenario results there so workers share them.
+    root = tmp_path_factory.getbasetemp()
+    if os.getenv("PYTEST_XDIST_WORKER"):
+        root = root.parent
+    return root
+
+
+@pytest.fixture(scope="session")
+def gmat_scenarios(tmp_path_factory: pytest.TempPathFactory) -> ScenarioSession:
+    gmat_bin = resolve_gmat_bin()
+    if not gmat_bin.exists():
+        pytest.skip(f"GMAT binary not found at {gmat_bin}")
+
+    runner = SubprocessGmatRunner(gmat_bin=gmat_bin, compat_lib_dir=resolve_compat_lib_dir())
+    return ScenarioSession(runner, _session_root(tmp_path_factory) / "gmat-scenarios")
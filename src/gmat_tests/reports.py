@@ -0,0 +1,461 @@
+import gzip
+import io
+import itertools
+import mmap
+import re
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, Optional, Sequence, TypeVar, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# GMAT ReportFile layout: an optional header line of parameter names, then one
+# whitespace-padded row per report. Gregorian epochs ("01 Jan 2000 12:00:00.000")
+# span four whitespace-separated tokens; every other value is a single token.
+_GREGORIAN_SUFFIX = "Gregorian"
+_GREGORIAN_TOKENS = 4
+_MONTHS = (b"Jan", b"Feb", b"Mar", b"Apr", b"May", b"Jun", b"Jul", b"Aug", b"Sep", b"Oct", b"Nov", b"Dec")
+
+# Script statements that decide a ReportFile's columns: the parameter list of
+# `Report <RF> a b c` in the mission sequence, or `<RF>.Add = {a, b, c}`.
+_FILENAME = re.compile(r"^(?:GMAT\s+)?(\w+)\.Filename\s*=\s*'([^']*)'")
+_ADD = re.compile(r"^(?:GMAT\s+)?(\w+)\.Add\s*=\s*\{([^}]*)\}")
+_REPORT = re.compile(r"^Report\s+(\w+)\s+(.+)$")
+
+# Archived run snapshots may hold reports as <name>.zst or <name>.gz. Those are
+# decompressed as a stream: row helpers keep only the current line, so a long
+# ephemeris is never inflated in memory just to read its final state.
+COMPRESSED_SUFFIXES = (".zst", ".gz")
+
+ReportValue = Union[float, str]
+_T = TypeVar("_T")
+
+
+class ReportRow(Mapping):
+    # One report row addressed by column name, in report column order.
+
+    def __init__(self, names: Sequence[str], values: Sequence[ReportValue]) -> None:
+        self.names = tuple(names)
+        self._values = dict(zip(self.names, values))
+
+    def __getitem__(self, name: str) -> ReportValue:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise KeyError(f"No column {name!r}; columns are {list(self.names)}") from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"ReportRow({self._values!r})"
+
+    def select(self, *names: str) -> tuple[ReportValue, ...]:
+        return tuple(self[name] for name in names)
+
+
+@dataclass(frozen=True)
+class ReportTable:
+    names: tuple[str, ...]
+    columns: dict[str, "np.ndarray"]
+    rows: int
+
+    def __getitem__(self, name: str) -> "np.ndarray":
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return self.rows
+
+
+def is_epoch_column(name: str) -> bool:
+    return name.endswith(_GREGORIAN_SUFFIX)
+
+
+def _token_widths(names: Sequence[str]) -> list[int]:
+    return [_GREGORIAN_TOKENS if is_epoch_column(name) else 1 for name in names]
+
+
+@contextmanager
+def _mapped(report_path: Path) -> Iterator[Union[mmap.mmap, bytes]]:
+    # mmap cannot map an empty file; callers treat b"" as "no rows".
+    with report_path.open("rb") as f:
+        if report_path.stat().st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield buf
+
+
+def is_compressed(report_path: Path) -> bool:
+    return report_path.suffix in COMPRESSED_SUFFIXES
+
+
+def find_report(report_path: Path) -> Optional[Path]:
+    # The report itself, or else its compressed archive copy.
+    candidates = [report_path, *(report_path.with_name(report_path.name + s) for s in COMPRESSED_SUFFIXES)]
+    return next((path for path in candidates if path.exists()), None)
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise ImportError("Reading .zst reports needs the zstandard package") from exc
+    return zstandard
+
+
+@contextmanager
+def _open_stream(report_path: Path) -> Iterator[IO[bytes]]:
+    if report_path.suffix == ".gz":
+        with gzip.open(report_path, "rb") as f:
+            yield f
+    elif report_path.suffix == ".zst":
+        zstandard = _zstandard()
+        with report_path.open("rb") as raw, zstandard.ZstdDecompressor().stream_reader(raw) as reader:
+            yield io.BufferedReader(reader)
+    else:
+        with report_path.open("rb") as f:
+            yield f
+
+
+@contextmanager
+def _streamed(report_path: Path) -> Iterator[tuple[Optional[tuple[str, ...]], Iterator[bytes]]]:
+    # Header names and the remaining non-empty data lines of a compressed
+    # report, decompressed as they are consumed.
+    with _open_stream(report_path) as f:
+        lines = (line for line in map(bytes.strip, f) if line)
+        first = next(lines, None)
+        if first is None:
+            yield None, iter(())
+        elif _is_float(first.split()[0]):
+            yield None, itertools.chain([first], lines)
+        else:
+            yield tuple(token.decode("utf-8") for token in first.split()), lines
+
+
+def _last(items: Iterable[_T]) -> Optional[_T]:
+    tail = deque(items, maxlen=1)
+    return tail[0] if tail else None
+
+
+def _reverse_lines(buf: Union[mmap.mmap, bytes], floor: int = 0) -> Iterator[bytes]:
+    # Non-empty lines after `floor`, from EOF backwards; only the tail of the
+    # file is touched until the caller stops iterating.
+    end = len(buf)
+    while end > floor:
+        newline = buf.rfind(b"\n", floor, end)
+        start = floor if newline < 0 else newline + 1
+        line = buf[start:end].strip()
+        if line:
+            yield line
+        end = start - 1
+
+
+def _forward_lines(buf: Union[mmap.mmap, bytes], start: int = 0) -> Iterator[bytes]:
+    while start < len(buf):
+        end = buf.find(b"\n", start)
+        end = len(buf) if end < 0 else end
+        line = buf[start:end].strip()
+        if line:
+            yield line
+        start = end + 1
+
+
+def _is_float(token: bytes) -> bool:
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+
+def _split_header(buf: Union[mmap.mmap, bytes]) -> tuple[Optional[tuple[str, ...]], int]:
+    # Returns the header names (None when the first line is already data) and
+    # the offset where data rows start.
+    offset = 0
+    while offset < len(buf):
+        end = buf.find(b"\n", offset)
+        end = len(buf) if end < 0 else end
+        tokens = buf[offset:end].split()
+        if tokens:
+            if _is_float(tokens[0]):
+                return None, offset
+            return tuple(token.decode("utf-8") for token in tokens), end + 1
+        offset = end + 1
+    return None, offset
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise ImportError("Columnar report reading needs numpy; install gmat-tests[reports]") from exc
+    return numpy
+
+
+def _parse_row(tokens: list[bytes], names: Sequence[str], widths: Sequence[int]) -> ReportRow:
+    if len(tokens) != sum(widths):
+        raise ValueError(f"Expected {sum(widths)} tokens for columns {list(names)}, got {len(tokens)}")
+    values: list[ReportValue] = []
+    k = 0
+    for width in widths:
+        if width == 1:
+            values.append(float(tokens[k]))
+        else:
+            values.append(b" ".join(tokens[k : k + width]).decode("utf-8"))
+        k += width
+    return ReportRow(names, values)
+
+
+def read_report_header(report_path: Path) -> Optional[tuple[str, ...]]:
+    if is_compressed(report_path):
+        with _streamed(report_path) as (header, _lines):
+            return header
+    with _mapped(report_path) as buf:
+        return _split_header(buf)[0]
+
+
+def read_last_row(report_path: Path, names: Optional[Sequence[str]] = None) -> ReportRow:
+    # Last data row by column name, read by seeking back from EOF (or by
+    # streaming a compressed report). Headerless reports need `names` to know
+    # which columns are Gregorian epochs.
+    if is_compressed(report_path):
+        with _streamed(report_path) as (header, lines):
+            names = _row_names(report_path, header, names)
+            line = _last(lines)
+    else:
+        with _mapped(report_path) as buf:
+            header, data_start = _split_header(buf)
+            names = _row_names(report_path, header, names)
+            line = next(_reverse_lines(buf, data_start), None)
+    if line is None:
+        raise ValueError(f"No data rows in {report_path}")
+    return _parse_row(line.split(), names, _token_widths(names))
+
+
+def _row_names(
+    report_path: Path, header: Optional[tuple[str, ...]], names: Optional[Sequence[str]]
+) -> tuple[str, ...]:
+    if names is not None:
+        return tuple(names)
+    if header is None:
+        raise ValueError(f"{report_path} has no header line; pass the column names")
+    return header
+
+
+def script_report_columns(script_path: Path, report_name: str) -> Optional[tuple[str, ...]]:
+    # Columns a GMAT script writes to the ReportFile whose Filename is
+    # `report_name`, or None when the script does not declare them.
+    statements = []
+    for raw in script_path.read_text(encoding="utf-8").splitlines():
+        line = raw.split("%", 1)[0].strip().rstrip(";").strip()
+        if line:
+            statements.append(line)
+    objects = {
+        match.group(1)
+        for match in map(_FILENAME.match, statements)
+        if match and Path(match.group(2)).name == report_name
+    }
+    declared = set()
+    for line in statements:
+        match = _ADD.match(line) or _REPORT.match(line)
+        if match and match.group(1) in objects:
+            declared.add(tuple(token for token in re.split(r"[\s,]+", match.group(2)) if token))
+    if len(declared) > 1:
+        raise ValueError(f"{script_path} writes different column sets to {report_name}: {sorted(declared)}")
+    return declared.pop() if declared else None
+
+
+def read_scenario_row(script_path: Path, report_path: Path) -> ReportRow:
+    # Last row of a scenario report, with the header checked against the
+    # columns the script declares (which also name a headerless report).
+    report_name = report_path.stem if is_compressed(report_path) else report_path.name
+    expected = script_report_columns(script_path, report_name)
+    header = read_report_header(report_path)
+    if header is not None and expected is not None and header != expected:
+        raise ValueError(f"{report_path} header {list(header)} does not match {script_path}: {list(expected)}")
+    return read_last_row(report_path, names=expected if header is None else None)
+
+
+def last_data_line(report_path: Path) -> str:
+    if is_compressed(report_path):
+        with _streamed(report_path) as (_header, lines):
+            line = _last(lines)
+    else:
+        with _mapped(report_path) as buf:
+            _header, data_start = _split_header(buf)
+            line = next(_reverse_lines(buf, data_start), None)
+    return "" if line is None else line.decode("utf-8")
+
+
+def first_data_line(report_path: Path) -> str:
+    if is_compressed(report_path):
+        with _streamed(report_path) as (_header, lines):
+            line = next(lines, None)
+    else:
+        with _mapped(report_path) as buf:
+            _header, data_start = _split_header(buf)
+            line = next(_forward_lines(buf, data_start), None)
+    return "" if line is None else line.decode("utf-8")
+
+
+# read_report() parses whole lines in blocks of about this many bytes, so its
+# working set is one block plus the columns it returns.
+_BLOCK_BYTES = 1 << 20
+
+
+@contextmanager
+def _data_blocks(report_path: Path) -> Iterator[tuple[Optional[tuple[str, ...]], Iterator[bytes]]]:
+    # Header names and the data that follows as blocks of complete lines,
+    # sliced from the mapped file or decompressed from an archived one.
+    if is_compressed(report_path):
+        with _streamed(report_path) as (header, lines):
+            yield header, _joined_blocks(lines)
+    else:
+        with _mapped(report_path) as buf:
+            header, data_start = _split_header(buf)
+            yield header, _mapped_blocks(buf, data_start)
+
+
+def _mapped_blocks(buf: Union[mmap.mmap, bytes], start: int) -> Iterator[bytes]:
+    while start < len(buf):
+        end = buf.find(b"\n", start + _BLOCK_BYTES)
+        end = len(buf) if end < 0 else end + 1
+        yield buf[start:end]
+        start = end
+
+
+def _joined_blocks(lines: Iterable[bytes]) -> Iterator[bytes]:
+    block: list[bytes] = []
+    size = 0
+    for line in lines:
+        block.append(line)
+        size += len(line) + 1
+        if size >= _BLOCK_BYTES:
+            yield b"\n".join(block)
+            block, size = [], 0
+    if block:
+        yield b"\n".join(block)
+
+
+def _bad_row(report_path: Path, block: bytes, rows_before: int, names: Sequence[str], per_row: int) -> ValueError:
+    # The first row in `block` without `per_row` tokens, numbered in the report.
+    lines = (line for line in map(bytes.strip, block.splitlines()) if line)
+    for row, line in enumerate(lines, start=rows_before + 1):
+        if len(line.split()) != per_row:
+            return ValueError(
+                f"{report_path}: data row {row} has {len(line.split())} tokens, expected {per_row} ({list(names)})"
+            )
+    return ValueError(f"{report_path}: data rows do not form rows of {per_row} tokens ({list(names)})")
+
+
+def read_report(
+    report_path: Path,
+    columns: Optional[Sequence[str]] = None,
+    names: Optional[Sequence[str]] = None,
+) -> ReportTable:
+    # Columnar read of a whole report. Numeric columns become float64 arrays
+    # and Gregorian epochs datetime64[ms]; `columns` limits conversion to the
+    # named ones. NumPy is only needed here, not for the row helpers.
+    np = _numpy()
+    with _data_blocks(report_path) as (header, blocks):
+        names = tuple(names) if names is not None else header
+        if names is None:
+            raise ValueError(f"{report_path} has no header line; pass the column names")
+        wanted = list(names) if columns is None else list(columns)
+        unknown = [name for name in wanted if name not in names]
+        if unknown:
+            raise KeyError(f"{report_path} has no column(s) {unknown}; columns are {list(names)}")
+
+        widths = _token_widths(names)
+        per_row = sum(widths)
+        starts = dict(zip(names, itertools.accumulate([0, *widths[:-1]])))
+        # Column k of a block's tokens is every per_row-th token from its
+        # offset. Only the requested columns are kept: numbers as float64,
+        # epoch tokens as bytes for one vectorized conversion at the end.
+        numeric = {name: array("d") for name in wanted if not is_epoch_column(name)}
+        epochs = {name: tuple([] for _ in range(_GREGORIAN_TOKENS)) for name in wanted if is_epoch_column(name)}
+        rows = 0
+        for block in blocks:
+            tokens = block.split()
+            if len(tokens) % per_row:
+                raise _bad_row(report_path, block, rows, names, per_row)
+            for name, values in numeric.items():
+                values.extend(map(float, tokens[starts[name] :: per_row]))
+            for name, parts in epochs.items():
+                for j, part in enumerate(parts):
+                    part.extend(tokens[starts[name] + j :: per_row])
+            rows += len(tokens) // per_row
+
+    result: dict[str, np.ndarray] = {}
+    for name in wanted:
+        if name in numeric:
+            result[name] = np.frombuffer(numeric[name], dtype=np.float64)
+        elif rows:
+            result[name] = _gregorian_to_datetime64(*(np.array(part, dtype=bytes) for part in epochs[name]))
+        else:
+            result[name] = np.empty(0, dtype="datetime64[ms]")
+    return ReportTable(names=tuple(names), columns=result, rows=rows)
+
+
+def _gregorian_to_datetime64(
+    day: "np.ndarray", month: "np.ndarray", year: "np.ndarray", clock: "np.ndarray"
+) -> "np.ndarray":
+    # "DD Mon YYYY HH:MM:SS.mmm" -> ISO-8601, converted in one astype call.
+    np = _numpy()
+    month_number = np.zeros(len(month), dtype="S2")
+    for index, name in enumerate(_MONTHS, start=1):
+        month_number[month == name] = b"%02d" % index
+    if not month_number.all():
+        raise ValueError(f"Unknown month in Gregorian epoch: {sorted(set(month[month_number == b''].tolist()))}")
+    iso = np.char.add(np.char.add(np.char.add(year, b"-"), month_number), b"-")
+    iso = np.char.add(np.char.add(np.char.add(iso, np.char.zfill(day, 2)), b"T"), clock)
+    return iso.astype("datetime64[ms]")
+
+
+def _numeric_values(line: bytes, expected_values: int) -> Optional[list[float]]:
+    try:
+        values = [float(token) for token in line.split()]
+    except ValueError:
+        return None
+    return values if len(values) == expected_values else None
+
+
+def read_last_numeric_row(report_path: Path, expected_values: int) -> list[float]:
+    if is_compressed(report_path):
+        with _open_stream(report_path) as f:
+            rows = (_numeric_values(line, expected_values) for line in f)
+            values = _last(row for row in rows if row is not None)
+        if values is not None:
+            return values
+    else:
+        with _mapped(report_path) as buf:
+            for line in _reverse_lines(buf):
+                values = _numeric_values(line, expected_values)
+                if values is not None:
+                    return values
+    raise ValueError(f"No numeric row with {expected_values} values found in {report_path}")
+
+
+def count_data_rows(report_path: Path) -> int:
+    if not report_path.exists():
+        return 0
+    rows = 0
+    with _open_stream(report_path) as f:
+        for line in f:
+            for token in line.split():
+                try:
+                    float(token)
+                except ValueError:
+                    continue
+                rows += 1
+                break
+    return rows
@@ -0,0 +1,94 @@
+import fcntl
+import hashlib
+import json
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from gmat_tests.adapters.subprocess_runner import prepare_script_in_workdir
+from gmat_tests.domain.models import GmatExecutionRequest
+from gmat_tests.ports.gmat_runner import GmatRunner
+from gmat_tests.reports import ReportRow, read_scenario_row
+
+
+@dataclass(frozen=True)
+class ScenarioRun:
+    returncode: int
+    stdout: str
+    stderr: str
+    work_dir: Path
+
+    def require_success(self) -> "ScenarioRun":
+        assert self.returncode == 0, f"stdout:\n{self.stdout}\n\nstderr:\n{self.stderr}"
+        return self
+
+    def report_path(self, report_name: str) -> Path:
+        path = self.work_dir / report_name
+        assert path.exists(), f"Expected report file missing: {path}"
+        return path
+
+
+class ScenarioSession:
+    # Runs each scenario once per test session. Results are memoized in-process
+    # and on disk under shared_dir; an exclusive file lock per scenario makes
+    # concurrent pytest-xdist workers wait for the first run instead of
+    # starting a duplicate GMAT propagation.
+
+    def __init__(self, runner: GmatRunner, shared_dir: Path) -> None:
+        self._runner = runner
+        self._shared_dir = Path(shared_dir)
+        self._runs: dict[str, ScenarioRun] = {}
+        self._rows: dict[tuple[str, str], ReportRow] = {}
+        self._lock = threading.Lock()
+
+    def run(self, script_path: Path, extra_assets: Sequence[Path] = ()) -> ScenarioRun:
+        key = self._scenario_key(script_path, extra_assets)
+        with self._lock:
+            if key not in self._runs:
+                self._runs[key] = self._run_once(key, script_path, extra_assets)
+            return self._runs[key]
+
+    def report_row(self, script_path: Path, report_name: str, extra_assets: Sequence[Path] = ()) -> ReportRow:
+        # Last report row by column name; the header is checked against the
+        # script's Report statement before any test sees the values.
+        run = self.run(script_path, extra_assets).require_success()
+        row_key = (self._scenario_key(script_path, extra_assets), report_name)
+        with self._lock:
+            if row_key not in self._rows:
+                self._rows[row_key] = read_scenario_row(Path(script_path), run.report_path(report_name))
+            return self._rows[row_key]
+
+    def _run_once(self, key: str, script_path: Path, extra_assets: Sequence[Path]) -> ScenarioRun:
+        entry = self._shared_dir / key
+        self._shared_dir.mkdir(parents=True, exist_ok=True)
+        with (self._shared_dir / f"{key}.lock").open("w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            result_path = entry / "result.json"
+            if result_path.exists():
+                data = json.loads(result_path.read_text(encoding="utf-8"))
+                return ScenarioRun(data["returncode"], data["stdout"], data["stderr"], Path(data["work_dir"]))
+
+            work_dir = entry / "run"
+            if work_dir.exists():
+                shutil.rmtree(work_dir)
+            staged = prepare_script_in_workdir(script_path, work_dir)
+            for asset in extra_assets:
+                shutil.copy2(asset, work_dir / asset.name)
+            result = self._runner.run(GmatExecutionRequest(script_path=staged, work_dir=work_dir))
+
+            payload = {
+                "returncode": result.returncode,
+                "stdout": result.stdout,
+                "stderr": result.stderr,
+                "work_dir": str(work_dir),
+            }
+            result_path.write_text(json.dumps(payload) + "\n", encoding="utf-8")
+            return ScenarioRun(result.returncode, result.stdout, result.stderr, work_dir)
+
+    @staticmethod
+    def _scenario_key(script_path: Path, extra_assets: Sequence[Path]) -> str:
+        ident = "\n".join(str(Path(p).resolve()) for p in [script_path, *extra_assets])
+        digest = hashlib.sha256(ident.encode("utf-8")).hexdigest()[:12]
+        return f"{Path(script_path).stem}-{digest}"
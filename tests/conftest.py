@@ -6,3 +6,11 @@ from pathlib import Path
 SRC_DIR = Path(__file__).resolve().parents[1] / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
+
+# The lab scripts import each other as top-level modules; appended so their
+# short names (benchmark, common, ...) never shadow installed packages.
+LAB_BIN_DIR = Path(__file__).resolve().parents[1] / ".gmat-lab" / "bin"
+if str(LAB_BIN_DIR) not in sys.path:
+    sys.path.append(str(LAB_BIN_DIR))
+
+pytest_plugins = ["gmat_tests.pytest_plugin"]
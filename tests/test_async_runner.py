@@ -0,0 +1,145 @@
+import asyncio
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from gmat_tests.adapters.async_runner import AsyncGmatRunner
+from gmat_tests.adapters.subprocess_runner import prepare_script_in_workdir
+from gmat_tests.domain.models import GmatExecutionRequest
+
+
+FAKE_GMAT = """#!/usr/bin/env bash
+set -euo pipefail
+if grep -q Hang "$1"; then
+  sleep 60 &
+  echo $! > child.pid
+  echo "started"
+  wait
+fi
+if grep -q Limits "$1"; then
+  echo "$(ulimit -t) $(ulimit -v) $(nice)"
+  exit 0
+fi
+if grep -q Slow "$1"; then
+  sleep 0.5
+fi
+for i in 1 2 3; do echo "line $i"; done
+echo "warning" >&2
+printf 'x y\n1 2\n' > report.txt
+"""
+
+
+def _is_running(pid: int) -> bool:
+    status = Path(f"/proc/{pid}/status")
+    if not status.exists():
+        return False
+    # Killed orphans may linger as zombies until init reaps them.
+    return "State:\tZ" not in status.read_text()
+
+
+def _setup(tmp_path: Path, body: str) -> tuple[AsyncGmatRunner, GmatExecutionRequest]:
+    fake_bin = tmp_path / "GMAT-R2025a"
+    if not fake_bin.exists():
+        fake_bin.write_text(FAKE_GMAT)
+        fake_bin.chmod(0o755)
+    script = tmp_path / "sample.script"
+    script.write_text(body)
+    runner = AsyncGmatRunner(gmat_bin=fake_bin)
+    sandbox = runner.create_contained_workdir(tmp_path)
+    staged = prepare_script_in_workdir(script, sandbox)
+    return runner, GmatExecutionRequest(script_path=staged, work_dir=sandbox, report_files=("report.txt",))
+
+
+def test_streams_lines_to_callbacks_and_files(tmp_path):
+    runner, request = _setup(tmp_path, "Create Spacecraft Sat;\n")
+    seen: list[str] = []
+    out_file = tmp_path / "stdout.txt"
+
+    result = asyncio.run(runner.run_async(request, on_stdout=seen.append, stdout_path=out_file, capture=False))
+
+    assert result.returncode == 0
+    assert result.stdout == ""
+    assert seen == ["line 1\n", "line 2\n", "line 3\n"]
+    assert out_file.read_text() == "line 1\nline 2\nline 3\n"
+
+
+def test_run_records_resource_usage(tmp_path):
+    runner, request = _setup(tmp_path, "Create Spacecraft Sat;\n")
+
+    result = asyncio.run(runner.run_async(request))
+
+    assert result.returncode == 0
+    assert result.peak_rss_kb > 0
+    assert result.cpu_user_s is not None and result.cpu_sys_s is not None
+    assert result.wall_time_s > 0
+    assert result.workdir_bytes_written == len("x y\n1 2\n")
+    assert result.report_rows == 1
+
+
+def test_limits_hold_from_the_start(tmp_path):
+    runner, request = _setup(tmp_path, "Limits;\n")
+    request = replace(request, cpu_limit_s=60, memory_limit_bytes=2 * 1024**3, niceness=5)
+
+    result = asyncio.run(runner.run_async(request))
+
+    assert result.stdout.split() == ["60", str(2 * 1024**2), "5"]
+
+
+def test_timeout_kills_process_group(tmp_path):
+    runner, request = _setup(tmp_path, "Hang;\n")
+
+    result = asyncio.run(runner.run_async(request, timeout_s=0.5))
+
+    assert result.timed_out
+    assert result.returncode != 0
+
+    child_pid = int((request.work_dir / "child.pid").read_text())
+    time.sleep(0.1)
+    assert not _is_running(child_pid)
+
+
+def test_failing_callback_kills_process_group(tmp_path):
+    runner, request = _setup(tmp_path, "Hang;\n")
+
+    def fail(line: str) -> None:
+        raise RuntimeError(f"callback failed on {line!r}")
+
+    with pytest.raises(RuntimeError, match="callback failed"):
+        asyncio.run(runner.run_async(request, on_stdout=fail, timeout_s=30))
+
+    child_pid = int((request.work_dir / "child.pid").read_text())
+    time.sleep(0.1)
+    assert not _is_running(child_pid)
+
+
+def test_cancelled_run_kills_process_group(tmp_path):
+    runner, request = _setup(tmp_path, "Hang;\n")
+    child_file = request.work_dir / "child.pid"
+
+    async def cancel_once_started() -> None:
+        task = asyncio.create_task(runner.run_async(request, timeout_s=30))
+        while not child_file.exists() or not child_file.read_text().strip():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_once_started())
+
+    time.sleep(0.1)
+    assert not _is_running(int(child_file.read_text()))
+
+
+def test_run_many_runs_concurrently(tmp_path):
+    runner, first = _setup(tmp_path, "Slow;\n")
+    requests = [first] + [_setup(tmp_path, "Slow;\n")[1] for _ in range(3)]
+
+    start = time.perf_counter()
+    results = asyncio.run(runner.run_many(requests, concurrency=4))
+    elapsed = time.perf_counter() - start
+
+    assert [r.returncode for r in results] == [0, 0, 0, 0]
+    assert all(r.stderr == "warning\n" for r in results)
+    assert elapsed < 1.5
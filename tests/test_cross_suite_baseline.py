@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import shutil
 import subprocess
 import sys
 from pathlib import Path
@@ -36,6 +37,26 @@ def test_export_humeris_compare_baseline_script():
     assert payload["oem_summary"]["rows"] > 1000
 
 
+def test_export_uses_the_snapshot_header_over_the_current_script(tmp_path):
+    # An older run whose Report statement has since changed still exports
+    # with the columns it was recorded with.
+    run_dir = tmp_path / "run-0001-abc1234-clean"
+    shutil.copytree(_REPO_ROOT / "docs/test-runs/run-0008-3b5fc7b-clean", run_dir)
+    report = run_dir / "cases/basic_leo_two_body/basic_leo_two_body_results.txt"
+    report.write_text("startSMA endSMA Sat.ElapsedDays\n7000.0 6999.5 0.0625\n", encoding="utf-8")
+    out = tmp_path / "baseline.json"
+
+    subprocess.run(
+        [sys.executable, "scripts/export_humeris_compare_baseline.py", "--run-dir", str(run_dir), "--out", str(out)],
+        cwd=_REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    payload = json.loads(out.read_text(encoding="utf-8"))
+    assert payload["cases"]["basic_leo_two_body"] == {"startSMA": 7000.0, "endSMA": 6999.5, "elapsedDays": 0.0625}
+
+
 @pytest.mark.skipif(not _HUMERIS_REPO.exists(), reason="Local Humeris repo not present")
 def test_cross_suite_link_to_humeris_parity_reports():
     latest = _HUMERIS_REPO / "docs/gmat-parity-runs/LATEST"
@@ -1,56 +1,49 @@
 from __future__ import annotations
 
-import shutil
 from pathlib import Path
 
 import pytest
 
-from gmat_tests.adapters.subprocess_runner import SubprocessGmatRunner, prepare_script_in_workdir
-from gmat_tests.config import resolve_compat_lib_dir, resolve_gmat_bin, resolve_test_sandbox
-from gmat_tests.domain.models import GmatExecutionRequest
+from gmat_tests.reports import read_report
+from gmat_tests.scenario_session import ScenarioSession
 
 
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
-def _run_script(script_path: Path, extra_assets: list[Path] | None = None) -> tuple[str, str, Path]:
-    gmat_bin = resolve_gmat_bin()
-    if not gmat_bin.exists():
-        pytest.skip(f"GMAT binary not found at {gmat_bin}")
-
-    runner = SubprocessGmatRunner(gmat_bin=gmat_bin, compat_lib_dir=resolve_compat_lib_dir())
-    sandbox = runner.create_contained_workdir(resolve_test_sandbox())
-    staged = prepare_script_in_workdir(script_path, sandbox)
-    for asset in extra_assets or []:
-        shutil.copy2(asset, sandbox / asset.name)
-    result = runner.run(GmatExecutionRequest(script_path=staged, work_dir=sandbox))
-    assert result.returncode == 0, f"stdout:\n{result.stdout}\n\nstderr:\n{result.stderr}"
-    return result.stdout, result.stderr, sandbox
+def _run_script(
+    gmat_scenarios: ScenarioSession,
+    script_path: Path,
+    extra_assets: list[Path] | None = None,
+) -> tuple[str, str, Path]:
+    run = gmat_scenarios.run(script_path, extra_assets or []).require_success()
+    return run.stdout, run.stderr, run.work_dir
 
 
 @pytest.mark.integration
-def test_sample_hohmann_transfer_completes():
+def test_sample_hohmann_transfer_completes(gmat_scenarios):
     script = _repo_root() / "GMAT/R2025a/samples/Ex_HohmannTransfer.script"
-    stdout, _stderr, _sandbox = _run_script(script)
+    stdout, _stderr, _sandbox = _run_script(gmat_scenarios, script)
     assert "Mission run completed" in stdout
 
 
 @pytest.mark.integration
-def test_headless_oem_ephemeris_generates_report_rows():
+def test_headless_oem_ephemeris_generates_report_rows(gmat_scenarios):
     script = _repo_root() / "scenarios/headless_oem_ephemeris.script"
     sample_oem = _repo_root() / "GMAT/R2025a/data/vehicle/ephem/ccsds/SampleOEMEphem.oem"
-    _stdout, _stderr, sandbox = _run_script(script, extra_assets=[sample_oem])
+    _stdout, _stderr, sandbox = _run_script(gmat_scenarios, script, extra_assets=[sample_oem])
     report = sandbox / "KeplerianElements.txt"
     assert report.exists()
-    lines = [ln for ln in report.read_text(encoding="utf-8").splitlines() if ln.strip()]
-    assert len(lines) > 1000
+    table = read_report(report, columns=["EphSat.UTCGregorian", "EphSat.SMA"])
+    assert len(table) > 1000
+    assert (table["EphSat.UTCGregorian"][1:] > table["EphSat.UTCGregorian"][:-1]).all()
 
 
 @pytest.mark.integration
-def test_event_locator_reports_nonempty():
+def test_event_locator_reports_nonempty(gmat_scenarios):
     script = _repo_root() / "scenarios/headless_eclipse_locator.script"
-    _stdout, _stderr, sandbox = _run_script(script)
+    _stdout, _stderr, sandbox = _run_script(gmat_scenarios, script)
     report = sandbox / "EclipseLocator1.txt"
     assert report.exists()
     lines = [ln for ln in report.read_text(encoding="utf-8").splitlines() if ln.strip()]
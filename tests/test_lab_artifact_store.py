@@ -0,0 +1,102 @@
+import errno
+from pathlib import Path
+
+import pytest
+
+from artifact_store import COMPRESS_MIN_BYTES, blob_path, snapshot_tree
+from gmat_tests.reports import _open_stream, find_report, read_last_row
+
+
+def _tree(root: Path, files: dict[str, bytes]) -> Path:
+    for rel, data in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return root
+
+
+def _blob_files(blobs: Path) -> list[Path]:
+    return sorted(path for path in blobs.rglob("*") if path.is_file())
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    src = _tree(tmp_path / "out", {"a.txt": b"report\n", "sub/b.txt": b"report\n", "c.txt": b"log\n"})
+    blobs = tmp_path / "blobs"
+
+    first = snapshot_tree(src, tmp_path / "run-1", blobs)
+    second = snapshot_tree(src, tmp_path / "run-2", blobs)
+
+    assert first == second
+    assert [entry["path"] for entry in first] == ["a.txt", "c.txt", "sub/b.txt"]
+    assert len(_blob_files(blobs)) == 2
+    blob = blob_path(first[0]["sha256"], blobs)
+    inodes = {(tmp_path / run / rel).stat().st_ino for run in ("run-1", "run-2") for rel in ("a.txt", "sub/b.txt")}
+    assert inodes == {blob.stat().st_ino}
+    # The blob is linked from the first output holding the content and from
+    # four snapshot entries.
+    assert blob.stat().st_nlink == 6
+
+
+def test_snapshot_copies_where_hardlinks_fail(tmp_path, monkeypatch):
+    src = _tree(tmp_path / "out", {"a.txt": b"report\n", "b.txt": b"report\n"})
+    blobs = tmp_path / "blobs"
+    linked = snapshot_tree(src, tmp_path / "linked", tmp_path / "linked-blobs")
+
+    def no_links(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr("artifact_store.os.link", no_links)
+    files = snapshot_tree(src, tmp_path / "run-1", blobs)
+
+    assert files == linked
+    assert len(_blob_files(blobs)) == 1
+    assert _blob_files(blobs)[0].stat().st_nlink == 1
+    for rel in ("a.txt", "b.txt"):
+        copy = tmp_path / "run-1" / rel
+        assert copy.read_bytes() == b"report\n"
+        assert copy.stat().st_nlink == 1
+
+
+def _report(rows: int) -> bytes:
+    lines = [f"{7000.0 + k / 8:<24}{0.001 * (k % 97):<24}{k:<10}" for k in range(rows)]
+    return ("Sat.SMA                 Sat.ECC                 Step\n" + "\n".join(lines) + "\n").encode()
+
+
+def test_files_from_64_kib_up_are_compressed(tmp_path):
+    data = _report(1400)
+    assert len(data) > COMPRESS_MIN_BYTES
+    src = _tree(
+        tmp_path / "out",
+        {"small.txt": data[: COMPRESS_MIN_BYTES - 1], "edge.txt": data[:COMPRESS_MIN_BYTES], "big.txt": data},
+    )
+
+    files = {entry["path"]: entry for entry in snapshot_tree(src, tmp_path / "run-1", tmp_path / "blobs", "gzip")}
+
+    assert "compression" not in files["small.txt"]
+    assert (tmp_path / "run-1" / "small.txt").exists()
+    for rel in ("edge.txt", "big.txt"):
+        entry = files[rel]
+        assert entry["stored"] == rel + ".gz" and entry["compression"] == "gzip"
+        assert entry["bytes"] == (src / rel).stat().st_size
+        assert entry["stored_bytes"] == (tmp_path / "run-1" / entry["stored"]).stat().st_size < entry["bytes"]
+        assert not (tmp_path / "run-1" / rel).exists()
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_compressed_artifacts_read_back_through_reports(tmp_path, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    data = _report(2000)
+    src = _tree(tmp_path / "out", {"report.txt": data})
+    blobs = tmp_path / "blobs"
+
+    (entry,) = snapshot_tree(src, tmp_path / "run-1", blobs, compression)
+    snapshot_tree(src, tmp_path / "run-2", blobs, compression)
+
+    archived = find_report(tmp_path / "run-1" / "report.txt")
+    assert archived == tmp_path / "run-1" / entry["stored"]
+    with _open_stream(archived) as f:
+        assert f.read() == data
+    assert read_last_row(archived).select("Sat.SMA", "Step") == (7000.0 + 1999 / 8, 1999.0)
+    # Archives are a function of the content, so they deduplicate as well.
+    assert len(_blob_files(blobs)) == 1
@@ -0,0 +1,92 @@
+import pytest
+
+from benchmark import find_regressions, load_baseline, summarize, update_baseline
+
+
+def _sample(wall: float, user: float | None = None, system: float | None = 0.5) -> dict:
+    return {"wall_time_s": wall, "cpu_user_s": user, "cpu_sys_s": system}
+
+
+def _stats(wall: float, cpu: float | None = None) -> dict:
+    summary = {"runs": 5, "wall_time_s": {"median": wall}}
+    if cpu is not None:
+        summary["cpu_time_s"] = {"median": cpu}
+    return summary
+
+
+def test_summarize_skips_samples_without_a_metric():
+    samples = [_sample(2.0, 1.5), _sample(1.0, 0.5), _sample(10.0, None), _sample(3.0, 2.5, None)]
+
+    summary = summarize(samples)
+
+    assert summary["runs"] == 4
+    # Nearest-rank p95 of four runs is the slowest one.
+    assert summary["wall_time_s"] == {"median": 2.5, "p95": 10.0, "min": 1.0, "max": 10.0}
+    assert summary["cpu_time_s"] == {"median": 1.5, "p95": 2.0, "min": 1.0, "max": 2.0}
+    assert summarize([{"wall_time_s": None}]) == {"runs": 1}
+
+
+@pytest.mark.parametrize(
+    "median, threshold, floor_s, regressed",
+    [
+        (12.4, 0.25, 0.5, False),
+        (12.5, 0.25, 0.5, False),  # exactly at the threshold
+        (12.6, 0.25, 0.5, True),
+        (10.9, 0.05, 0.5, True),  # a tighter per-case threshold
+        (10.9, 0.05, 1.0, False),  # within the floor
+    ],
+)
+def test_regression_needs_both_threshold_and_floor(median, threshold, floor_s, regressed):
+    baseline = {"cases": {"leo": _stats(10.0)}}
+
+    found = find_regressions({"leo": _stats(median)}, baseline, {"leo": threshold}, floor_s)
+
+    assert bool(found) == regressed
+    if regressed:
+        assert found == [
+            {
+                "case": "leo",
+                "metric": "wall_time_s",
+                "baseline_median": 10.0,
+                "median": median,
+                "ratio": median / 10.0,
+                "threshold": threshold,
+            }
+        ]
+
+
+def test_floor_keeps_fast_cases_from_tripping_on_noise():
+    baseline = {"cases": {"tiny": _stats(0.2, cpu=0.1)}}
+    thresholds = {"tiny": 0.25}
+
+    assert find_regressions({"tiny": _stats(0.6, cpu=0.5)}, baseline, thresholds, 0.5) == []
+    found = find_regressions({"tiny": _stats(0.8, cpu=0.5)}, baseline, thresholds, 0.5)
+    assert [r["metric"] for r in found] == ["wall_time_s"]
+
+
+def test_cases_or_metrics_missing_from_the_baseline_are_not_compared():
+    # "old" predates CPU time in the baseline; "new" has no baseline yet.
+    baseline = {"cases": {"old": _stats(1.0)}}
+    stats = {"old": _stats(1.0, cpu=99.0), "new": _stats(99.0, cpu=99.0)}
+
+    assert find_regressions(stats, baseline, {"old": 0.25, "new": 0.25}, 0.0) == []
+    assert find_regressions(stats, {"cases": {}}, {"old": 0.25, "new": 0.25}, 0.0) == []
+
+
+def test_update_baseline_merges_cases_by_id(tmp_path):
+    path = tmp_path / "baseline.json"
+    assert load_baseline(path) == {"cases": {}}
+    update_baseline(load_baseline(path), {"leo": _stats(10.0), "geo": _stats(4.0, cpu=3.0)}, "run-0001", path)
+
+    new_leo = summarize([_sample(11.0, 9.0), _sample(12.0, 10.0)])
+    update_baseline(load_baseline(path), {"leo": new_leo}, "run-0002", path)
+    baseline = load_baseline(path)
+
+    assert list(baseline["cases"]) == ["geo", "leo"]
+    assert baseline["cases"]["geo"] == {**_stats(4.0, cpu=3.0), "run_id": "run-0001"}
+    assert baseline["cases"]["leo"] == {
+        "runs": 2,
+        "wall_time_s": new_leo["wall_time_s"],
+        "cpu_time_s": new_leo["cpu_time_s"],
+        "run_id": "run-0002",
+    }
@@ -0,0 +1,222 @@
+import csv
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sgp4")
+
+from sgp4.api import WGS72, Satrec  # noqa: E402
+from sgp4.exporter import export_tle  # noqa: E402
+
+import propagate_tle_sgp4  # noqa: E402
+import screen_conjunctions  # noqa: E402
+
+EPOCH = 27300.25  # days since 1949-12-31, 2024-09-28T06:00
+START = "2024-09-28T06:00"
+# The pairs of _catalog() that come within 10 km in the first three hours.
+PAIRS = {("SAT-20000", "SAT-20001"), ("SAT-20002", "SAT-20003"), ("SAT-20004", "SAT-20005"), ("SAT-20010", "SAT-20011")}
+
+
+def _tle(number: int, inclination: float, node: float, mean_anomaly: float, radius_km: float = 7000.0):
+    sat = Satrec()
+    sat.sgp4init(
+        WGS72,
+        "i",
+        number,
+        EPOCH,
+        0.0,
+        0.0,
+        0.0,
+        1e-4,
+        0.0,
+        math.radians(inclination),
+        math.radians(mean_anomaly % 360.0),
+        math.sqrt(398600.8 / radius_km**3) * 60.0,
+        math.radians(node),
+    )
+    sat.classification, sat.intldesg, sat.elnum, sat.revnum = "U", "24001A", 999, 1
+    return f"SAT-{number}", *export_tle(sat)
+
+
+def _catalog() -> list[tuple[str, str, str]]:
+    # Three crossing pairs (planes 10 degrees apart, both objects at the
+    # shared node together, so they pass within a few km every half orbit),
+    # one co-orbital pair a few km apart along track, and six objects on
+    # unrelated orbits.
+    entries = []
+    for k, (node, offset) in enumerate([(0.0, 0.0), (120.0, 0.01), (240.0, 0.03)]):
+        anomaly = -10.0 - 7.0 * k
+        entries += [_tle(20000 + 2 * k, 50.0, node, anomaly), _tle(20001 + 2 * k, 60.0, node, anomaly + offset)]
+    entries += [_tle(20010, 98.0, 30.0, 50.0, 7100.0), _tle(20011, 98.0, 30.0, 50.03, 7100.0)]
+    entries += [_tle(20020 + k, 30.0 + 11.0 * k, 50.0 * k, 37.0 * k, 6800.0 + 150.0 * k) for k in range(6)]
+    return entries
+
+
+@pytest.fixture
+def tle_file(tmp_path) -> Path:
+    path = tmp_path / "catalog.tle"
+    path.write_text("".join("\n".join(entry) + "\n" for entry in _catalog()), encoding="utf-8")
+    return path
+
+
+def _propagate(monkeypatch, tle_file: Path, out: Path, *extra: str) -> Path:
+    monkeypatch.setattr(propagate_tle_sgp4, "OUT", out)
+    argv = ["propagate_tle_sgp4.py", "--input", str(tle_file), "--hours", "3", *extra]
+    monkeypatch.setattr(sys, "argv", argv)
+    assert propagate_tle_sgp4.main() == 0
+    return out / ("sgp4_propagation" if "npy" in extra else "sgp4_propagation.csv")
+
+
+def _minute_sorted(csv_path: Path) -> Path:
+    # The same rows ordered by minute (satellite order kept within each),
+    # as --stream expects, with the grid record beside them.
+    with csv_path.open(encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header, rows = next(reader), list(reader)
+    out = csv_path.with_name("sorted.csv")
+    with out.open("w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows([header, *sorted(rows, key=lambda row: int(row[1]))])
+    time_record = propagate_tle_sgp4.csv_time_path(csv_path)
+    propagate_tle_sgp4.csv_time_path(out).write_bytes(time_record.read_bytes())
+    return out
+
+
+def _screen(monkeypatch, tmp_path: Path, source: Path, tle_file: Path, *extra: str) -> tuple[str, str | None]:
+    monkeypatch.chdir(tmp_path)
+    argv = ["screen_conjunctions.py", "--input", str(source), "--tle", str(tle_file), "--threshold-km", "10"]
+    monkeypatch.setattr(sys, "argv", argv + list(extra))
+    assert screen_conjunctions.main() == 0
+    outputs = tmp_path / ".gmat-lab" / "outputs"
+    flags = (outputs / "conjunction_flags.csv").read_text()
+    tca = (outputs / "conjunction_tca.csv").read_text() if "--refine" in extra else None
+    for path in outputs.iterdir():
+        path.unlink()
+    return flags, tca
+
+
+def _csv_states(path: Path) -> dict:
+    with path.open(encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    names = list(dict.fromkeys(row["sat"] for row in rows))
+    shape = (len(names), len(rows) // len(names))
+
+    def vectors(*columns: str) -> np.ndarray:
+        return np.array([[float(row[c]) for c in columns] for row in rows]).reshape(*shape, 3)
+
+    return {
+        "names": names,
+        "minutes": np.array([int(row["minutes"]) for row in rows[: shape[1]]]),
+        "err": np.array([int(row["err"]) for row in rows]).reshape(shape),
+        "positions": vectors("x_km", "y_km", "z_km"),
+        "velocities": vectors("vx_kms", "vy_kms", "vz_kms"),
+    }
+
+
+def _store_states(path: Path) -> dict:
+    store = propagate_tle_sgp4.open_store(path)
+    return {
+        "names": list(store.names),
+        "minutes": np.array(store.minutes),
+        "err": np.array(store.err),
+        "positions": np.array(store.positions),
+        "velocities": np.array(store.velocities),
+    }
+
+
+def _assert_same_states(left: dict, right: dict) -> None:
+    assert left.keys() == right.keys()
+    for key in left:
+        assert np.array_equal(left[key], right[key]), key
+
+
+@pytest.mark.parametrize("grid", [[], ["--grid", "absolute", "--start", START]], ids=["epoch", "absolute"])
+@pytest.mark.parametrize("engine", ["vector", "loop"])
+def test_csv_and_store_hold_the_same_states(tmp_path, monkeypatch, tle_file, grid, engine):
+    args = ["--engine", engine, *grid]
+    csv_path = _propagate(monkeypatch, tle_file, tmp_path / "csv", *args)
+    store_path = _propagate(monkeypatch, tle_file, tmp_path / "npy", "--format", "npy", *args)
+
+    states = _csv_states(csv_path)
+    assert states["names"] == [name for name, _l1, _l2 in _catalog()]
+    assert states["minutes"].tolist() == list(range(0, 181, 10))
+    _assert_same_states(states, _store_states(store_path))
+
+
+@pytest.mark.parametrize("refine", [[], ["--refine"]], ids=["flags", "refine"])
+def test_streamed_csv_and_store_screening_agree(tmp_path, monkeypatch, tle_file, refine):
+    grid = ["--grid", "absolute", "--start", START]
+    csv_path = _propagate(monkeypatch, tle_file, tmp_path / "csv", *grid)
+    store_path = _propagate(monkeypatch, tle_file, tmp_path / "npy", "--format", "npy", *grid)
+
+    full = _screen(monkeypatch, tmp_path, csv_path, tle_file, *refine)
+    streamed = _screen(monkeypatch, tmp_path, _minute_sorted(csv_path), tle_file, "--stream", *refine)
+    store = _screen(monkeypatch, tmp_path, store_path, tle_file, *refine)
+    # Windows that split the grid unevenly, down to a single timestep.
+    for window_steps in ("4", "1"):
+        assert _screen(monkeypatch, tmp_path, store_path, tle_file, "--window-steps", window_steps, *refine) == store
+
+    assert streamed == full == store
+    flags, tca = full
+    assert "SAT-20010,SAT-20011" in flags
+    if refine:
+        assert {tuple(line.split(",")[1:3]) for line in tca.splitlines()[1:]} == PAIRS
+
+
+@pytest.mark.parametrize("fmt", ["csv", "npy"])
+def test_parallel_propagation_matches_serial(tmp_path, monkeypatch, tle_file, fmt):
+    args = ["--format", fmt, "--grid", "absolute", "--start", START]
+    serial = _propagate(monkeypatch, tle_file, tmp_path / "serial", *args)
+    parallel = _propagate(monkeypatch, tle_file, tmp_path / "parallel", *args, "--workers", "3")
+
+    if fmt == "csv":
+        assert parallel.read_bytes() == serial.read_bytes()
+        assert not list(parallel.parent.glob("*.part-*"))
+    else:
+        _assert_same_states(_store_states(parallel), _store_states(serial))
+    assert _screen(monkeypatch, tmp_path, parallel, tle_file) == _screen(monkeypatch, tmp_path, serial, tle_file)
+
+
+@pytest.mark.parametrize("refine", [[], ["--refine"]], ids=["flags", "refine"])
+def test_parallel_screening_matches_serial(tmp_path, monkeypatch, tle_file, refine):
+    store_path = _propagate(monkeypatch, tle_file, tmp_path, "--format", "npy", "--grid", "absolute", "--start", START)
+
+    serial = _screen(monkeypatch, tmp_path, store_path, tle_file, *refine)
+    # Three workers get ten slabs of the 19 timesteps, the last one shorter.
+    parallel = _screen(monkeypatch, tmp_path, store_path, tle_file, "--workers", "3", *refine)
+
+    assert parallel == serial
+    assert "SAT-20010,SAT-20011" in serial[0]
+
+
+def _tca_rows(text: str) -> list[tuple]:
+    rows = [line.split(",") for line in text.splitlines()[1:]]
+    return [(float(tca), a, b, float(miss)) for tca, a, b, miss, _speed in rows]
+
+
+def test_absolute_grid_refines_the_same_on_coarse_and_fine_steps(tmp_path, monkeypatch, tle_file):
+    grid = ["--grid", "absolute", "--start", START]
+    csv_path = _propagate(monkeypatch, tle_file, tmp_path / "csv", *grid)
+    coarse = _propagate(monkeypatch, tle_file, tmp_path / "coarse", "--format", "npy", *grid)
+    fine = _propagate(monkeypatch, tle_file, tmp_path / "fine", "--format", "npy", "--step-min", "1", *grid)
+
+    # Both outputs record the same reference, so --refine counts minutes
+    # from the same instant whichever one it reads.
+    time = propagate_tle_sgp4.read_csv_time(csv_path)
+    assert time == propagate_tle_sgp4.open_store(coarse).time == propagate_tle_sgp4.open_store(fine).time
+    assert (time["grid"], time["start_utc"]) == ("absolute", START)
+    assert (time["start_jd"], time["start_fr"]) == propagate_tle_sgp4.utc_start(START)
+
+    _flags, from_csv = _screen(monkeypatch, tmp_path, csv_path, tle_file, "--refine")
+    _flags, from_coarse = _screen(monkeypatch, tmp_path, coarse, tle_file, "--refine")
+    _flags, from_fine = _screen(monkeypatch, tmp_path, fine, tle_file, "--refine")
+
+    assert from_csv == from_coarse
+    coarse_rows, fine_rows = _tca_rows(from_coarse), _tca_rows(from_fine)
+    assert [row[1:3] for row in coarse_rows] == [row[1:3] for row in fine_rows]
+    assert {row[1:3] for row in coarse_rows} == PAIRS
+    for (tca, _a, _b, miss), (fine_tca, _fa, _fb, fine_miss) in zip(coarse_rows, fine_rows):
+        assert tca == pytest.approx(fine_tca, abs=1e-3)
+        assert miss == pytest.approx(fine_miss, abs=1e-3)
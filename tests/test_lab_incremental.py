@@ -0,0 +1,137 @@
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("sgp4")
+
+import numpy as np  # noqa: E402
+from sgp4.api import WGS72, Satrec  # noqa: E402
+from sgp4.exporter import export_tle  # noqa: E402
+
+import propagate_tle_sgp4  # noqa: E402
+import screen_conjunctions  # noqa: E402
+from tle_catalog import ingest, load_diff, save_catalog, write_diff  # noqa: E402
+
+
+EPOCH = 27300.25  # days since 1949-12-31, 2024-09-28T06:00
+START = "2024-09-28T12:00"
+
+
+def _tle(k: int, mean_anomaly: float, epoch: float = EPOCH, group: int | None = None) -> tuple[str, str, str]:
+    # Objects come in pairs sharing an orbit a few km apart along track, so
+    # every pair shows up in the screening.
+    group = k // 2 if group is None else group
+    sat = Satrec()
+    sat.sgp4init(
+        WGS72,
+        "i",
+        20000 + k,
+        epoch,
+        1e-5,
+        0.0,
+        0.0,
+        0.001 + 0.002 * (group % 5),
+        math.radians(40.0 * group),
+        math.radians(20.0 + 9.0 * group),
+        math.radians(mean_anomaly),
+        (14.0 + 0.1 * group) * 2 * math.pi / 1440,
+        math.radians(37.0 * group),
+    )
+    sat.classification, sat.intldesg, sat.elnum, sat.revnum = "U", "24001A", 999, 1
+    line1, line2 = export_tle(sat)
+    return f"SAT-{k}", line1, line2
+
+
+def _v1() -> list[tuple[str, str, str]]:
+    return [_tle(k, 10.0 * (k // 2) + 0.02 * (k % 2)) for k in range(16)]
+
+
+def _v2() -> list[tuple[str, str, str]]:
+    # Newer element sets for SAT-2 and SAT-7, SAT-5 decayed, SAT-16 launched
+    # next to SAT-0.
+    entries = _v1()
+    entries[2] = _tle(2, 20.05, EPOCH + 0.1)
+    entries[7] = _tle(7, 30.5, EPOCH + 0.1)
+    del entries[5]
+    return entries + [_tle(16, 0.01, group=0)]
+
+
+def _fetch(fetches, tmp_path: Path) -> tuple[list, Path]:
+    # Ingest each file into the catalog cache as fetch_celestrak does; the
+    # diff on disk is the one of the last fetch only.
+    catalog = None
+    for entries in fetches:
+        catalog, diff = ingest(entries, catalog)
+    diff_file = tmp_path / "catalog.diff.json"
+    write_diff(diff_file, diff)
+    return catalog.entries(), diff_file
+
+
+def _grid():
+    return propagate_tle_sgp4.time_grid(np.arange(0, 181, 10, dtype=np.float64), START)
+
+
+def _arrays(store_dir: Path) -> dict:
+    store = propagate_tle_sgp4.open_store(store_dir)
+    return {
+        "names": list(store.names),
+        "ids": list(store.ids),
+        "tle_hashes": list(store.tle_hashes),
+        "err": np.array(store.err),
+        "positions": np.array(store.positions),
+        "velocities": np.array(store.velocities),
+    }
+
+
+def _assert_same_store(a: Path, b: Path) -> None:
+    left, right = _arrays(a), _arrays(b)
+    for key in left:
+        assert np.array_equal(left[key], right[key]), key
+
+
+@pytest.mark.parametrize("fetches", [[_v2()], [_v2(), _v2()]], ids=["one-fetch", "repeated-fetch"])
+def test_store_update_matches_full_rebuild(tmp_path, fetches, capsys):
+    grid = _grid()
+    store_dir = tmp_path / "sgp4_propagation"
+    propagate_tle_sgp4._write_store(store_dir, _v1(), grid, "vector")
+    entries, diff_file = _fetch([_v1(), *fetches], tmp_path)
+
+    hint = set(load_diff(diff_file).changed)
+    propagated = propagate_tle_sgp4._update_store(store_dir, entries, grid, "vector", hint)
+    propagate_tle_sgp4._write_store(tmp_path / "full", entries, grid, "vector")
+
+    assert propagated == 3
+    # A repeated fetch leaves an empty diff; the store still catches up.
+    assert ("WARN: 3 objects" in capsys.readouterr().out) == (len(fetches) > 1)
+    _assert_same_store(store_dir, tmp_path / "full")
+
+
+def _screen(monkeypatch, tmp_path: Path, entries, *extra: str) -> tuple[str, str]:
+    catalog = tmp_path / "catalog.npz"
+    save_catalog(catalog, ingest(entries, None)[0])
+    argv = ["screen_conjunctions.py", "--input", str(tmp_path / "sgp4_propagation"), "--tle", str(catalog)]
+    monkeypatch.setattr(sys, "argv", argv + ["--threshold-km", "10", "--refine", *extra])
+    assert screen_conjunctions.main() == 0
+    outputs = tmp_path / ".gmat-lab" / "outputs"
+    return (outputs / "conjunction_flags.csv").read_text(), (outputs / "conjunction_tca.csv").read_text()
+
+
+@pytest.mark.parametrize("fetches", [[_v2()], [_v2(), _v2()]], ids=["one-fetch", "repeated-fetch"])
+def test_screening_diff_merge_matches_full_screening(tmp_path, monkeypatch, fetches):
+    monkeypatch.chdir(tmp_path)
+    grid = _grid()
+    store_dir = tmp_path / "sgp4_propagation"
+    propagate_tle_sgp4._write_store(store_dir, _v1(), grid, "vector")
+    before = _screen(monkeypatch, tmp_path, _v1())
+
+    entries, diff_file = _fetch([_v1(), *fetches], tmp_path)
+    propagate_tle_sgp4._update_store(store_dir, entries, grid, "vector", set(load_diff(diff_file).changed))
+    merged = _screen(monkeypatch, tmp_path, entries, "--diff", str(diff_file))
+    full = _screen(monkeypatch, tmp_path, entries)
+
+    assert merged == full
+    assert merged != before
+    assert "SAT-16" in full[0] and "SAT-5" in before[0] and "SAT-5" not in full[0]
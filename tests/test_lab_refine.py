@@ -0,0 +1,141 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sgp4")
+
+from sgp4.api import WGS72, Satrec  # noqa: E402
+from sgp4.exporter import export_tle  # noqa: E402
+
+from propagate_tle_sgp4 import propagate_offsets  # noqa: E402
+from screen_conjunctions import (  # noqa: E402
+    Interpolation,
+    _approaching,
+    _interp_scale,
+    _pair_separation,
+    _subframes,
+)
+from screening import _golden_min, refine_tca, refine_windows  # noqa: E402
+
+EPOCH = 27300.25  # days since 1949-12-31
+
+
+def _sat(number: int, inclination: float, mean_anomaly: float, radius_km: float = 7000.0) -> Satrec:
+    sat = Satrec()
+    mean_motion = math.sqrt(398600.8 / radius_km**3) * 60.0  # rad/min
+    sat.sgp4init(
+        WGS72,
+        "i",
+        number,
+        EPOCH,
+        0.0,
+        0.0,
+        0.0,
+        0.0001,
+        0.0,
+        math.radians(inclination),
+        math.radians(mean_anomaly),
+        mean_motion,
+        0.0,
+    )
+    sat.classification, sat.intldesg, sat.elnum, sat.revnum = "U", "24001A", 999, 1
+    return sat
+
+
+def _crossing_pair(offset_deg: float):
+    # Equal circular orbits 10 degrees apart in inclination, both reaching
+    # the ascending node about 2.7 minutes in: a fast crossing whose miss
+    # distance is set by the along-track offset of the second object.
+    return _pair_separation(_sat(30001, 50.0, -10.0), _sat(30002, 60.0, -10.0 + offset_deg), None)
+
+
+def _dense_min(separation, start: float, stop: float) -> tuple[float, float]:
+    times = np.arange(start, stop, 1e-5)
+    d = separation(times)
+    k = int(np.argmin(d))
+    return float(times[k]), float(d[k])
+
+
+def test_golden_min_finds_the_vertex():
+    assert _golden_min(lambda t: (t - 0.3) ** 2 + 1.0, -2.0, 5.0, 1e-9) == pytest.approx(0.3, abs=1e-7)
+
+
+@pytest.mark.parametrize("offset_deg", [0.0, 0.01, 0.03])
+def test_refined_tca_matches_a_dense_scan(offset_deg):
+    separation = _crossing_pair(offset_deg)
+    tca, miss = _dense_min(separation, 2.0, 3.5)
+
+    approaches = refine_tca(separation, 1.5, 4.0, threshold_km=50.0)
+
+    assert len(approaches) == 1
+    assert approaches[0][0] == pytest.approx(tca, abs=2e-4)
+    assert approaches[0][1] == pytest.approx(miss, abs=1e-4)
+
+
+def test_minimum_on_a_window_edge_is_followed_out_or_clamped():
+    separation = _crossing_pair(0.01)
+    tca, miss = _dense_min(separation, 2.0, 3.5)
+
+    # The approach lies just before the window: followed into the span.
+    followed = refine_tca(separation, tca + 0.1, tca + 0.6, threshold_km=50.0, lower=0.0, upper=60.0)
+    assert followed == [pytest.approx((tca, miss), abs=2e-4)]
+    # At the edge of the propagated span it is clamped there.
+    clamped = refine_tca(separation, tca + 0.1, tca + 0.6, threshold_km=50.0)
+    assert clamped == [(tca + 0.1, float(separation(np.array([tca + 0.1]))[0]))]
+    # Reached from both neighbouring windows, it is reported once.
+    windows = [(tca - 0.6, tca - 0.05), (tca + 0.05, tca + 0.6)]
+    assert refine_windows(separation, windows, 50.0, 0.0, 60.0) == [pytest.approx((tca, miss), abs=2e-4)]
+
+
+def _frames(sats, minutes: list[int]):
+    names = [f"SAT-{k}" for k in range(len(sats))]
+    states = [propagate_offsets(sat, np.array(minutes, dtype=np.float64)) for sat in sats]
+    for s, minute in enumerate(minutes):
+        positions = np.array([r[s] for _err, r, _v in states])
+        velocities = np.array([v[s] for _err, _r, v in states])
+        yield minute, names, np.arange(len(sats)), positions, velocities
+
+
+@pytest.mark.parametrize("step_min", [10, 20])
+def test_subframes_stay_within_their_error_bound(step_min):
+    # LEO objects interpolate within the cap over 10 minutes; over 20 the
+    # bound exceeds it and they are propagated at the sub-steps instead.
+    sats = [_sat(30010 + k, 20.0 * k, 40.0 * k, 6700.0 + 300.0 * k) for k in range(4)]
+    named = [(f"SAT-{k}", sat) for k, sat in enumerate(sats)]
+    entries = {name: (name, *export_tle(sat)) for name, sat in named}
+    interp = Interpolation(_interp_scale(named), entries, None)
+    previous, frame = _frames(sats, [0, step_min])
+
+    subframes = list(_subframes(previous, frame, interp, {}))
+
+    assert len(subframes) == step_min * 2 - 1
+    for minute, names, positions, velocities, slack in subframes:
+        exact = [propagate_offsets(sat, np.array([minute])) for sat in sats]
+        error = np.linalg.norm(positions - np.array([r[0] for _err, r, _v in exact]), axis=1)
+        bound = np.array([interp.scale[name] for name in names]) * (step_min * 60.0) ** 4
+        if step_min == 10:
+            assert (error <= bound).all() and (bound < 15.0).all()
+        else:
+            # Propagated from the exported TLE text, so only its rounding remains.
+            assert (error < 1e-3).all() and (slack == 0.0).all()
+        assert names == list(entries)
+
+
+def test_approaching_keeps_pairs_closing_within_half_a_substep():
+    sat_a, sat_b = _sat(30001, 50.0, -10.0), _sat(30002, 60.0, -10.0 + 0.01)
+    tca, miss = _dense_min(_pair_separation(sat_a, sat_b, None), 2.0, 3.5)
+
+    def state(seconds_before: float):
+        at = np.array([tca - seconds_before / 60.0])
+        (_ea, ra, va), (_eb, rb, vb) = propagate_offsets(sat_a, at), propagate_offsets(sat_b, at)
+        positions, velocities = np.vstack([ra, rb]), np.vstack([va, vb])
+        return [(0, 1, float(np.linalg.norm(ra[0] - rb[0])))], positions, velocities
+
+    # 10 s out the linear path passes within the miss distance; 40 s out the
+    # approach is beyond the 15 s half sub-step reached from this state.
+    assert _approaching(*state(10.0), None, miss + 0.5) == [(0, 1)]
+    pairs, positions, velocities = state(40.0)
+    assert pairs[0][2] > 20.0
+    assert _approaching(pairs, positions, velocities, None, miss + 0.5) == []
+    assert _approaching(pairs, positions, velocities, np.array([25.0, 25.0]), miss + 0.5) == [(0, 1)]
@@ -0,0 +1,17 @@
+from run_index import INDEX_NAME, allocate_run
+
+
+def test_run_number_skips_directory_of_a_torn_record(tmp_path):
+    first_dir, first = allocate_run(tmp_path, "abc1234", {"status": "pass"})
+    # A crash mid-append: the run directory exists, its record is torn.
+    (tmp_path / "run-0002-abc1234").mkdir()
+    with (tmp_path / INDEX_NAME).open("a", encoding="utf-8") as f:
+        f.write('{"run_id": "run-0002-abc1234", "run_nu')
+
+    run_dir, record = allocate_run(tmp_path, "abc1234", {"status": "pass"})
+    other_dir, other = allocate_run(tmp_path, "def5678", {"status": "pass"})
+
+    assert first_dir.name == "run-0001-abc1234" and first["run_number"] == 1
+    assert run_dir.name == "run-0003-abc1234" and record["run_number"] == 3
+    assert other_dir.name == "run-0004-def5678" and other["run_number"] == 4
+    assert (tmp_path / "LATEST").read_text() == "run-0004-def5678\n"
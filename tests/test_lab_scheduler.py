@@ -0,0 +1,113 @@
+import sys
+import threading
+
+import pytest
+
+import run_case
+from scheduler import run_dag
+
+
+def _case(case_id: str, **fields) -> dict:
+    return {"id": case_id, "type": "python_command", **fields}
+
+
+class _Executor:
+    # Records start order and in-flight count; fails the ids it is given.
+    def __init__(self, failing=(), barrier: threading.Barrier | None = None):
+        self.failing = set(failing)
+        self.barrier = barrier
+        self.started: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, case: dict):
+        with self.lock:
+            self.started.append(case["id"])
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        with self.lock:
+            self.in_flight -= 1
+        rc = 1 if case["id"] in self.failing else 0
+        return rc, {"case": case["id"], "returncode": rc}
+
+
+def test_dependencies_run_first_and_results_keep_catalog_order():
+    cases = [
+        _case("report", depends_on=["propagate"]),
+        _case("screen", inputs=["out/states.npy"]),
+        _case("propagate", outputs=["out/states.npy"]),
+    ]
+    run = _Executor()
+
+    results = run_dag(cases, run, jobs=1)
+
+    assert run.started == ["propagate", "report", "screen"]
+    assert [entry["case"] for _rc, entry in results] == ["report", "screen", "propagate"]
+
+
+def test_failure_skips_everything_downstream():
+    cases = [
+        _case("a"),
+        _case("b", depends_on=["a"]),
+        _case("c", depends_on=["b"]),
+        _case("d"),
+    ]
+    run = _Executor(failing={"a"})
+    lines: list[str] = []
+
+    results = dict(zip("abcd", run_dag(cases, run, jobs=2, log=lines.append)))
+
+    assert sorted(run.started) == ["a", "d"]
+    assert results["a"][0] == 1 and results["d"][0] == 0
+    assert results["b"] == (2, {"case": "b", "returncode": None, "skipped": True, "upstream_failed": ["a"]})
+    assert results["c"][1]["upstream_failed"] == ["b"]
+    assert lines == ["case=b skipped upstream_failed=a", "case=c skipped upstream_failed=b"]
+
+
+def test_unselected_dependency_counts_as_satisfied():
+    run = _Executor()
+
+    results = run_dag([_case("b", depends_on=["a"])], run, jobs=1, known_ids={"a", "b"})
+
+    assert results == [(0, {"case": "b", "returncode": 0})]
+
+
+@pytest.mark.parametrize(
+    "cases, message",
+    [
+        ([_case("a", depends_on=["c"]), _case("b", depends_on=["a"]), _case("c", depends_on=["b"])], "cycle"),
+        ([_case("a", depends_on=["missing"])], "unknown case missing"),
+    ],
+    ids=["cycle", "unknown"],
+)
+def test_broken_graph_is_rejected_before_any_case_runs(cases, message):
+    run = _Executor()
+
+    with pytest.raises(ValueError, match=message):
+        run_dag(cases, run, jobs=4)
+    assert run.started == []
+
+
+def test_jobs_bounds_cases_in_flight():
+    # Cases wait for one partner, so the run only completes if two run at
+    # once; a third would be caught by the peak.
+    run = _Executor(barrier=threading.Barrier(2))
+
+    results = run_dag([_case(f"c{k}") for k in range(6)], run, jobs=2)
+
+    assert [rc for rc, _entry in results] == [0] * 6
+    assert run.peak == 2
+
+
+def test_run_case_validates_the_graph_before_allocating_a_run(monkeypatch, capsys):
+    cases = [_case("a", depends_on=["b"]), _case("b", depends_on=["a"])]
+    monkeypatch.setattr(run_case, "_ensure_clean_repo_for_runs", lambda: None)
+    monkeypatch.setattr(run_case, "_catalog_cases", lambda tier: cases)
+    monkeypatch.setattr(run_case, "allocate_run", lambda *a: pytest.fail("run allocated"))
+    monkeypatch.setattr(sys, "argv", ["run_case.py", "--tier", "tier1"])
+
+    assert run_case.main() == 2
+    assert "ERROR: dependency cycle: a -> b -> a" in capsys.readouterr().out
@@ -0,0 +1,48 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from screening import brute_pairs, grid_pairs, grid_pairs_touching, pair_distances, shell_pairs  # noqa: E402
+
+
+def _positions(threshold_km: float) -> np.ndarray:
+    # Orbit-like radii with a few tight clusters, plus pairs exactly at the
+    # threshold: one along an axis, one along a 3-4-5 diagonal.
+    rng = np.random.default_rng(7)
+    direction = rng.normal(size=(300, 3))
+    direction /= np.linalg.norm(direction, axis=1)[:, None]
+    points = direction * rng.uniform(6600.0, 8000.0, size=(300, 1))
+    points[250:] = points[:50] + rng.normal(scale=threshold_km / 2, size=(50, 3))
+    edge = [
+        (7000.0, 0.0, 0.0),
+        (7000.0 + threshold_km, 0.0, 0.0),
+        (0.0, 7000.0, 0.0),
+        (0.0, 7000.0 + 3 * threshold_km / 5, 4 * threshold_km / 5),
+    ]
+    return np.vstack([points, edge])
+
+
+def _shells(positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Shells that contain each object's radius, as orbit_shells guarantees.
+    radius = np.linalg.norm(positions, axis=1)
+    pad = np.linspace(1.0, 300.0, len(positions))
+    return radius - pad, radius + pad[::-1]
+
+
+@pytest.mark.parametrize("threshold_km", [5.0, 200.0, 2000.0])
+def test_prefilters_find_exactly_the_brute_force_pairs(threshold_km):
+    positions = _positions(threshold_km)
+    expected = brute_pairs([tuple(p) for p in positions.tolist()], threshold_km)
+    n = len(positions)
+    assert (n - 4, n - 3, threshold_km) in expected and (n - 2, n - 1, threshold_km) in expected
+
+    shells = _shells(positions)
+    i, j = shell_pairs(*shells, threshold_km)
+    assert grid_pairs(positions, threshold_km) == expected
+    assert grid_pairs(positions, threshold_km, shells) == expected
+    assert pair_distances(positions, i, j, threshold_km) == expected
+
+    touched = np.zeros(n, dtype=bool)
+    touched[::7] = touched[-1] = True
+    subset = [pair for pair in expected if touched[pair[0]] or touched[pair[1]]]
+    assert grid_pairs_touching(positions, touched, threshold_km, shells) == subset
@@ -0,0 +1,76 @@
+import math
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("sgp4")
+
+from sgp4.api import WGS72, Satrec  # noqa: E402
+from sgp4.exporter import export_tle  # noqa: E402
+
+from tle_catalog import ingest  # noqa: E402
+
+EPOCH = 27300.25  # days since 1949-12-31
+
+
+def _tle(number: int, epoch: float = EPOCH, name: str | None = None, mean_anomaly: float = 0.0):
+    sat = Satrec()
+    sat.sgp4init(
+        WGS72,
+        "i",
+        number,
+        epoch,
+        1e-5,
+        0.0,
+        0.0,
+        0.001,
+        0.0,
+        math.radians(51.6),
+        math.radians(mean_anomaly),
+        15.5 * 2 * math.pi / 1440,
+        0.0,
+    )
+    sat.classification, sat.intldesg, sat.elnum, sat.revnum = "U", "24001A", 999, 1
+    return (name or f"SAT-{number}", *export_tle(sat))
+
+
+def test_stale_mirror_does_not_roll_back_an_element_set():
+    newer = _tle(20101, EPOCH + 0.5)
+    catalog, _diff = ingest([_tle(20100), newer], None)
+
+    catalog, diff = ingest([_tle(20100), _tle(20101, EPOCH)], catalog)
+
+    assert catalog.entries(["20101"]) == [newer]
+    assert diff.updated == [] and diff.unchanged == 2
+    assert diff.stale_names == []
+
+
+def test_newer_epoch_or_a_reissued_set_counts_as_updated():
+    catalog, _diff = ingest([_tle(20100), _tle(20101)], None)
+    reissued = _tle(20101, mean_anomaly=1.0)
+
+    catalog, diff = ingest([_tle(20100, EPOCH + 0.5), reissued], catalog)
+
+    assert diff.updated == ["20100", "20101"] and diff.unchanged == 0
+    assert catalog.entries(["20101"]) == [reissued]
+
+
+@pytest.mark.parametrize("order", [1, -1], ids=["newest-last", "newest-first"])
+def test_duplicate_ids_in_one_fetch_keep_the_newest_set(order):
+    newest = _tle(20100, EPOCH + 0.5)
+    fetch = [_tle(20100), newest, _tle(20100, EPOCH + 0.2)][::order]
+
+    catalog, diff = ingest(fetch, None)
+
+    assert len(catalog) == 1 and catalog.entries() == [newest]
+    assert diff.added == ["20100"]
+
+
+def test_removed_and_renamed_objects_mark_their_names_stale():
+    catalog, _diff = ingest([_tle(20100), _tle(20101), _tle(20102, name="OLD-20102")], None)
+
+    catalog, diff = ingest([_tle(20100), _tle(20102, EPOCH + 0.5, name="NEW-20102"), _tle(20103)], catalog)
+
+    assert diff.added == ["20103"] and diff.updated == ["20102"] and diff.removed == ["20101"]
+    assert diff.stale_names == ["NEW-20102", "OLD-20102", "SAT-20101", "SAT-20103"]
+    assert catalog.norad.tolist() == ["20100", "20102", "20103"]
@@ -0,0 +1,133 @@
+import os
+import threading
+from pathlib import Path
+
+from gmat_tests.adapters.persistent_runner import PersistentGmatRunner
+from gmat_tests.adapters.subprocess_runner import prepare_script_in_workdir
+from gmat_tests.domain.models import GmatExecutionRequest
+
+
+FAKE_GMATPY = '''
+import os
+from pathlib import Path
+
+_output = None
+_script = None
+_log = None
+
+
+def Setup(startup_file):
+    global _output, _log
+    for line in Path(startup_file).read_text().splitlines():
+        if line.startswith("OUTPUT_PATH"):
+            _output = Path(line.split("=", 1)[1].strip())
+    # Like GMAT, the log is opened once and appended to for every run.
+    _log = (_output / "GmatLog.txt").open("a", buffering=1)
+
+
+def Clear():
+    global _script
+    _script = None
+
+
+def LoadScript(path):
+    global _script
+    _script = Path(path)
+    return _script.exists()
+
+
+def RunScript():
+    if "Crash" in _script.read_text():
+        os._exit(3)
+    (_output / "report.txt").write_text(_script.read_text())
+    _log.write(f"ran {_script.name}\\n")
+    print(f"pid={os.getpid()} cwd={os.getcwd()}")
+    return "Fail" not in _script.read_text()
+'''
+
+
+def _fake_install(tmp_path: Path) -> Path:
+    bin_dir = tmp_path / "GMAT" / "bin"
+    (bin_dir / "gmatpy").mkdir(parents=True)
+    (bin_dir / "gmatpy" / "__init__.py").write_text(FAKE_GMATPY)
+    (bin_dir / "gmat_startup_file.txt").write_text("ROOT_PATH = ../\nOUTPUT_PATH = ../output/\n")
+    gmat_bin = bin_dir / "GmatConsole"
+    gmat_bin.write_text("")
+    return gmat_bin
+
+
+def _run(runner: PersistentGmatRunner, tmp_path: Path, name: str, body: str, timeout_s: float | None = None):
+    script = tmp_path / f"{name}.script"
+    script.write_text(body)
+    sandbox = runner.create_contained_workdir(tmp_path / "runs")
+    staged = prepare_script_in_workdir(script, sandbox)
+    request = GmatExecutionRequest(
+        script_path=staged, work_dir=sandbox, timeout_s=timeout_s, report_files=("report.txt",)
+    )
+    return runner.run(request), sandbox
+
+
+class _LateTimer:
+    # Fires as it is being cancelled, i.e. after the worker already answered.
+    def __init__(self, interval, function, args=()):
+        self._fire = lambda: function(*args)
+        self.daemon = False
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        self._fire()
+
+    def join(self):
+        pass
+
+
+def test_worker_runs_many_scripts_in_one_process(tmp_path):
+    with PersistentGmatRunner(gmat_bin=_fake_install(tmp_path), scratch_dir=tmp_path / "workers") as runner:
+        first, first_dir = _run(runner, tmp_path, "a", "Create Spacecraft A;\n")
+        second, second_dir = _run(runner, tmp_path, "b", "Create Spacecraft B;\n")
+
+    assert first.returncode == 0 and second.returncode == 0
+    assert f"cwd={first_dir}" in first.stdout
+    assert (second_dir / "report.txt").read_text() == "Create Spacecraft B;\n"
+    assert not (first_dir / "gmat_startup_file.txt").exists()
+    pid = first.stdout.split()[0]
+    assert second.stdout.split()[0] == pid
+    assert pid != f"pid={os.getpid()}"
+
+
+def test_each_run_gets_its_own_log_and_products(tmp_path):
+    with PersistentGmatRunner(gmat_bin=_fake_install(tmp_path), scratch_dir=tmp_path / "workers") as runner:
+        first, first_dir = _run(runner, tmp_path, "a", "Create Spacecraft A;\n1.0 2.0\n")
+        second, second_dir = _run(runner, tmp_path, "b", "Create Spacecraft B;\n")
+
+    assert (first_dir / "GmatLog.txt").read_text() == "ran a.script\n"
+    assert (second_dir / "GmatLog.txt").read_text() == "ran b.script\n"
+    assert sorted(p.name for p in second_dir.iterdir()) == ["GmatLog.txt", "b.script", "report.txt"]
+    assert first.report_rows == 1 and second.report_rows == 0
+    assert first.peak_rss_kb > 0 and first.cpu_user_s >= 0 and first.cpu_sys_s >= 0
+    assert first.workdir_bytes_written == len("Create Spacecraft A;\n1.0 2.0\n") + len("ran a.script\n")
+
+
+def test_failed_and_crashed_runs_are_reported(tmp_path):
+    with PersistentGmatRunner(gmat_bin=_fake_install(tmp_path), scratch_dir=tmp_path / "workers") as runner:
+        failed, _ = _run(runner, tmp_path, "fail", "Fail;\n")
+        crashed, _ = _run(runner, tmp_path, "crash", "Crash;\n")
+        recovered, _ = _run(runner, tmp_path, "ok", "Create Spacecraft Sat;\n")
+
+    assert failed.returncode == 1
+    assert crashed.returncode == -1
+    assert "exited unexpectedly" in crashed.stderr
+    assert recovered.returncode == 0
+
+
+def test_worker_killed_by_a_late_timeout_is_not_reused(tmp_path, monkeypatch):
+    monkeypatch.setattr(threading, "Timer", _LateTimer)
+    with PersistentGmatRunner(gmat_bin=_fake_install(tmp_path), scratch_dir=tmp_path / "workers") as runner:
+        first, _ = _run(runner, tmp_path, "a", "Create Spacecraft A;\n", timeout_s=60)
+        second, _ = _run(runner, tmp_path, "b", "Create Spacecraft B;\n")
+
+    assert first.returncode == 0 and not first.timed_out
+    assert second.returncode == 0
+    assert second.stdout.split()[0] != first.stdout.split()[0]
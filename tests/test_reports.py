@@ -0,0 +1,162 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from gmat_tests import reports
+from gmat_tests.reports import (
+    count_data_rows,
+    find_report,
+    first_data_line,
+    last_data_line,
+    read_last_numeric_row,
+    read_last_row,
+    read_report,
+    read_scenario_row,
+    script_report_columns,
+)
+
+EPHEMERIS = """\
+EphSat.UTCGregorian        EphSat.SMA                EphSat.ECC
+01 Jan 2000 12:00:00.000   7191.901567414712         0.02451441266019787
+01 Jan 2000 12:01:00.000   7191.836541215363         0.0244497186162592
+03 Jan 2000 11:59:00.000   7191.961229226347         0.02500772308649849
+"""
+
+
+SCRIPT = """\
+Create ReportFile RF;
+GMAT RF.Filename = 'report.txt';   % relative to OUTPUT_PATH
+Create ReportFile Eph;
+Eph.Filename = 'ephemeris.txt';
+Eph.Add = {EphSat.UTCGregorian, EphSat.SMA, EphSat.ECC};
+BeginMissionSequence;
+Report RF startSMA endSMA Sat.ElapsedDays;
+"""
+
+
+def _report(tmp_path: Path, text: str, name: str = "report.txt") -> Path:
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def test_last_row_by_column_name(tmp_path):
+    row = read_last_row(_report(tmp_path, EPHEMERIS))
+
+    assert row == {
+        "EphSat.UTCGregorian": "03 Jan 2000 11:59:00.000",
+        "EphSat.SMA": 7191.961229226347,
+        "EphSat.ECC": 0.02500772308649849,
+    }
+
+
+def test_first_and_last_data_lines_skip_header(tmp_path):
+    path = _report(tmp_path, EPHEMERIS + "\n\n")
+
+    assert first_data_line(path).startswith("01 Jan 2000 12:00:00.000")
+    assert last_data_line(path).startswith("03 Jan 2000 11:59:00.000")
+
+
+def test_headerless_report_needs_names(tmp_path):
+    path = _report(tmp_path, "7000.0 0.001\n7000.5 0.002\n")
+
+    with pytest.raises(ValueError, match="no header"):
+        read_last_row(path)
+    assert read_last_row(path, names=["SMA", "ECC"]) == {"SMA": 7000.5, "ECC": 0.002}
+
+
+def test_last_numeric_row_scans_back_from_eof(tmp_path):
+    path = _report(tmp_path, "startSMA endSMA\n7000.0 7000.5\n1 2 3\n")
+
+    assert read_last_numeric_row(path, 2) == [7000.0, 7000.5]
+    with pytest.raises(ValueError):
+        read_last_numeric_row(_report(tmp_path, ""), 2)
+
+
+def test_columnar_read(tmp_path):
+    np = pytest.importorskip("numpy")
+    table = read_report(_report(tmp_path, EPHEMERIS))
+
+    assert table.names == ("EphSat.UTCGregorian", "EphSat.SMA", "EphSat.ECC")
+    assert len(table) == 3
+    assert table["EphSat.SMA"].tolist() == [7191.901567414712, 7191.836541215363, 7191.961229226347]
+    assert table["EphSat.UTCGregorian"][-1] == np.datetime64("2000-01-03T11:59:00.000")
+
+
+def test_columnar_read_selected_columns(tmp_path):
+    pytest.importorskip("numpy")
+    table = read_report(_report(tmp_path, EPHEMERIS), columns=["EphSat.ECC"])
+
+    assert list(table.columns) == ["EphSat.ECC"]
+    with pytest.raises(KeyError, match="EphSat.RAAN"):
+        read_report(_report(tmp_path, EPHEMERIS), columns=["EphSat.RAAN"])
+
+
+def test_columnar_read_across_blocks_matches_compressed(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(reports, "_BLOCK_BYTES", 100)
+    body = "".join(f"0{k % 9 + 1} Jan 2000 12:00:00.000 {7000 + k}.5 0.{k}\n" for k in range(40))
+    plain = _report(tmp_path, EPHEMERIS.splitlines(keepends=True)[0] + body)
+    packed = tmp_path / "packed.txt.gz"
+    packed.write_bytes(gzip.compress(plain.read_bytes()))
+
+    table, unpacked = read_report(plain), read_report(packed)
+
+    assert len(table) == len(unpacked) == 40
+    for name in table.names:
+        assert np.array_equal(table[name], unpacked[name])
+    assert table["EphSat.SMA"][-1] == 7039.5
+    assert table["EphSat.UTCGregorian"][-1] == np.datetime64("2000-01-04T12:00:00.000")
+
+
+def test_columnar_read_names_the_malformed_row(tmp_path, monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(reports, "_BLOCK_BYTES", 16)
+    path = _report(tmp_path, "SMA ECC\n" + "7000.0 0.1\n" * 5 + "7000.0\n" + "7000.0 0.1\n" * 5)
+
+    with pytest.raises(ValueError, match="data row 6 has 1 tokens, expected 2"):
+        read_report(path)
+
+
+def test_script_report_columns(tmp_path):
+    script = _report(tmp_path, SCRIPT, "case.script")
+
+    assert script_report_columns(script, "report.txt") == ("startSMA", "endSMA", "Sat.ElapsedDays")
+    assert script_report_columns(script, "ephemeris.txt") == ("EphSat.UTCGregorian", "EphSat.SMA", "EphSat.ECC")
+    assert script_report_columns(script, "other.txt") is None
+
+
+def test_scenario_row_checks_header_against_script(tmp_path):
+    script = _report(tmp_path, SCRIPT, "case.script")
+    row = read_scenario_row(script, _report(tmp_path, "startSMA endSMA Sat.ElapsedDays\n7000.0 6999.5 7.0\n"))
+
+    assert row.select("Sat.ElapsedDays", "startSMA") == (7.0, 7000.0)
+    assert read_scenario_row(script, _report(tmp_path, "7000.0 6999.5 7.0\n"))["endSMA"] == 6999.5
+    with pytest.raises(ValueError, match="does not match"):
+        read_scenario_row(script, _report(tmp_path, "endSMA startSMA Sat.ElapsedDays\n1 2 3\n"))
+
+
+def test_compressed_report_reads_like_plain(tmp_path):
+    plain = _report(tmp_path, EPHEMERIS)
+    packed = tmp_path / "report.txt.gz"
+    packed.write_bytes(gzip.compress(EPHEMERIS.encode()))
+    plain.unlink()
+
+    assert find_report(plain) == packed
+    assert read_last_row(packed)["EphSat.SMA"] == 7191.961229226347
+    assert first_data_line(packed).startswith("01 Jan 2000 12:00:00.000")
+    assert last_data_line(packed).startswith("03 Jan 2000 11:59:00.000")
+    assert count_data_rows(packed) == 3
+
+    numeric = tmp_path / "numeric.txt.gz"
+    numeric.write_bytes(gzip.compress(b"startSMA endSMA\n7000.0 7000.5\n1 2 3\n"))
+    assert read_last_numeric_row(numeric, 2) == [7000.0, 7000.5]
+
+
+def test_zstd_report(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    packed = tmp_path / "report.txt.zst"
+    packed.write_bytes(zstandard.ZstdCompressor().compress(EPHEMERIS.encode()))
+
+    assert read_last_row(packed)["EphSat.ECC"] == 0.02500772308649849
@@ -0,0 +1,106 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+from gmat_tests.adapters.result_cache import GmatResultCache
+from gmat_tests.adapters.subprocess_runner import SubprocessGmatRunner, prepare_script_in_workdir
+from gmat_tests.domain.models import GmatExecutionRequest, GmatExecutionResult
+
+
+FAKE_GMAT = """#!/usr/bin/env bash
+set -euo pipefail
+echo run >> "$(dirname "$0")/invocations.txt"
+cat "$1" > report.txt
+echo "ran $(basename "$1")"
+"""
+
+
+def _fake_bin(tmp_path: Path) -> Path:
+    fake_bin = tmp_path / "bin" / "GMAT-R2025a"
+    fake_bin.parent.mkdir()
+    fake_bin.write_text(FAKE_GMAT)
+    fake_bin.chmod(0o755)
+    return fake_bin
+
+
+def _invocations(fake_bin: Path) -> int:
+    log = fake_bin.parent / "invocations.txt"
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+def _run(runner: SubprocessGmatRunner, script: Path, base: Path):
+    sandbox = runner.create_contained_workdir(base)
+    staged = prepare_script_in_workdir(script, sandbox)
+    return runner.run(GmatExecutionRequest(script_path=staged, work_dir=sandbox)), sandbox
+
+
+def test_cache_hit_restores_artifacts_without_running(tmp_path):
+    fake_bin = _fake_bin(tmp_path)
+    script = tmp_path / "sample.script"
+    script.write_text("Create Spacecraft Sat;\n")
+    runner = SubprocessGmatRunner(gmat_bin=fake_bin, result_cache=GmatResultCache(tmp_path / "cache"))
+
+    first, _ = _run(runner, script, tmp_path / "runs")
+    second, sandbox = _run(runner, script, tmp_path / "runs")
+
+    assert _invocations(fake_bin) == 1
+    assert second.from_cache and not first.from_cache
+    assert replace(second, from_cache=False) == first
+    assert (sandbox / "report.txt").read_text() == "Create Spacecraft Sat;\n"
+
+
+def test_cache_misses_when_script_changes(tmp_path):
+    fake_bin = _fake_bin(tmp_path)
+    script = tmp_path / "sample.script"
+    runner = SubprocessGmatRunner(gmat_bin=fake_bin, result_cache=GmatResultCache(tmp_path / "cache"))
+
+    script.write_text("Create Spacecraft Sat;\n")
+    _run(runner, script, tmp_path / "runs")
+    script.write_text("Create Spacecraft Other;\n")
+    _result, sandbox = _run(runner, script, tmp_path / "runs")
+
+    assert _invocations(fake_bin) == 2
+    assert (sandbox / "report.txt").read_text() == "Create Spacecraft Other;\n"
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    fake_bin = _fake_bin(tmp_path)
+    cache_root = tmp_path / "cache"
+    runner = SubprocessGmatRunner(gmat_bin=fake_bin, result_cache=GmatResultCache(cache_root, max_bytes=2000))
+
+    for i in range(5):
+        script = tmp_path / f"case{i}.script"
+        script.write_text(f"Create Spacecraft Sat{i};\n" * 10)
+        _run(runner, script, tmp_path / "runs")
+
+    entries = list(cache_root.glob("??/*"))
+    assert 0 < len(entries) < 5
+
+
+def test_concurrent_store_load_and_evict(tmp_path):
+    # Every store evicts (the cache holds about three entries) while other
+    # threads restore entries; loads must return a complete entry or a miss.
+    cache = GmatResultCache(tmp_path / "cache", max_bytes=3500)
+    result = GmatExecutionResult(returncode=0, stdout="ran\n", stderr="")
+    report = "x" * 1000
+
+    def use(worker: int) -> int:
+        hits = 0
+        for i in range(40):
+            key = f"{(worker + i) % 12:02d}" + "0" * 62
+            produced = tmp_path / f"run-{worker}-{i}"
+            produced.mkdir()
+            (produced / "report.txt").write_text(report)
+            cache.store(key, produced, result)
+            restored = tmp_path / f"restore-{worker}-{i}"
+            restored.mkdir()
+            if cache.load(key, restored) is not None:
+                assert (restored / "report.txt").read_text() == report
+                hits += 1
+        return hits
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        hits = sum(pool.map(use, range(8)))
+
+    assert hits > 0
+    assert len(list((tmp_path / "cache").glob("??/*"))) <= 3
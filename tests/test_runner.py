@@ -1,3 +1,5 @@
+import threading
+import time
 from pathlib import Path
 
 from gmat_tests.adapters.subprocess_runner import SubprocessGmatRunner, prepare_script_in_workdir
@@ -44,3 +46,112 @@ def test_missing_script_fails_fast(tmp_path):
         raise AssertionError("Expected FileNotFoundError")
     except FileNotFoundError as exc:
         assert "script" in str(exc)
+
+
+def test_contained_startup_file_stamps_output_path_per_workdir(tmp_path):
+    bin_dir = tmp_path / "R2025a" / "bin"
+    bin_dir.mkdir(parents=True)
+    fake_bin = bin_dir / "GmatConsole"
+    fake_bin.write_text(FAKE_GMAT)
+    fake_bin.chmod(0o755)
+    default_startup = bin_dir / "gmat_startup_file.txt"
+    default_startup.write_text(
+        "ROOT_PATH = ../\nOUTPUT_PATH = ../output/\nLOG_FILE = ../output/GmatLog.txt\nPLUGIN = ../plugins/libGmatEstimation\n"
+    )
+
+    runner = SubprocessGmatRunner(gmat_bin=fake_bin)
+    first = runner._build_contained_startup_file(runner.create_contained_workdir(tmp_path))
+    second = runner._build_contained_startup_file(runner.create_contained_workdir(tmp_path))
+
+    first_text = first.read_text()
+    assert f"OUTPUT_PATH              = {first.parent.resolve()}/" in first_text
+    assert f"OUTPUT_PATH              = {second.parent.resolve()}/" in second.read_text()
+    assert f"ROOT_PATH                = {bin_dir.parent.resolve()}" in first_text
+    assert f"PLUGIN = {bin_dir.parent.resolve()}/plugins/libGmatEstimation" in first_text
+    assert "LOG_FILE                 = OUTPUT_PATH/GmatLog.txt" in first_text
+
+    default_startup.write_text("ROOT_PATH = ../\nOUTPUT_PATH = ../output/\nDATA_PATH = ../data/changed/\n")
+    third = runner._build_contained_startup_file(runner.create_contained_workdir(tmp_path))
+    assert "DATA_PATH = ../data/changed/" in third.read_text()
+
+
+def _limits_runner(tmp_path, body: str) -> tuple[SubprocessGmatRunner, Path, Path]:
+    fake_bin = tmp_path / "GMAT-R2025a"
+    fake_bin.write_text(f"#!/usr/bin/env bash\n{body}\n")
+    fake_bin.chmod(0o755)
+    script = tmp_path / "sample.script"
+    script.write_text("Create Spacecraft Sat;\n")
+    runner = SubprocessGmatRunner(gmat_bin=fake_bin)
+    sandbox = runner.create_contained_workdir(tmp_path)
+    return runner, sandbox, prepare_script_in_workdir(script, sandbox)
+
+
+def test_timeout_kills_hung_run(tmp_path):
+    runner, sandbox, staged = _limits_runner(tmp_path, "sleep 30 & wait")
+
+    start = time.monotonic()
+    result = runner.run(GmatExecutionRequest(script_path=staged, work_dir=sandbox, timeout_s=0.5))
+
+    assert result.timed_out
+    assert result.returncode != 0
+    assert time.monotonic() - start < 10
+
+
+class _LateTimer:
+    # Fires as it is being cancelled, i.e. after the child already exited.
+    def __init__(self, interval, function, args=()):
+        self._fire = lambda: function(*args)
+        self.daemon = False
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        self._fire()
+
+
+def test_timeout_firing_after_exit_is_ignored(tmp_path, monkeypatch):
+    runner, sandbox, staged = _limits_runner(tmp_path, "echo done")
+    monkeypatch.setattr(threading, "Timer", _LateTimer)
+
+    result = runner.run(GmatExecutionRequest(script_path=staged, work_dir=sandbox, timeout_s=60))
+
+    assert result.returncode == 0
+    assert not result.timed_out
+    assert result.stdout == "done\n"
+
+
+def test_limits_and_resource_usage_are_applied(tmp_path):
+    runner, sandbox, staged = _limits_runner(tmp_path, "echo \"$(ulimit -t) $(ulimit -v) $(nice)\"")
+
+    result = runner.run(
+        GmatExecutionRequest(
+            script_path=staged,
+            work_dir=sandbox,
+            timeout_s=30,
+            cpu_limit_s=60,
+            memory_limit_bytes=2 * 1024**3,
+            niceness=5,
+        )
+    )
+
+    assert result.returncode == 0
+    assert not result.timed_out
+    assert result.stdout.split() == ["60", str(2 * 1024**2), "5"]
+    assert result.peak_rss_kb > 0
+    assert result.cpu_user_s >= 0.0 and result.cpu_sys_s >= 0.0
+
+
+def test_result_reports_resource_accounting(tmp_path):
+    runner, sandbox, staged = _limits_runner(
+        tmp_path,
+        "printf 'startSMA endSMA\\n7000.0 7000.1\\n7000.1 7000.2\\n' > report.txt",
+    )
+
+    result = runner.run(GmatExecutionRequest(script_path=staged, work_dir=sandbox, report_files=("report.txt",)))
+
+    assert result.returncode == 0
+    assert result.report_rows == 2
+    assert result.workdir_bytes_written == (sandbox / "report.txt").stat().st_size
+    assert result.wall_time_s > 0.0
+    assert not result.from_cache
@@ -0,0 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from gmat_tests.adapters.subprocess_runner import SubprocessGmatRunner
+from gmat_tests.pytest_plugin import _session_root
+from gmat_tests.scenario_session import ScenarioSession
+
+
+FAKE_GMAT = """#!/usr/bin/env bash
+set -euo pipefail
+echo run >> "$(dirname "$0")/invocations.txt"
+printf 'startSMA endSMA\\n7000.0 7000.5\\n' > report.txt
+echo "Mission run completed"
+"""
+
+REPORT_SCRIPT = """\
+Create Spacecraft Sat;
+Create ReportFile RF;
+RF.Filename = 'report.txt';
+BeginMissionSequence;
+Report RF {columns};
+"""
+
+
+def _runner(tmp_path: Path) -> SubprocessGmatRunner:
+    fake_bin = tmp_path / "bin" / "GMAT-R2025a"
+    fake_bin.parent.mkdir()
+    fake_bin.write_text(FAKE_GMAT)
+    fake_bin.chmod(0o755)
+    return SubprocessGmatRunner(gmat_bin=fake_bin)
+
+
+def _invocations(tmp_path: Path) -> int:
+    return len((tmp_path / "bin" / "invocations.txt").read_text().splitlines())
+
+
+def test_session_runs_each_scenario_once(tmp_path):
+    script = tmp_path / "sample.script"
+    script.write_text(REPORT_SCRIPT.format(columns="startSMA endSMA"))
+    session = ScenarioSession(_runner(tmp_path), tmp_path / "shared")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        rows = list(pool.map(lambda _: session.report_row(script, "report.txt"), range(4)))
+
+    assert rows == [{"startSMA": 7000.0, "endSMA": 7000.5}] * 4
+    assert _invocations(tmp_path) == 1
+
+
+def test_session_rejects_report_that_does_not_match_script(tmp_path):
+    script = tmp_path / "sample.script"
+    script.write_text(REPORT_SCRIPT.format(columns="endSMA startSMA"))
+    session = ScenarioSession(_runner(tmp_path), tmp_path / "shared")
+
+    with pytest.raises(ValueError, match="does not match"):
+        session.report_row(script, "report.txt")
+
+
+def test_sessions_share_results_through_shared_dir(tmp_path):
+    script = tmp_path / "sample.script"
+    script.write_text("Create Spacecraft Sat;\n")
+    runner = _runner(tmp_path)
+
+    first = ScenarioSession(runner, tmp_path / "shared").run(script).require_success()
+    second = ScenarioSession(runner, tmp_path / "shared").run(script).require_success()
+
+    assert second == first
+    assert "Mission run completed" in second.stdout
+    assert _invocations(tmp_path) == 1
+
+
+def test_session_root_follows_gmat_test_sandbox(tmp_path, tmp_path_factory, monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    monkeypatch.delenv("GMAT_TEST_SANDBOX", raising=False)
+    assert _session_root(tmp_path_factory) == tmp_path_factory.getbasetemp()
+
+    monkeypatch.setenv("GMAT_TEST_SANDBOX", str(tmp_path / "sandbox"))
+    first, second = _session_root(tmp_path_factory), _session_root(tmp_path_factory)
+    assert first.parent == second.parent == (tmp_path / "sandbox").resolve()
+    # Results on disk are reused, so each run needs a fresh directory...
+    assert first != second
+    # ...which the xdist workers of one run share.
+    monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "abc123")
+    assert _session_root(tmp_path_factory) == (tmp_path / "sandbox").resolve() / "session-abc123"
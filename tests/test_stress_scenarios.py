@@ -10,45 +10,16 @@ from pathlib import Path
 
 import pytest
 
-from gmat_tests.adapters.subprocess_runner import SubprocessGmatRunner, prepare_script_in_workdir
-from gmat_tests.config import resolve_compat_lib_dir, resolve_gmat_bin, resolve_test_sandbox
-from gmat_tests.domain.models import GmatExecutionRequest
+from gmat_tests.reports import ReportRow
+from gmat_tests.scenario_session import ScenarioSession
 
 
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
-def _read_numeric_row(report_path: Path, expected_values: int) -> list[float]:
-    lines = [line.strip() for line in report_path.read_text(encoding="utf-8").splitlines() if line.strip()]
-    for line in reversed(lines):
-        parts = line.split()
-        try:
-            values = [float(token) for token in parts]
-        except ValueError:
-            continue
-        if len(values) == expected_values:
-            return values
-    raise AssertionError(f"No numeric row with {expected_values} values found in {report_path}")
-
-
-def _run_scenario(script_name: str, report_name: str) -> list[float]:
-    gmat_bin = resolve_gmat_bin()
-    if not gmat_bin.exists():
-        pytest.skip(f"GMAT binary not found at {gmat_bin}")
-
-    root = _repo_root()
-    script = root / "scenarios" / script_name
-    runner = SubprocessGmatRunner(gmat_bin=gmat_bin, compat_lib_dir=resolve_compat_lib_dir())
-    sandbox = runner.create_contained_workdir(resolve_test_sandbox())
-    staged_script = prepare_script_in_workdir(script, sandbox)
-    result = runner.run(GmatExecutionRequest(script_path=staged_script, work_dir=sandbox))
-
-    assert result.returncode == 0, f"stdout:\n{result.stdout}\n\nstderr:\n{result.stderr}"
-
-    report_path = sandbox / report_name
-    assert report_path.exists(), f"Expected report file missing: {report_path}"
-    return _read_numeric_row(report_path, expected_values=7)
+def _run_scenario(gmat_scenarios: ScenarioSession, script_name: str, report_name: str) -> ReportRow:
+    return gmat_scenarios.report_row(_repo_root() / "scenarios" / script_name, report_name)
 
 
 def _angular_delta_deg(start_deg: float, end_deg: float) -> float:
@@ -58,13 +29,12 @@ def _angular_delta_deg(start_deg: float, end_deg: float) -> float:
 # -- S1: High-order gravity field LEO -----------------------------------------
 
 @pytest.mark.integration
-def test_stress_high_gravity_leo():
+def test_stress_high_gravity_leo(gmat_scenarios):
     """EGM96 70x70: tesseral harmonics cause SMA/AOP oscillations."""
-    vals = _run_scenario(
-        "stress_high_gravity_leo.script",
-        "stress_high_gravity_leo_results.txt",
+    row = _run_scenario(gmat_scenarios, "stress_high_gravity_leo.script", "stress_high_gravity_leo_results.txt")
+    start_sma, end_sma, start_ecc, end_ecc, start_aop, end_aop, elapsed = row.select(
+        "startSMA", "endSMA", "startECC", "endECC", "startAOP", "endAOP", "Sat.ElapsedDays"
     )
-    start_sma, end_sma, start_ecc, end_ecc, start_aop, end_aop, elapsed = vals
 
     assert abs(elapsed - 14.0) < 1e-4
     # High-order gravity causes measurable SMA perturbation
@@ -83,13 +53,12 @@ def test_stress_high_gravity_leo():
 # -- S2: Atmospheric drag decay VLEO ------------------------------------------
 
 @pytest.mark.integration
-def test_stress_drag_decay_vleo():
+def test_stress_drag_decay_vleo(gmat_scenarios):
     """MSISE90 drag at solar max: SMA decays, orbit circularizes."""
-    vals = _run_scenario(
-        "stress_drag_decay_vleo.script",
-        "stress_drag_decay_vleo_results.txt",
+    row = _run_scenario(gmat_scenarios, "stress_drag_decay_vleo.script", "stress_drag_decay_vleo_results.txt")
+    start_sma, end_sma, start_ecc, end_ecc, start_alt, end_alt, elapsed = row.select(
+        "startSMA", "endSMA", "startECC", "endECC", "startALT", "endALT", "Sat.ElapsedDays"
     )
-    start_sma, end_sma, start_ecc, end_ecc, start_alt, end_alt, elapsed = vals
 
     assert abs(elapsed - 7.0) < 1e-4
     # SMA must decrease (drag decay)
@@ -107,13 +76,14 @@ def test_stress_drag_decay_vleo():
 # -- S3: SRP at GEO long duration ---------------------------------------------
 
 @pytest.mark.integration
-def test_stress_srp_geo_long_duration():
+def test_stress_srp_geo_long_duration(gmat_scenarios):
     """SRP drives eccentricity growth at GEO over 60 days."""
-    vals = _run_scenario(
-        "stress_srp_geo_long_duration.script",
-        "stress_srp_geo_long_duration_results.txt",
+    row = _run_scenario(
+        gmat_scenarios, "stress_srp_geo_long_duration.script", "stress_srp_geo_long_duration_results.txt"
+    )
+    start_sma, end_sma, start_ecc, end_ecc, start_rmag, end_rmag, elapsed = row.select(
+        "startSMA", "endSMA", "startECC", "endECC", "startRMAG", "endRMAG", "Sat.ElapsedDays"
     )
-    start_sma, end_sma, start_ecc, end_ecc, start_rmag, end_rmag, elapsed = vals
 
     assert abs(elapsed - 60.0) < 1e-4
     # SMA in GEO regime
@@ -130,13 +100,12 @@ def test_stress_srp_geo_long_duration():
 # -- S4: Molniya third-body + critical inclination ----------------------------
 
 @pytest.mark.integration
-def test_stress_molniya_thirdbody():
+def test_stress_molniya_thirdbody(gmat_scenarios):
     """At critical inclination, AOP drifts from lunisolar + higher-order terms."""
-    vals = _run_scenario(
-        "stress_molniya_thirdbody.script",
-        "stress_molniya_thirdbody_results.txt",
+    row = _run_scenario(gmat_scenarios, "stress_molniya_thirdbody.script", "stress_molniya_thirdbody_results.txt")
+    start_aop, end_aop, start_ecc, end_ecc, start_raan, end_raan, elapsed = row.select(
+        "startAOP", "endAOP", "startECC", "endECC", "startRAAN", "endRAAN", "Sat.ElapsedDays"
     )
-    start_aop, end_aop, start_ecc, end_ecc, start_raan, end_raan, elapsed = vals
 
     assert abs(elapsed - 30.0) < 1e-4
     # AOP drifts (not frozen despite critical inclination)
@@ -153,14 +122,13 @@ def test_stress_molniya_thirdbody():
 # -- S5: Cislunar NRHO --------------------------------------------------------
 
 @pytest.mark.integration
-def test_stress_cislunar_nrho():
+def test_stress_cislunar_nrho(gmat_scenarios):
     """NRHO near-periodicity: selenocentric RMAG returns close to start."""
-    vals = _run_scenario(
-        "stress_cislunar_nrho.script",
-        "stress_cislunar_nrho_results.txt",
-    )
+    row = _run_scenario(gmat_scenarios, "stress_cislunar_nrho.script", "stress_cislunar_nrho_results.txt")
     (start_rmag_moon, end_rmag_moon, start_rmag_earth, end_rmag_earth,
-     start_vmag, end_vmag, elapsed) = vals
+     start_vmag, end_vmag, elapsed) = row.select(
+        "startMoonRMAG", "endMoonRMAG", "startEarthRMAG", "endEarthRMAG", "startVMAG", "endVMAG", "PropSat.ElapsedDays"
+    )
 
     assert abs(elapsed - 14.0) < 1e-4
     # Selenocentric distance: pericynthion ~3500 km, apocynthion ~70000 km
@@ -177,13 +145,14 @@ def test_stress_cislunar_nrho():
 # -- S6: Sun-synchronous full fidelity ----------------------------------------
 
 @pytest.mark.integration
-def test_stress_sun_synch_full_fidelity():
+def test_stress_sun_synch_full_fidelity(gmat_scenarios):
     """All forces combined: RAAN advances at sun-synchronous rate."""
-    vals = _run_scenario(
-        "stress_sun_synch_full_fidelity.script",
-        "stress_sun_synch_full_fidelity_results.txt",
+    row = _run_scenario(
+        gmat_scenarios, "stress_sun_synch_full_fidelity.script", "stress_sun_synch_full_fidelity_results.txt"
+    )
+    start_sma, end_sma, start_raan, end_raan, start_ecc, end_ecc, elapsed = row.select(
+        "startSMA", "endSMA", "startRAAN", "endRAAN", "startECC", "endECC", "Sat.ElapsedDays"
     )
-    start_sma, end_sma, start_raan, end_raan, start_ecc, end_ecc, elapsed = vals
 
     assert abs(elapsed - 30.0) < 1e-4
     # SMA in SSO regime (~700 km alt)
@@ -201,13 +170,12 @@ def test_stress_sun_synch_full_fidelity():
 # -- S7: Jupiter flyby (heliocentric) -----------------------------------------
 
 @pytest.mark.integration
-def test_stress_jupiter_flyby():
+def test_stress_jupiter_flyby(gmat_scenarios):
     """Jupiter perturbation changes orbital elements measurably."""
-    vals = _run_scenario(
-        "stress_jupiter_flyby.script",
-        "stress_jupiter_flyby_results.txt",
+    row = _run_scenario(gmat_scenarios, "stress_jupiter_flyby.script", "stress_jupiter_flyby_results.txt")
+    start_ecc, end_ecc, start_inc, end_inc, start_rmag, end_rmag, elapsed = row.select(
+        "startECC", "endECC", "startINC", "endINC", "startRMAG", "endRMAG", "Sat.ElapsedDays"
     )
-    start_ecc, end_ecc, start_inc, end_inc, start_rmag, end_rmag, elapsed = vals
 
     assert abs(elapsed - 180.0) < 1e-4
     # Heliocentric distances (AU scale, in km)
@@ -225,13 +193,12 @@ def test_stress_jupiter_flyby():
 # -- S8: Integrator energy drift (pure Keplerian) -----------------------------
 
 @pytest.mark.integration
-def test_stress_rk4_energy_drift():
+def test_stress_rk4_energy_drift(gmat_scenarios):
     """Point-mass Keplerian: SMA conserved to integrator precision."""
-    vals = _run_scenario(
-        "stress_rk4_energy_drift.script",
-        "stress_rk4_energy_drift_results.txt",
+    row = _run_scenario(gmat_scenarios, "stress_rk4_energy_drift.script", "stress_rk4_energy_drift_results.txt")
+    start_sma, end_sma, start_ecc, end_ecc, start_rmag, end_rmag, elapsed = row.select(
+        "startSMA", "endSMA", "startECC", "endECC", "startRMAG", "endRMAG", "Sat.ElapsedDays"
     )
-    start_sma, end_sma, start_ecc, end_ecc, start_rmag, end_rmag, elapsed = vals
 
     assert abs(elapsed - 7.0) < 1e-4
     # SMA conserved to < 1e-6 km (GMAT RK89 self-consistency)